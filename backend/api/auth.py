@@ -1,14 +1,44 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, decode_token
 from models.database import db
 from models.user import User
-from datetime import timedelta
+from utils.auth import issue_tokens
+from utils.passwords import HasherBusy, needs_rehash
+from utils.rate_limit import get_limiter
+from utils.revocation import get_revocation_list
+import math
 
 auth_bp = Blueprint('auth', __name__)
 
+def _throttle(name, key):
+    """Return a 429 response if key has exhausted the named rate limit"""
+    config = current_app.config
+    limiter = get_limiter(
+        current_app._get_current_object(),
+        name,
+        rate=config.get(f'{name.upper()}_RATE', 1.0),
+        burst=config.get(f'{name.upper()}_BURST', 10),
+        max_keys=config.get('RATE_LIMIT_MAX_KEYS', 10000)
+    )
+    retry_after = limiter.consume(key)
+    if not retry_after:
+        return None
+    
+    response = jsonify({'message': 'Too many attempts, please try again later'})
+    response.headers['Retry-After'] = str(math.ceil(retry_after))
+    return response, 429
+
+def _busy():
+    return jsonify({'message': 'Server busy, please try again'}), 503
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """Register a new user"""
+    # Throttle before any password hashing work
+    throttled = _throttle('login_ip', request.remote_addr)
+    if throttled:
+        return throttled
+    
     data = request.get_json()
     
     # Validate required fields
@@ -29,49 +59,101 @@ def register():
         address=data.get('address', ''),
         phone=data.get('phone', '')
     )
-    new_user.set_password(data['password'])
+    try:
+        new_user.set_password(data['password'])
+    except HasherBusy:
+        return _busy()
     
     db.session.add(new_user)
     db.session.commit()
     
-    # Create access token
-    access_token = create_access_token(
-        identity=new_user.id,
-        expires_delta=timedelta(days=1)
-    )
-    
     return jsonify({
         'message': 'User registered successfully',
-        'access_token': access_token,
+        **issue_tokens(new_user),
         'user': new_user.to_dict()
     }), 201
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """Login and get access token"""
+    # Throttle before any password hashing work
+    throttled = _throttle('login_ip', request.remote_addr)
+    if throttled:
+        return throttled
+    
     data = request.get_json()
     
     # Validate required fields
     if not data or not data.get('email') or not data.get('password'):
         return jsonify({'message': 'Email and password are required'}), 400
     
+    if not isinstance(data['email'], str) or not isinstance(data['password'], str):
+        return jsonify({'message': 'Email and password must be strings'}), 400
+    
+    throttled = _throttle('login_email', data['email'].lower())
+    if throttled:
+        return throttled
+    
     # Check user credentials
     user = User.query.filter_by(email=data['email']).first()
-    if not user or not user.check_password(data['password']):
-        return jsonify({'message': 'Invalid email or password'}), 401
-    
-    # Create access token
-    access_token = create_access_token(
-        identity=user.id,
-        expires_delta=timedelta(days=1)
-    )
+    try:
+        if not user or not user.check_password(data['password']):
+            return jsonify({'message': 'Invalid email or password'}), 401
+        
+        # Upgrade hashes made with outdated parameters
+        if needs_rehash(user.password_hash):
+            user.set_password(data['password'])
+            db.session.commit()
+    except HasherBusy:
+        return _busy()
     
     return jsonify({
         'message': 'Login successful',
-        'access_token': access_token,
+        **issue_tokens(user),
         'user': user.to_dict()
     }), 200
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """Exchange a refresh token for a new access and refresh token"""
+    token = get_jwt()
+    revocation_list = get_revocation_list()
+    
+    # Refresh tokens are single-use, so check the table rather than the local filter
+    if revocation_list.is_revoked(token['jti'], strict=True):
+        return jsonify({'message': 'Token has been revoked'}), 401
+    
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return jsonify({'message': 'User not found'}), 401
+    
+    # Rotate: a concurrent refresh with the same token loses the insert race
+    if not revocation_list.revoke(token):
+        return jsonify({'message': 'Token has been revoked'}), 401
+    
+    return jsonify(issue_tokens(user)), 200
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required()
+def logout():
+    """Revoke the current access token and, if given, the refresh token"""
+    revocation_list = get_revocation_list()
+    revocation_list.revoke(get_jwt())
+    
+    data = request.get_json(silent=True) or {}
+    if data.get('refresh_token'):
+        try:
+            refresh_token = decode_token(data['refresh_token'])
+        except Exception:
+            return jsonify({'message': 'Invalid refresh token'}), 400
+        
+        if refresh_token.get('type') != 'refresh' or refresh_token.get('sub') != get_jwt_identity():
+            return jsonify({'message': 'Invalid refresh token'}), 400
+        revocation_list.revoke(refresh_token)
+    
+    return jsonify({'message': 'Logged out successfully'}), 200
+
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
@@ -99,7 +181,10 @@ def update_profile():
     if 'phone' in data:
         user.phone = data['phone']
     if 'password' in data:
-        user.set_password(data['password'])
+        try:
+            user.set_password(data['password'])
+        except HasherBusy:
+            return _busy()
     
     db.session.commit()
     return jsonify({
@@ -0,0 +1,111 @@
+import io
+from urllib.parse import urlsplit
+from flask import Blueprint, request, jsonify, current_app
+from flask.globals import request_ctx
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+from models.database import db
+
+batch_bp = Blueprint('batch', __name__)
+
+# Streams never finish, and a batch inside a batch could nest without bound
+EXCLUDED_BLUEPRINTS = {'batch', 'events'}
+
+def sub_request(batch_environ, path, query):
+    """A GET request for path that carries the batch request's headers, including Authorization"""
+    environ = dict(batch_environ)
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'CONTENT_LENGTH': '0',
+        'wsgi.input': io.BytesIO()
+    })
+    environ.pop('CONTENT_TYPE', None)
+    # The sub-response is embedded in the batch, never answered with a 304
+    environ.pop('HTTP_IF_NONE_MATCH', None)
+    return current_app.request_class(environ)
+
+def dispatch(ctx, batch_environ, path, query):
+    """Run the GET view for path in the current request context; returns what the view returned"""
+    app = current_app._get_current_object()
+    
+    try:
+        try:
+            rule, view_args = ctx.url_adapter.match(path, 'GET', return_rule=True)
+        except RequestRedirect as redirect:
+            # e.g. /api/products without the trailing slash
+            path = urlsplit(redirect.new_url).path
+            rule, view_args = ctx.url_adapter.match(path, 'GET', return_rule=True)
+    
+        if rule.endpoint.split('.', 1)[0] in EXCLUDED_BLUEPRINTS:
+            return jsonify({'message': 'This endpoint cannot be batched'}), 400
+    
+        sub = sub_request(batch_environ, path, query)
+        sub.url_rule, sub.view_args = rule, view_args
+        ctx.request = sub
+        return app.view_functions[rule.endpoint](**view_args)
+    except HTTPException as e:
+        # A JSON message instead of the default HTML error page
+        return jsonify({'message': e.description}), e.code
+    except Exception as e:
+        db.session.rollback()
+        try:
+            # Registered handlers, e.g. the JWT errors
+            return app.handle_user_exception(e)
+        except Exception:
+            app.logger.exception('Batched request for %s failed', path)
+            return jsonify({'message': 'Internal server error'}), 500
+
+@batch_bp.route('/', methods=['POST'])
+def batch():
+    """Run several GET requests in one round trip.
+    
+    Takes {"requests": ["/api/products/?page=1", "/api/cart/", ...]} and
+    returns {"responses": [{"path": ..., "status": ..., "body": ...}, ...]}
+    in the same order. Each sub-request runs its view in this request
+    context with this request's headers, so it authenticates as the
+    caller and shares the database session. Sub-requests do not go
+    through request hooks; the batch response is measured and compressed
+    once. Each body is spliced in as the view encoded it.
+    """
+    data = request.get_json(silent=True) or {}
+    paths = data.get('requests')
+    
+    if not isinstance(paths, list) or not paths or not all(isinstance(path, str) for path in paths):
+        return jsonify({'message': 'requests must be a non-empty list of paths'}), 400
+    
+    limit = current_app.config.get('BATCH_MAX_REQUESTS', 10)
+    if len(paths) > limit:
+        return jsonify({'message': f'At most {limit} requests per batch'}), 400
+    
+    ctx = request_ctx._get_current_object()
+    batch_request = ctx.request
+    encode = current_app.json.dumps
+    entries = []
+    
+    try:
+        for path in paths:
+            parts = urlsplit(path)
+            if not parts.path.startswith('/api/') or parts.scheme or parts.netloc:
+                rv = jsonify({'message': 'Only /api/ paths can be batched'}), 400
+            else:
+                rv = dispatch(ctx, batch_request.environ, parts.path, parts.query)
+            response = current_app.make_response(rv)
+            
+            body = response.get_data()
+            if response.is_json:
+                body = body.rstrip(b'\n')
+            else:
+                body = encode(body.decode('utf-8', 'replace')).encode('utf-8')
+            entries.append(b''.join((
+                b'{"path":', encode(path).encode('utf-8'),
+                f',"status":{response.status_code},"body":'.encode(), body, b'}'
+            )))
+    finally:
+        ctx.request = batch_request
+    
+    return current_app.response_class(
+        b''.join((b'{"responses":[', b','.join(entries), b']}\n')),
+        mimetype=current_app.json.mimetype
+    ), 200
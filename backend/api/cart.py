@@ -6,6 +6,19 @@ from models.product import Product
 
 cart_bp = Blueprint('cart', __name__)
 
+@cart_bp.record_once
+def register_cart_gauges(state):
+    """Expose cart table size at /metrics, to watch the abandoned cart sweeper keep up"""
+    metrics = state.app.extensions.get('metrics')
+    if metrics is None:
+        return
+    
+    metrics.register_gauge('cart_items_rows', 'Rows in cart_items', lambda: CartItem.query.count())
+    metrics.register_gauge(
+        'carts_open', 'Users with at least one cart item',
+        lambda: db.session.query(db.func.count(db.distinct(CartItem.user_id))).scalar()
+    )
+
 @cart_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_cart():
@@ -13,9 +26,10 @@ def get_cart():
     current_user_id = get_jwt_identity()
     
     cart_items = CartItem.query.filter_by(user_id=current_user_id).all()
+    product_cache = {}
     
     return jsonify({
-        'cart_items': [item.to_dict() for item in cart_items],
+        'cart_items': [item.to_dict(product_cache) for item in cart_items],
         'total_items': len(cart_items),
         'total_amount': sum(item.product.price * item.quantity for item in cart_items)
     }), 200
@@ -0,0 +1,72 @@
+"""Async versions of the read-only catalog views in api/products.py.
+
+asgi.py runs these on the event loop inside a Flask request context, so
+they read request.args and return responses exactly like the sync views.
+Queries go through the AsyncSession passed in; images are loaded eagerly
+because lazy loads are not possible on an async session. When a catalog
+snapshot is enabled and fresh, they answer from it without a query, like
+the sync views.
+"""
+from math import ceil
+from flask import request, jsonify, abort
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+from models.product import Product
+from utils.catalog_query import parse_listing_args, is_default_listing, filter_listing, order_listing
+from utils.catalog_snapshot import current_snapshot, snapshot_response
+
+
+async def get_products(session):
+    """Get products with pagination, optionally sorted and filtered by category, price and stock"""
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+
+    try:
+        options = parse_listing_args(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    snapshot = current_snapshot()
+    if snapshot is not None and is_default_listing(options):
+        return snapshot_response(snapshot.page(page, per_page, options['category'])), 200
+
+    # Same bounds as paginate(error_out=False) in the sync view
+    offset_page = page if page >= 1 else 1
+    limit = per_page if per_page >= 1 else 20
+
+    filtered = filter_listing(select(Product), options)
+    total = await session.scalar(select(func.count()).select_from(filtered.subquery()))
+    query = order_listing(filter_listing(select(Product), options, total), options)
+    products = await session.scalars(
+        query.options(selectinload(Product.images)).limit(limit).offset((offset_page - 1) * limit)
+    )
+
+    return jsonify({
+        'products': [product.to_dict() for product in products],
+        'total': total,
+        'pages': ceil(total / limit) if total else 0,
+        'current_page': page
+    }), 200
+
+
+async def get_product(session, product_id):
+    """Get a single product by ID"""
+    snapshot = current_snapshot()
+    body = snapshot.product(product_id) if snapshot is not None else None
+    if body is not None:
+        return snapshot_response(body), 200
+
+    product = await session.get(Product, product_id, options=[selectinload(Product.images)])
+    if product is None:
+        abort(404)
+    return jsonify(product.to_dict()), 200
+
+
+async def get_categories(session):
+    """Get all product categories"""
+    snapshot = current_snapshot()
+    if snapshot is not None:
+        return snapshot_response(snapshot.categories), 200
+
+    categories = await session.execute(select(Product.category).distinct())
+    return jsonify([category[0] for category in categories]), 200
@@ -0,0 +1,31 @@
+from flask import Blueprint, Response, request, jsonify, current_app
+from utils.auth import admin_required
+
+events_bp = Blueprint('events', __name__)
+
+@events_bp.route('/stream', methods=['GET'])
+@admin_required(locations=['headers', 'query_string'])
+def stream_events():
+    """Admin: server-sent events for new orders, order status changes and low stock.
+
+    EventSource cannot send headers, so the access token may also be passed
+    as ?jwt=<token>. Browsers resume with Last-Event-ID after a reconnect.
+    """
+    broker = current_app.extensions['events']
+    
+    subscription = broker.subscribe(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    if subscription is None:
+        response = jsonify({'message': 'Too many open event streams'})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+    
+    # The generator needs no request context, so the session is released before streaming starts
+    response = Response(
+        broker.stream(subscription, heartbeat=current_app.config.get('EVENTS_HEARTBEAT', 15)),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
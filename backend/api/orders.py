@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.database import db
-from models.order import Order, OrderItem
+from models.order import Order, OrderItem, ArchivedOrder
 from models.cart import CartItem
 from models.product import Product
+from utils.auth import admin_required
+from utils.catalog_snapshot import catalog_changed
+from utils.events import publish_event, publish_stock_changes
 from datetime import datetime
 
 order_bp = Blueprint('orders', __name__)
@@ -11,17 +14,19 @@ order_bp = Blueprint('orders', __name__)
 @order_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_orders():
-    """Get user's orders with pagination"""
+    """Get user's orders with pagination; ?archived=true lists archived ones"""
     current_user_id = get_jwt_identity()
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
+    model = ArchivedOrder if request.args.get('archived', 'false').lower() == 'true' else Order
     
-    orders = Order.query.filter_by(user_id=current_user_id)\
-        .order_by(Order.created_at.desc())\
+    orders = model.query.filter_by(user_id=current_user_id)\
+        .order_by(model.created_at.desc())\
         .paginate(page=page, per_page=per_page, error_out=False)
     
+    product_cache = {}
     return jsonify({
-        'orders': [order.to_dict() for order in orders.items],
+        'orders': [order.to_dict(product_cache) for order in orders.items],
         'total': orders.total,
         'pages': orders.pages,
         'current_page': page
@@ -36,7 +41,14 @@ def get_order(order_id):
     order = Order.query.filter_by(
         id=order_id,
         user_id=current_user_id
-    ).first_or_404()
+    ).first()
+    
+    # Old delivered and cancelled orders live in the archive
+    if order is None:
+        order = ArchivedOrder.query.filter_by(
+            id=order_id,
+            user_id=current_user_id
+        ).first_or_404()
     
     return jsonify(order.to_dict()), 200
 
@@ -71,6 +83,7 @@ def create_order():
     db.session.flush()  # To get the order ID
     
     # Create order items
+    stock_before = {}
     for cart_item in cart_items:
         # Check if product is in stock
         product = cart_item.product
@@ -88,6 +101,7 @@ def create_order():
         )
         
         # Update product stock
+        stock_before.setdefault(product.id, product.stock)
         product.stock -= cart_item.quantity
         
         db.session.add(order_item)
@@ -96,6 +110,17 @@ def create_order():
     CartItem.query.filter_by(user_id=current_user_id).delete()
     
     db.session.commit()
+    catalog_changed()
+    
+    publish_event('order.created', {
+        'order_id': new_order.id,
+        'user_id': new_order.user_id,
+        'total_amount': new_order.total_amount,
+        'status': new_order.status,
+        'item_count': len(cart_items),
+        'created_at': new_order.created_at
+    })
+    publish_stock_changes(stock_before, [item.product for item in cart_items])
     
     return jsonify({
         'message': 'Order created successfully',
@@ -123,12 +148,26 @@ def cancel_order(order_id):
     order.status = 'cancelled'
     
     # Restore product stock
+    stock_before = {}
+    restocked = []
     for item in order.order_items:
         product = Product.query.get(item.product_id)
         if product:
+            stock_before.setdefault(product.id, product.stock)
             product.stock += item.quantity
+            restocked.append(product)
     
     db.session.commit()
+    if restocked:
+        catalog_changed()
+    
+    publish_event('order.status_changed', {
+        'order_id': order.id,
+        'user_id': order.user_id,
+        'previous_status': 'pending',
+        'status': order.status
+    })
+    publish_stock_changes(stock_before, restocked)
     
     return jsonify({
         'message': 'Order cancelled successfully',
@@ -136,48 +175,34 @@ def cancel_order(order_id):
     }), 200
 
 @order_bp.route('/admin', methods=['GET'])
-@jwt_required()
+@admin_required()
 def admin_get_orders():
-    """Admin: Get all orders with pagination"""
-    from models.user import User
-    
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    
-    if not user or not user.is_admin:
-        return jsonify({'message': 'Admin privileges required'}), 403
-    
+    """Admin: Get all orders with pagination; ?archived=true lists archived ones"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     status = request.args.get('status')
+    model = ArchivedOrder if request.args.get('archived', 'false').lower() == 'true' else Order
     
-    query = Order.query
+    query = model.query
     
     if status:
         query = query.filter_by(status=status)
     
-    orders = query.order_by(Order.created_at.desc())\
+    orders = query.order_by(model.created_at.desc())\
         .paginate(page=page, per_page=per_page, error_out=False)
     
+    product_cache = {}
     return jsonify({
-        'orders': [order.to_dict() for order in orders.items],
+        'orders': [order.to_dict(product_cache) for order in orders.items],
         'total': orders.total,
         'pages': orders.pages,
         'current_page': page
     }), 200
 
 @order_bp.route('/admin/<int:order_id>/status', methods=['PUT'])
-@jwt_required()
+@admin_required()
 def admin_update_order_status(order_id):
     """Admin: Update order status"""
-    from models.user import User
-    
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    
-    if not user or not user.is_admin:
-        return jsonify({'message': 'Admin privileges required'}), 403
-    
     data = request.get_json()
     
     # Validate required fields
@@ -187,9 +212,18 @@ def admin_update_order_status(order_id):
     order = Order.query.get_or_404(order_id)
     
     # Update order status
+    previous_status = order.status
     order.status = data['status']
     db.session.commit()
     
+    if order.status != previous_status:
+        publish_event('order.status_changed', {
+            'order_id': order.id,
+            'user_id': order.user_id,
+            'previous_status': previous_status,
+            'status': order.status
+        })
+    
     return jsonify({
         'message': 'Order status updated successfully',
         'order': order.to_dict()
@@ -2,7 +2,7 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.database import db
 from models.order import Order
-import razorpay
+from utils.events import publish_event
 import json
 
 payment_bp = Blueprint('payment', __name__)
@@ -15,6 +15,8 @@ def get_razorpay_client():
     if not key_id or not key_secret:
         raise ValueError("Razorpay credentials not configured")
     
+    # Imported on first use; the SDK and its HTTP stack are slow to load
+    import razorpay
     return razorpay.Client(auth=(key_id, key_secret))
 
 @payment_bp.route('/create-order/<int:order_id>', methods=['POST'])
@@ -94,10 +96,19 @@ def verify_payment():
         client.utility.verify_payment_signature(params_dict)
         
         # Update order status and payment ID
+        previous_status = order.status
         order.status = 'paid'
         order.payment_id = data['razorpay_payment_id']
         db.session.commit()
         
+        publish_event('order.status_changed', {
+            'order_id': order.id,
+            'user_id': order.user_id,
+            'previous_status': previous_status,
+            'status': order.status,
+            'payment_id': order.payment_id
+        })
+        
         return jsonify({
             'message': 'Payment verified successfully',
             'order': order.to_dict()
@@ -1,50 +1,81 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy.orm import joinedload, selectinload
 from models.database import db
 from models.product import Product, ProductImage
+from models.recommendation import RelatedProduct
+from utils.auth import admin_required
+from utils.catalog_query import parse_listing_args, is_default_listing, filter_listing, order_listing
+from utils.catalog_snapshot import catalog_changed, current_snapshot, snapshot_response
+from utils.events import publish_stock_changes
 import json
+from datetime import datetime
+from math import ceil
 
 product_bp = Blueprint('products', __name__)
 
 @product_bp.route('/', methods=['GET'])
 def get_products():
-    """Get all products with pagination"""
+    """Get products with pagination, optionally sorted and filtered by category, price and stock"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
-    category = request.args.get('category')
     
-    query = Product.query
+    try:
+        options = parse_listing_args(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
-    if category:
-        query = query.filter_by(category=category)
+    snapshot = current_snapshot()
+    if snapshot is not None and is_default_listing(options):
+        return snapshot_response(snapshot.page(page, per_page, options['category'])), 200
     
-    products = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Counted first, so the page query can pick its plan by the result size
+    total = filter_listing(Product.query, options).count()
+    query = order_listing(filter_listing(Product.query, options, total), options)
+    products = query.options(selectinload(Product.images)).paginate(
+        page=page, per_page=per_page, error_out=False, count=False
+    )
     
     return jsonify({
         'products': [product.to_dict() for product in products.items],
-        'total': products.total,
-        'pages': products.pages,
+        'total': total,
+        'pages': ceil(total / products.per_page) if total else 0,
         'current_page': page
     }), 200
 
 @product_bp.route('/<int:product_id>', methods=['GET'])
 def get_product(product_id):
     """Get a single product by ID"""
+    snapshot = current_snapshot()
+    body = snapshot.product(product_id) if snapshot is not None else None
+    if body is not None:
+        return snapshot_response(body), 200
+    
+    # Products created since the snapshot was built are only in the database
     product = Product.query.get_or_404(product_id)
     return jsonify(product.to_dict()), 200
 
-@product_bp.route('/', methods=['POST'])
-@jwt_required()
-def create_product():
-    """Create a new product (admin only)"""
-    from models.user import User
+@product_bp.route('/<int:product_id>/related', methods=['GET'])
+def get_related_products(product_id):
+    """Products most often bought together with this one, precomputed by `flask refresh-recommendations`"""
+    limit = request.args.get('limit', current_app.config.get('RECOMMENDATIONS_TOP_K', 10), type=int)
     
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    related = RelatedProduct.query.filter_by(product_id=product_id).order_by(RelatedProduct.rank).limit(limit).options(
+        joinedload(RelatedProduct.related_product).selectinload(Product.images)
+    ).all()
     
-    if not user or not user.is_admin:
-        return jsonify({'message': 'Admin privileges required'}), 403
+    # No rows is normal for a product nobody has bought yet; only check it exists then
+    if not related:
+        Product.query.get_or_404(product_id)
     
+    return jsonify({
+        'product_id': product_id,
+        'products': [row.related_product.to_dict() for row in related if row.related_product]
+    }), 200
+
+@product_bp.route('/', methods=['POST'])
+@admin_required()
+def create_product():
+    """Create a new product (admin only)"""
     data = request.get_json()
     
     # Validate required fields
@@ -82,22 +113,16 @@ def create_product():
         
         db.session.commit()
     
+    catalog_changed()
     return jsonify(new_product.to_dict()), 201
 
 @product_bp.route('/<int:product_id>', methods=['PUT'])
-@jwt_required()
+@admin_required()
 def update_product(product_id):
     """Update an existing product (admin only)"""
-    from models.user import User
-    
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    
-    if not user or not user.is_admin:
-        return jsonify({'message': 'Admin privileges required'}), 403
-    
     product = Product.query.get_or_404(product_id)
     data = request.get_json()
+    stock_before = {product.id: product.stock}
     
     # Update product fields
     if 'name' in data:
@@ -120,6 +145,8 @@ def update_product(product_id):
     if 'images' in data and isinstance(data['images'], list):
         # Delete existing images
         ProductImage.query.filter_by(product_id=product_id).delete()
+        # Images are part of the product; the catalog snapshot spots changes by updated_at
+        product.updated_at = datetime.utcnow()
         
         # Add new images
         for img_data in data['images']:
@@ -131,29 +158,28 @@ def update_product(product_id):
             db.session.add(new_image)
     
     db.session.commit()
+    catalog_changed()
+    publish_stock_changes(stock_before, [product])
     return jsonify(product.to_dict()), 200
 
 @product_bp.route('/<int:product_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required()
 def delete_product(product_id):
     """Delete a product (admin only)"""
-    from models.user import User
-    
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    
-    if not user or not user.is_admin:
-        return jsonify({'message': 'Admin privileges required'}), 403
-    
     product = Product.query.get_or_404(product_id)
     
     db.session.delete(product)
     db.session.commit()
+    catalog_changed()
     
     return jsonify({'message': 'Product deleted successfully'}), 200
 
 @product_bp.route('/categories', methods=['GET'])
 def get_categories():
     """Get all product categories"""
+    snapshot = current_snapshot()
+    if snapshot is not None:
+        return snapshot_response(snapshot.categories), 200
+    
     categories = db.session.query(Product.category).distinct().all()
     return jsonify([category[0] for category in categories]), 200
@@ -0,0 +1,172 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from sqlalchemy import Float, case, cast
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from models.database import db
+from models.order import Order, OrderItem, ArchivedOrder, ArchivedOrderItem
+from models.product import Product
+from models.review import Review
+from utils.auth import admin_status_cache, DEFAULT_ADMIN_STATUS_TTL
+from utils.catalog_snapshot import catalog_changed
+
+review_bp = Blueprint('reviews', __name__)
+
+MAX_PAGE_SIZE = 50
+
+def adjust_rating(product_id, rating_delta, count_delta):
+    """Shift a product's rating aggregates in the current transaction.
+    
+    A single UPDATE with relative expressions, so concurrent review writes
+    cannot lose each other's changes.
+    """
+    total = Product.rating_total + rating_delta
+    count = Product.review_count + count_delta
+    db.session.query(Product).filter_by(id=product_id).update({
+        Product.rating_total: total,
+        Product.review_count: count,
+        Product.rating_avg: case((count > 0, cast(total, Float) / count), else_=0.0)
+    }, synchronize_session=False)
+
+def parse_rating(value):
+    """Rating as an int from 1 to 5, or None when invalid"""
+    try:
+        rating = int(value)
+    except (TypeError, ValueError):
+        return None
+    return rating if 1 <= rating <= 5 else None
+
+def has_purchased(user_id, product_id):
+    """Whether the user has a non-cancelled order for the product, live or archived"""
+    for order_model, item_model in ((Order, OrderItem), (ArchivedOrder, ArchivedOrderItem)):
+        if db.session.query(item_model.id).join(order_model).filter(
+            order_model.user_id == user_id,
+            order_model.status != 'cancelled',
+            item_model.product_id == product_id
+        ).first() is not None:
+            return True
+    return False
+
+@review_bp.route('/', methods=['GET'])
+def get_reviews():
+    """Get a product's reviews, newest first, with cursor pagination"""
+    product_id = request.args.get('product_id', type=int)
+    if product_id is None:
+        return jsonify({'message': 'product_id is required'}), 400
+    
+    limit = min(max(request.args.get('limit', 10, type=int), 1), MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor', type=int)
+    
+    product = Product.query.get_or_404(product_id)
+    
+    # Keyset pagination on (product_id, id): each page is one index range scan
+    query = Review.query.filter(Review.product_id == product_id)
+    if cursor is not None:
+        query = query.filter(Review.id < cursor)
+    reviews = query.order_by(Review.id.desc()).limit(limit + 1).options(joinedload(Review.user)).all()
+    
+    has_more = len(reviews) > limit
+    reviews = reviews[:limit]
+    
+    return jsonify({
+        'reviews': [review.to_dict() for review in reviews],
+        'next_cursor': reviews[-1].id if has_more else None,
+        'rating': round(product.rating_avg, 2),
+        'review_count': product.review_count
+    }), 200
+
+@review_bp.route('/', methods=['POST'])
+@jwt_required()
+def create_review():
+    """Review a product, once per user"""
+    current_user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    if not data or not data.get('product_id'):
+        return jsonify({'message': 'Product ID is required'}), 400
+    
+    rating = parse_rating(data.get('rating'))
+    if rating is None:
+        return jsonify({'message': 'Rating must be an integer from 1 to 5'}), 400
+    
+    if not Product.query.get(data['product_id']):
+        return jsonify({'message': 'Product not found'}), 404
+    
+    review = Review(
+        product_id=data['product_id'],
+        user_id=current_user_id,
+        rating=rating,
+        title=data.get('title'),
+        comment=data.get('comment'),
+        verified_purchase=has_purchased(current_user_id, data['product_id'])
+    )
+    db.session.add(review)
+    
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'You have already reviewed this product'}), 400
+    
+    adjust_rating(review.product_id, rating, 1)
+    db.session.commit()
+    catalog_changed()
+    
+    return jsonify({
+        'message': 'Review created successfully',
+        'review': review.to_dict()
+    }), 201
+
+@review_bp.route('/<int:review_id>', methods=['PUT'])
+@jwt_required()
+def update_review(review_id):
+    """Edit your own review"""
+    current_user_id = get_jwt_identity()
+    review = Review.query.get_or_404(review_id)
+    
+    if review.user_id != current_user_id:
+        return jsonify({'message': 'You can only edit your own reviews'}), 403
+    
+    data = request.get_json() or {}
+    rating_changed = False
+    
+    if 'rating' in data:
+        rating = parse_rating(data['rating'])
+        if rating is None:
+            return jsonify({'message': 'Rating must be an integer from 1 to 5'}), 400
+        if rating != review.rating:
+            adjust_rating(review.product_id, rating - review.rating, 0)
+            review.rating = rating
+            rating_changed = True
+    
+    for field in ['title', 'comment']:
+        if field in data:
+            setattr(review, field, data[field])
+    
+    db.session.commit()
+    if rating_changed:
+        catalog_changed()
+    
+    return jsonify({
+        'message': 'Review updated successfully',
+        'review': review.to_dict()
+    }), 200
+
+@review_bp.route('/<int:review_id>', methods=['DELETE'])
+@jwt_required()
+def delete_review(review_id):
+    """Delete your own review, or any review as an admin"""
+    current_user_id = get_jwt_identity()
+    review = Review.query.get_or_404(review_id)
+    
+    if review.user_id != current_user_id:
+        ttl = current_app.config.get('ADMIN_STATUS_TTL', DEFAULT_ADMIN_STATUS_TTL)
+        if not (get_jwt().get('is_admin') and admin_status_cache.is_admin(current_user_id, ttl)):
+            return jsonify({'message': 'You can only delete your own reviews'}), 403
+    
+    adjust_rating(review.product_id, -review.rating, -1)
+    db.session.delete(review)
+    db.session.commit()
+    catalog_changed()
+    
+    return jsonify({'message': 'Review deleted successfully'}), 200
@@ -1,19 +1,47 @@
+import time
+
+# Measured from here so boot time covers the dependency imports below
+_import_started = time.perf_counter()
+
+import importlib
 import os
+from datetime import timedelta
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
-from models.database import db
-from api.products import product_bp
-from api.auth import auth_bp
-from api.cart import cart_bp
-from api.orders import order_bp
-from api.payment import payment_bp
+from models.database import db, engine_options, init_engine
+from models.migrations import upgrade_schema
+from utils.revocation import init_revocation
+from utils.events import init_events
+from utils.catalog_snapshot import init_catalog_snapshot
+from utils.json_provider import create_json_provider
+from utils.compression import Compressor
+from utils.metrics import RequestMetrics
+from utils.query_log import QueryInspector
+from cli import register_commands
 
 # Load environment variables
 load_dotenv()
 
+_import_seconds = time.perf_counter() - _import_started
+
+# Blueprint modules are imported only when enabled, so a catalog-only
+# worker never loads the payment SDK
+BLUEPRINTS = {
+    'products': ('api.products', 'product_bp', '/api/products'),
+    'auth': ('api.auth', 'auth_bp', '/api/auth'),
+    'cart': ('api.cart', 'cart_bp', '/api/cart'),
+    'orders': ('api.orders', 'order_bp', '/api/orders'),
+    'payment': ('api.payment', 'payment_bp', '/api/payment'),
+    'reviews': ('api.reviews', 'review_bp', '/api/reviews'),
+    'events': ('api.events', 'events_bp', '/api/events'),
+    'batch': ('api.batch', 'batch_bp', '/api/batch')
+}
+
 def create_app(test_config=None):
+    started = time.perf_counter()
+
     # Create and configure the app
     app = Flask(__name__, instance_relative_config=True)
     
@@ -23,7 +51,44 @@ def create_app(test_config=None):
             SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
             SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URL', 'sqlite:///../database/hardware_ecommerce.db'),
             SQLALCHEMY_TRACK_MODIFICATIONS=False,
+            DATABASE_PROFILE=os.environ.get('DATABASE_PROFILE', 'production'),
+            SCHEMA_AUTO_UPGRADE=os.environ.get('SCHEMA_AUTO_UPGRADE', 'false').lower() == 'true',
+            API_BLUEPRINTS=[name for name in os.environ.get('API_BLUEPRINTS', ','.join(BLUEPRINTS)).split(',') if name],
+            ASYNC_DB_POOL_SIZE=int(os.environ.get('ASYNC_DB_POOL_SIZE', 10)),
+            ASGI_WSGI_THREADS=int(os.environ.get('ASGI_WSGI_THREADS', 16)),
+            LOW_STOCK_THRESHOLD=int(os.environ.get('LOW_STOCK_THRESHOLD', 10)),
+            EVENTS_HISTORY=int(os.environ.get('EVENTS_HISTORY', 1000)),
+            EVENTS_QUEUE_SIZE=int(os.environ.get('EVENTS_QUEUE_SIZE', 256)),
+            EVENTS_MAX_STREAMS=int(os.environ.get('EVENTS_MAX_STREAMS', 8)),
+            EVENTS_HEARTBEAT=int(os.environ.get('EVENTS_HEARTBEAT', 15)),
+            ORDER_ARCHIVE_DAYS=int(os.environ.get('ORDER_ARCHIVE_DAYS', 180)),
+            CART_RETENTION_DAYS=int(os.environ.get('CART_RETENTION_DAYS', 30)),
+            RECOMMENDATIONS_TOP_K=int(os.environ.get('RECOMMENDATIONS_TOP_K', 10)),
+            BATCH_MAX_REQUESTS=int(os.environ.get('BATCH_MAX_REQUESTS', 10)),
+            CATALOG_SNAPSHOT_PATH=os.environ.get('CATALOG_SNAPSHOT_PATH', ''),
+            CATALOG_SNAPSHOT_CHECK_INTERVAL=float(os.environ.get('CATALOG_SNAPSHOT_CHECK_INTERVAL', 1.0)),
+            CATALOG_SNAPSHOT_MIN_INTERVAL=float(os.environ.get('CATALOG_SNAPSHOT_MIN_INTERVAL', 2.0)),
+            CATALOG_SNAPSHOT_MAX_LAG=float(os.environ.get('CATALOG_SNAPSHOT_MAX_LAG', 5.0)),
+            JSON_PROVIDER=os.environ.get('JSON_PROVIDER', 'auto'),
+            COMPRESSION_MIN_SIZE=int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+            METRICS_ENABLED=os.environ.get('METRICS_ENABLED', 'true').lower() == 'true',
+            QUERY_LOG_SAMPLE_RATE=float(os.environ.get('QUERY_LOG_SAMPLE_RATE', 0.01)),
+            QUERY_LOG_SLOW_MS=float(os.environ.get('QUERY_LOG_SLOW_MS', 100)),
+            QUERY_LOG_REPEAT_THRESHOLD=int(os.environ.get('QUERY_LOG_REPEAT_THRESHOLD', 10)),
             JWT_SECRET_KEY=os.environ.get('JWT_SECRET_KEY', 'dev'),
+            JWT_ACCESS_TOKEN_EXPIRES=timedelta(minutes=int(os.environ.get('JWT_ACCESS_TOKEN_MINUTES', 15))),
+            JWT_REFRESH_TOKEN_EXPIRES=timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS', 30))),
+            REVOCATION_SYNC_INTERVAL=int(os.environ.get('REVOCATION_SYNC_INTERVAL', 5)),
+            REVOCATION_BLOOM_CAPACITY=int(os.environ.get('REVOCATION_BLOOM_CAPACITY', 100000)),
+            ADMIN_STATUS_TTL=int(os.environ.get('ADMIN_STATUS_TTL', 30)),
+            PASSWORD_HASH_METHOD=os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:260000'),
+            PASSWORD_HASH_WORKERS=int(os.environ.get('PASSWORD_HASH_WORKERS', 4)),
+            PASSWORD_HASH_QUEUE=int(os.environ.get('PASSWORD_HASH_QUEUE', 32)),
+            LOGIN_IP_RATE=float(os.environ.get('LOGIN_IP_RATE', 1.0)),
+            LOGIN_IP_BURST=int(os.environ.get('LOGIN_IP_BURST', 20)),
+            LOGIN_EMAIL_RATE=float(os.environ.get('LOGIN_EMAIL_RATE', 0.1)),
+            LOGIN_EMAIL_BURST=int(os.environ.get('LOGIN_EMAIL_BURST', 5)),
+            RATE_LIMIT_MAX_KEYS=int(os.environ.get('RATE_LIMIT_MAX_KEYS', 10000)),
             RAZORPAY_KEY_ID=os.environ.get('RAZORPAY_KEY_ID'),
             RAZORPAY_KEY_SECRET=os.environ.get('RAZORPAY_KEY_SECRET')
         )
@@ -31,10 +96,28 @@ def create_app(test_config=None):
         # Load the test config if passed in
         app.config.from_mapping(test_config)
 
+    # Pool settings depend on the database and profile, so derive them once both are known
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI'],
+        app.config.get('DATABASE_PROFILE')
+    ))
+
+    # Use the fastest available JSON encoder
+    app.json = create_json_provider(app)
+
     # Initialize extensions
     CORS(app)
-    JWTManager(app)
+    jwt = JWTManager(app)
+    init_revocation(app, jwt)
+    init_events(app)
+    init_catalog_snapshot(app)
     db.init_app(app)
+    init_engine(app)
+
+    # Metrics hooks run after compression, so they see the final response size
+    RequestMetrics(app)
+    QueryInspector(app)
+    Compressor(app)
 
     # Ensure the instance folder exists
     try:
@@ -43,22 +126,35 @@ def create_app(test_config=None):
         pass
 
     # Register blueprints
-    app.register_blueprint(product_bp, url_prefix='/api/products')
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(cart_bp, url_prefix='/api/cart')
-    app.register_blueprint(order_bp, url_prefix='/api/orders')
-    app.register_blueprint(payment_bp, url_prefix='/api/payment')
+    for name in app.config.get('API_BLUEPRINTS', BLUEPRINTS):
+        if name not in BLUEPRINTS:
+            raise ValueError(f"Unknown blueprint '{name}' in API_BLUEPRINTS")
+        module_name, attribute, url_prefix = BLUEPRINTS[name]
+        app.register_blueprint(getattr(importlib.import_module(module_name), attribute), url_prefix=url_prefix)
+
+    # Register CLI commands
+    register_commands(app)
 
     @app.route('/')
     def index():
         return jsonify({"message": "Welcome to Hardware E-commerce API"}), 200
 
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Schema changes normally run once per deploy via `flask upgrade-schema`,
+    # not in every worker
+    if app.config.get('SCHEMA_AUTO_UPGRADE', False):
+        with app.app_context():
+            upgrade_schema()
+
+    boot_seconds = {'import': _import_seconds, 'create_app': time.perf_counter() - started}
+    app.extensions['boot_seconds'] = boot_seconds
+    app.logger.info('App ready in %.1f ms (imports %.1f ms, create_app %.1f ms)',
+                    sum(boot_seconds.values()) * 1000, boot_seconds['import'] * 1000,
+                    boot_seconds['create_app'] * 1000)
 
     return app
 
 if __name__ == '__main__':
     app = create_app()
+    with app.app_context():
+        upgrade_schema(progress=app.logger.info)
     app.run(debug=True)
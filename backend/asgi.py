@@ -0,0 +1,188 @@
+"""ASGI entry point with an async read path for the catalog.
+
+GET requests for the product list, a single product and the category list
+are served on the event loop through an async SQLAlchemy engine over
+aiosqlite, so one worker can hold many of them in flight while they wait
+on the database. Every other request runs the Flask app on a bounded
+thread pool (ASGI_WSGI_THREADS).
+
+The async views run inside a normal Flask request context, so before and
+after request hooks (metrics, compression, ETags, the query log) and error
+handlers behave exactly as they do for the sync views.
+
+    cd backend
+    uvicorn --factory asgi:create_asgi_app --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from flask import request
+from app import create_app
+from api import catalog_async
+from models.async_database import init_async_engine
+
+# Flask endpoints that have an async implementation
+ASYNC_VIEWS = {
+    'products.get_products': catalog_async.get_products,
+    'products.get_product': catalog_async.get_product,
+    'products.get_categories': catalog_async.get_categories
+}
+
+ASYNC_PREFIX = '/api/products'
+
+
+def _environ(scope, body=b''):
+    """Build a WSGI environ for an ASGI HTTP scope"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin1').upper().replace('-', '_')
+        value = value.decode('latin1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            environ[name] = value
+            continue
+        key = f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    # The body is already buffered, including chunked uploads without a length
+    if body:
+        environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+
+def _header_list(headers):
+    return [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]
+
+
+class CatalogASGI:
+    """ASGI application wrapping a Flask app, see the module docstring"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.engine = init_async_engine(flask_app)
+        self.session_factory = flask_app.extensions['async_session']
+        self.executor = ThreadPoolExecutor(
+            max_workers=flask_app.config.get('ASGI_WSGI_THREADS', 16),
+            thread_name_prefix='wsgi'
+        )
+
+        # Let SQL metrics and the query log see the async engine's statements
+        for name in ('metrics', 'query_inspector'):
+            extension = flask_app.extensions.get(name)
+            if extension is not None:
+                extension.instrument_engine(self.engine.sync_engine)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+
+        if scope['method'] == 'GET' and scope['path'].startswith(ASYNC_PREFIX):
+            ctx = self.flask_app.request_context(_environ(scope))
+            ctx.match_request()
+            rule = ctx.request.url_rule
+            view = ASYNC_VIEWS.get(rule.endpoint) if rule is not None else None
+            if view is not None:
+                return await self._dispatch(ctx, view, send)
+
+        await self._run_wsgi(scope, receive, send)
+
+    async def _dispatch(self, ctx, view, send):
+        """Run an async view the way Flask's wsgi_app runs a sync one"""
+        app = self.flask_app
+        error = None
+        ctx.push()
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    async with self.session_factory() as session:
+                        rv = await view(session, **request.view_args)
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            response = app.finalize_request(rv)
+        except Exception as e:
+            error = e
+            response = app.handle_exception(e)
+        finally:
+            ctx.pop(error)
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': _header_list(response.headers.items())
+        })
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+    async def _run_wsgi(self, scope, receive, send):
+        """Run the Flask app on the thread pool, streaming its response body"""
+        body = bytearray()
+        while True:
+            message = await receive()
+            body.extend(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+
+        loop = asyncio.get_running_loop()
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = _header_list(headers)
+
+        def call_app():
+            result = self.flask_app(_environ(scope, bytes(body)), start_response)
+            return result, iter(result)
+
+        result, chunks = await loop.run_in_executor(self.executor, call_app)
+        try:
+            sent_start = False
+            while True:
+                chunk = await loop.run_in_executor(self.executor, next, chunks, None)
+                if not sent_start:
+                    await send({'type': 'http.response.start', 'status': started['status'],
+                                'headers': started['headers']})
+                    sent_start = True
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                await loop.run_in_executor(self.executor, result.close)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(test_config=None):
+    """Build the Flask app and wrap it for an ASGI server"""
+    return CatalogASGI(create_app(test_config))
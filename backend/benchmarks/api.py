@@ -0,0 +1,256 @@
+"""Throughput and latency benchmarks for the hot API endpoints.
+
+Seeds a SQLite file, builds the app with create_app(test_config) and
+exercises product list, product detail, categories, get_cart, add_to_cart,
+create_order and order history.
+
+    micro  one process, sequential requests through the Flask test client
+    load   --workers processes, each with its own app on the shared database,
+           issuing requests concurrently for --duration seconds
+
+Results are written as JSON. Pass --compare with an earlier results file to
+print the change per scenario, e.g. between two commits:
+
+    cd backend
+    python -m benchmarks.api micro --output before.json
+    git checkout <other commit>
+    python -m benchmarks.api micro --output after.json --compare before.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.common import build_app, seed, auth_headers, percentile
+
+SCENARIOS = [
+    'product_list',
+    'product_detail',
+    'categories',
+    'get_cart',
+    'add_to_cart',
+    'create_order',
+    'order_history'
+]
+
+
+class Context:
+    """Per-process state shared by the scenario functions"""
+
+    def __init__(self, app, args, user_ids, rng):
+        self.client = app.test_client()
+        self.args = args
+        self.rng = rng
+        self.headers = auth_headers(app, user_ids)
+        self.user_ids = list(self.headers)
+
+    def user(self):
+        return self.headers[self.rng.choice(self.user_ids)]
+
+    def product_id(self):
+        return self.rng.randint(1, self.args.products)
+
+
+def product_list(ctx):
+    return ctx.client.get('/api/products/', query_string={'page': ctx.rng.randint(1, 20), 'per_page': 20})
+
+
+def product_detail(ctx):
+    return ctx.client.get(f'/api/products/{ctx.product_id()}')
+
+
+def categories(ctx):
+    return ctx.client.get('/api/products/categories')
+
+
+def get_cart(ctx):
+    return ctx.client.get('/api/cart/', headers=ctx.user())
+
+
+def add_to_cart(ctx):
+    return ctx.client.post('/api/cart/add', headers=ctx.user(),
+                           json={'product_id': ctx.product_id(), 'quantity': 1})
+
+
+def create_order(ctx):
+    headers = ctx.user()
+    # Untimed setup: an order needs a non-empty cart
+    ctx.client.post('/api/cart/add', headers=headers, json={'product_id': ctx.product_id(), 'quantity': 1})
+    start = time.perf_counter()
+    response = ctx.client.post('/api/orders/', headers=headers, json={'shipping_address': '1 Test Street'})
+    return response, time.perf_counter() - start
+
+
+def order_history(ctx):
+    return ctx.client.get('/api/orders/', headers=ctx.user())
+
+
+def run_once(ctx, name):
+    """Run a scenario; return (ok, seconds) excluding any untimed setup"""
+    start = time.perf_counter()
+    result = globals()[name](ctx)
+    if isinstance(result, tuple):
+        response, elapsed = result
+    else:
+        response, elapsed = result, time.perf_counter() - start
+    return response.status_code < 400, elapsed
+
+
+def summarize(samples, errors, wall_seconds):
+    ms = [s * 1000 for s in samples]
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput_rps': round(len(samples) / wall_seconds, 1) if wall_seconds else 0,
+        'p50_ms': round(statistics.median(ms), 3) if ms else None,
+        'p99_ms': round(percentile(ms, 99), 3) if ms else None
+    }
+
+
+def run_micro(app, args, scenarios):
+    ctx = Context(app, args, range(1, min(args.users, 100) + 1), random.Random(args.seed))
+    results = {}
+    for name in scenarios:
+        for _ in range(args.warmup):
+            run_once(ctx, name)
+
+        samples, errors = [], 0
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            ok, elapsed = run_once(ctx, name)
+            samples.append(elapsed)
+            errors += not ok
+        results[name] = summarize(samples, errors, time.perf_counter() - start)
+    return results
+
+
+def _load_worker(worker_id, uri, args, scenarios, start_at, queue):
+    app = build_app(uri)
+    # Spread workers over distinct users so cart writes contend like real traffic
+    users_per_worker = max(1, min(args.users, 1000) // args.workers)
+    first = worker_id * users_per_worker + 1
+    ctx = Context(app, args, range(first, first + users_per_worker), random.Random(args.seed + worker_id))
+
+    samples = {name: [] for name in scenarios}
+    errors = {name: 0 for name in scenarios}
+    time.sleep(max(0, start_at - time.time()))
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        name = ctx.rng.choice(scenarios)
+        ok, elapsed = run_once(ctx, name)
+        samples[name].append(elapsed)
+        errors[name] += not ok
+    queue.put((samples, errors))
+
+
+def run_load(uri, args, scenarios):
+    queue = multiprocessing.Queue()
+    start_at = time.time() + 2
+    processes = [
+        multiprocessing.Process(target=_load_worker, args=(i, uri, args, scenarios, start_at, queue))
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    samples = {name: [] for name in scenarios}
+    errors = {name: 0 for name in scenarios}
+    for _ in processes:
+        worker_samples, worker_errors = queue.get()
+        for name in scenarios:
+            samples[name].extend(worker_samples[name])
+            errors[name] += worker_errors[name]
+    for process in processes:
+        process.join()
+
+    results = {name: summarize(samples[name], errors[name], args.duration) for name in scenarios}
+    results['total'] = summarize([s for name in scenarios for s in samples[name]],
+                                 sum(errors.values()), args.duration)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    """Print p50 and throughput change per scenario against a baseline run"""
+    print(f"{'scenario':<16}{'p50 ms':>18}{'change':>10}{'rps':>18}{'change':>10}")
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or not result['p50_ms'] or not before['p50_ms']:
+            continue
+        p50_change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+        rps_change = (result['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'] * 100
+        print(f"{name:<16}{before['p50_ms']:>8.2f} -> {result['p50_ms']:<7.2f}{p50_change:>+9.1f}%"
+              f"{before['throughput_rps']:>8.0f} -> {result['throughput_rps']:<7.0f}{rps_change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('mode', choices=['micro', 'load'])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--orders', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=500, help='Timed requests per scenario (micro)')
+    parser.add_argument('--warmup', type=int, default=50, help='Untimed requests per scenario (micro)')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes (load)')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds to run (load)')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated subset to run')
+    parser.add_argument('--database', help='Reuse this SQLite file instead of seeding a new one')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--compare', help='Earlier results JSON to compare against')
+    args = parser.parse_args()
+
+    scenarios = [name for name in args.scenarios.split(',') if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.abspath(args.database) if args.database else os.path.join(tmp, 'bench.db')
+        uri = f'sqlite:///{path}'
+        app = build_app(uri)
+        if not args.database:
+            seed(app, args.users, args.products, args.orders, args.seed)
+
+        if args.mode == 'micro':
+            results = run_micro(app, args, scenarios)
+        else:
+            results = run_load(uri, args, scenarios)
+
+    report = {
+        'mode': args.mode,
+        'commit': git_commit(),
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'results': results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Compare sync gunicorn workers with the async ASGI catalog path per MB of RAM.
+
+Seeds a SQLite file, then for each server configuration starts the server,
+drives the catalog endpoints (product list, product detail, categories)
+with N concurrent keep-alive clients for --duration seconds and samples the
+proportional set size (PSS) of the whole server process tree, so pages
+shared between forked workers are counted once.
+
+    sync   gunicorn "app:create_app()" --workers W (one request per worker)
+    async  uvicorn --factory asgi:create_asgi_app, one process
+
+Requires gunicorn, uvicorn and aiosqlite.
+
+    cd backend
+    python -m benchmarks.async_catalog --concurrency 8,64,256 --sync-workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import build_app, seed, percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid):
+    """All descendant PIDs of pid, read from /proc"""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    parents.setdefault(int(f.read().rsplit(')', 1)[1].split()[1]), []).append(int(entry))
+            except OSError:
+                continue
+    found, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def tree_pss_mb(pid):
+    """Proportional set size of pid and its descendants, in MB"""
+    total_kb = 0
+    for member in [pid] + _children(pid):
+        try:
+            with open(f'/proc/{member}/smaps_rollup') as f:
+                for line in f:
+                    if line.startswith('Pss:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def server_command(kind, port, workers):
+    if kind == 'sync':
+        return [sys.executable, '-m', 'gunicorn', 'app:create_app()', '--bind', f'127.0.0.1:{port}',
+                '--workers', str(workers), '--worker-class', 'sync', '--backlog', '4096', '--log-level', 'warning']
+    return [sys.executable, '-m', 'uvicorn', '--factory', 'asgi:create_asgi_app', '--host', '127.0.0.1',
+            '--port', str(port), '--workers', '1', '--log-level', 'warning', '--backlog', '4096']
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+async def _request(state, port, path):
+    """One GET over a kept-alive connection; reconnects when the server closes it"""
+    if state.get('writer') is None:
+        state['reader'], state['writer'] = await asyncio.open_connection('127.0.0.1', port)
+    reader, writer = state['reader'], state['writer']
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: bench\r\nAccept-Encoding: gzip\r\n\r\n'.encode())
+    await writer.drain()
+
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {k.lower(): v.strip() for k, v in (line.split(':', 1) for line in lines[1:] if ':' in line)}
+    await reader.readexactly(int(headers.get('content-length', 0)))
+
+    if headers.get('connection', '').lower() == 'close':
+        writer.close()
+        state['writer'] = None
+    return status
+
+
+async def _client(port, products, deadline, rng, samples, errors):
+    state = {}
+    paths = [
+        lambda: f'/api/products/?page={rng.randint(1, 20)}&per_page=20',
+        lambda: f'/api/products/{rng.randint(1, products)}',
+        lambda: '/api/products/categories'
+    ]
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            ok = await _request(state, port, rng.choice(paths)()) < 400
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            ok = False
+            state['writer'] = None
+        samples.append(time.perf_counter() - start)
+        errors[0] += not ok
+
+
+async def drive(port, concurrency, products, duration, seed_value, server_pid):
+    samples, errors, pss = [], [0], []
+    deadline = time.perf_counter() + duration
+
+    async def sample_memory():
+        while time.perf_counter() < deadline:
+            pss.append(tree_pss_mb(server_pid))
+            await asyncio.sleep(0.5)
+
+    rng = random.Random(seed_value)
+    await asyncio.gather(sample_memory(), *[
+        _client(port, products, deadline, random.Random(rng.random()), samples, errors)
+        for _ in range(concurrency)
+    ])
+    return samples, errors[0], max(pss)
+
+
+def run_config(kind, args, uri, concurrency):
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=uri, QUERY_LOG_SAMPLE_RATE='0', QUERY_LOG_SLOW_MS='60000',
+               SCHEMA_AUTO_UPGRADE='false')
+    server = subprocess.Popen(server_command(kind, port, args.sync_workers), cwd=BACKEND_DIR, env=env)
+    try:
+        wait_for_port(port)
+        # Warm every worker's caches before measuring
+        asyncio.run(drive(port, max(concurrency, args.sync_workers), args.products, 2, args.seed, server.pid))
+        samples, errors, pss_mb = asyncio.run(
+            drive(port, concurrency, args.products, args.duration, args.seed, server.pid))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    ms = [s * 1000 for s in samples]
+    rps = len(samples) / args.duration
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput_rps': round(rps, 1),
+        'p50_ms': round(statistics.median(ms), 2),
+        'p99_ms': round(percentile(ms, 99), 2),
+        'pss_mb': round(pss_mb, 1),
+        'rps_per_mb': round(rps / pss_mb, 2),
+        'in_flight_per_mb': round(concurrency / pss_mb, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--concurrency', default='8,64,256', help='Comma-separated client counts')
+    parser.add_argument('--sync-workers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = build_app(uri)
+        seed(app, users=10, products=args.products, orders=0, seed_value=args.seed)
+
+        results = {}
+        for concurrency in [int(c) for c in args.concurrency.split(',')]:
+            results[concurrency] = {
+                f'sync_{args.sync_workers}_workers': run_config('sync', args, uri, concurrency),
+                'async_1_worker': run_config('async', args, uri, concurrency)
+            }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
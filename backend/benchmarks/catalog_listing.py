@@ -0,0 +1,123 @@
+"""Compare sorted and price-filtered product listings with and without the catalog indexes.
+
+Seeds a file database with varied stock and ratings, then requests
+GET /api/products/ with each combination of sort, category, price range
+and in_stock on random pages in the first --max-page pages. The baseline
+run drops the composite indexes from migration 0006 and restores the
+single-column rating index, which matches the old schema. The catalog
+snapshot is not enabled, so every request runs its queries.
+
+    cd backend
+    python -m benchmarks.catalog_listing --products 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from sqlalchemy import text
+from benchmarks.common import build_app, seed, percentile
+
+# Added by migration 0006; dropped to reproduce the baseline
+CATALOG_INDEXES = [
+    'ix_products_category_price_id_stock',
+    'ix_products_category_created_at_id_price',
+    'ix_products_category_name_id_price',
+    'ix_products_category_rating_avg_id_price',
+    'ix_products_price_id_stock',
+    'ix_products_created_at_id_price',
+    'ix_products_name_id_price',
+    'ix_products_rating_avg_id_price'
+]
+
+CASES = {
+    'sort_price': 'sort=price',
+    'sort_newest': 'sort=newest',
+    'sort_name': 'sort=name',
+    'sort_rating': 'sort=rating',
+    'price_high_in_stock': 'sort=price&order=desc&in_stock=1',
+    'newest_wide_range': 'sort=newest&min_price=50&max_price=250',
+    'rating_narrow_range': 'sort=rating&min_price=100&max_price=102&in_stock=1',
+    'category_price': 'category=category_3&sort=price',
+    'category_newest_range': 'category=category_3&sort=newest&min_price=50&max_price=250',
+    'category_rating_in_stock': 'category=category_3&sort=rating&in_stock=1',
+    'category_unsorted_range': 'category=category_3&min_price=50&max_price=250'
+}
+
+
+def vary_catalog(app, products, seed_value):
+    """Give products a mix of stock levels, some sold out, and ratings, some unrated"""
+    from models.database import db
+
+    rng = random.Random(seed_value)
+    with app.app_context():
+        db.session.execute(text('UPDATE products SET stock = :stock, rating_avg = :rating WHERE id = :id'), [
+            {'id': i, 'stock': rng.choice((0, rng.randint(1, 50))),
+             'rating': rng.choice((0.0, round(rng.uniform(1, 5), 2)))}
+            for i in range(1, products + 1)
+        ])
+        db.session.commit()
+
+
+def drop_catalog_indexes(app):
+    from models.database import db
+
+    with app.app_context():
+        for name in CATALOG_INDEXES:
+            db.session.execute(text(f'DROP INDEX IF EXISTS {name}'))
+        db.session.execute(text('CREATE INDEX IF NOT EXISTS ix_products_rating_avg ON products (rating_avg)'))
+        db.session.commit()
+
+
+def bench_listings(app, iterations, max_page, rng):
+    client = app.test_client()
+    results = {}
+    for name, query in CASES.items():
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = client.get(f'/api/products/?per_page=12&page={rng.randint(1, max_page)}&{query}')
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.status_code
+        results[name] = {
+            'p50_ms': round(statistics.median(samples), 3),
+            'p99_ms': round(percentile(samples, 99), 3)
+        }
+    return results
+
+
+def run_variant(variant, args):
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        app = build_app(f'sqlite:///{path}')
+        seed(app, 10, args.products, 0, args.seed)
+        vary_catalog(app, args.products, args.seed)
+        if variant == 'baseline':
+            drop_catalog_indexes(app)
+
+        results = bench_listings(app, args.iterations, args.max_page, rng)
+
+        from models.database import db
+        with app.app_context():
+            db.engine.dispose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--max-page', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    results = {variant: run_variant(variant, args) for variant in ('baseline', 'indexed')}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
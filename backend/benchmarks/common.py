@@ -0,0 +1,104 @@
+"""Shared helpers for the benchmark scripts: app construction and seeding."""
+import json
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+BENCHMARK_SECRET = 'benchmark-secret-key-with-enough-bytes'
+
+# Cheap hashes keep seeding fast; login throughput is not what these measure
+BENCHMARK_PASSWORD = 'benchmark'
+
+
+def build_app(uri, **overrides):
+    """Create an app for benchmarking against the given database URI"""
+    from app import create_app
+
+    config = {
+        'SQLALCHEMY_DATABASE_URI': uri,
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'JWT_SECRET_KEY': BENCHMARK_SECRET,
+        'JWT_ACCESS_TOKEN_EXPIRES': timedelta(hours=12),
+        'DATABASE_PROFILE': 'production',
+        'SCHEMA_AUTO_UPGRADE': True,
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'LOGIN_IP_BURST': 10 ** 9,
+        'LOGIN_EMAIL_BURST': 10 ** 9,
+        'QUERY_LOG_SAMPLE_RATE': 0.0
+    }
+    config.update(overrides)
+    return create_app(config)
+
+
+def seed(app, users, products, orders, seed_value=42, categories=20):
+    """Bulk-insert a deterministic dataset; returns nothing, ids start at 1"""
+    from models.database import db
+    from werkzeug.security import generate_password_hash
+
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(BENCHMARK_PASSWORD, 'pbkdf2:sha256:1000')
+
+    with app.app_context():
+        conn = db.session.connection()
+        conn.execute(text(
+            "INSERT INTO users (id, email, password_hash, first_name, last_name, address, phone, is_admin, created_at, updated_at) "
+            "VALUES (:id, :email, :password_hash, 'Bench', 'User', '1 Test Street', '', 0, :now, :now)"
+        ), [{'id': i, 'email': f'user{i}@example.com', 'password_hash': password_hash, 'now': now}
+            for i in range(1, users + 1)])
+        conn.execute(text(
+            "INSERT INTO products (id, name, description, price, stock, category, specifications, created_at, updated_at) "
+            "VALUES (:id, :name, :description, :price, 1000000, :category, :specifications, :created_at, :created_at)"
+        ), [{'id': i, 'name': f'Product {i}', 'description': f'Benchmark product {i} ' * 5,
+             'price': round(rng.uniform(5, 500), 2), 'category': f'category_{i % categories}',
+             'specifications': json.dumps({'weight': f'{rng.randint(1, 20)}kg', 'sku': f'SKU-{i}'}),
+             'created_at': now - timedelta(minutes=i)} for i in range(1, products + 1)])
+        conn.execute(text(
+            "INSERT INTO product_images (product_id, image_url, is_primary, created_at) "
+            "VALUES (:product_id, :image_url, :is_primary, :now)"
+        ), [{'product_id': i, 'image_url': f'https://example.com/{i}/{n}.jpg', 'is_primary': n == 0, 'now': now}
+            for i in range(1, products + 1) for n in range(2)])
+
+        order_rows = []
+        item_rows = []
+        statuses = ['pending', 'paid', 'shipped', 'delivered', 'cancelled']
+        for order_id in range(1, orders + 1):
+            order_rows.append({
+                'id': order_id, 'user_id': rng.randint(1, users), 'total': 10.0,
+                'status': rng.choice(statuses), 'created_at': now - timedelta(minutes=order_id)
+            })
+            for _ in range(rng.randint(1, 3)):
+                item_rows.append({'order_id': order_id, 'product_id': rng.randint(1, products), 'now': now})
+            if len(order_rows) >= 10000:
+                _insert_orders(conn, order_rows, item_rows)
+                order_rows, item_rows = [], []
+        _insert_orders(conn, order_rows, item_rows)
+        db.session.commit()
+
+
+def _insert_orders(conn, orders, items):
+    if not orders:
+        return
+    conn.execute(text(
+        "INSERT INTO orders (id, user_id, total_amount, status, shipping_address, created_at, updated_at) "
+        "VALUES (:id, :user_id, :total, :status, '1 Test Street', :created_at, :created_at)"
+    ), orders)
+    conn.execute(text(
+        "INSERT INTO order_items (order_id, product_id, quantity, price, created_at) "
+        "VALUES (:order_id, :product_id, 1, 10.0, :now)"
+    ), items)
+
+
+def auth_headers(app, user_ids):
+    """Bearer headers for the given users, minted directly rather than via login"""
+    from models.user import User
+    from utils.auth import issue_tokens
+
+    with app.app_context():
+        users = User.query.filter(User.id.in_(user_ids)).all()
+        return {user.id: {'Authorization': f"Bearer {issue_tokens(user)['access_token']}"} for user in users}
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
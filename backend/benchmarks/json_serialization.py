@@ -0,0 +1,104 @@
+"""Compare the stdlib and orjson JSON providers on an order history response.
+
+Builds an order history with 500 order items in an in-memory database,
+loads every relationship up front so no SQL runs while timing, then times
+to_dict() plus encoding through each provider.
+
+    cd backend
+    python -m benchmarks.json_serialization --items 500
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from utils.json_provider import StdlibJSONProvider, OrjsonProvider, orjson
+
+
+def build_history(app, items, items_per_order, products):
+    from models.database import db
+    from models.order import Order, OrderItem
+    from models.product import Product, ProductImage
+    from models.user import User
+
+    with app.app_context():
+        user = User(email='bench@example.com', first_name='Bench', last_name='User', password_hash='x')
+        db.session.add(user)
+        for i in range(products):
+            product = Product(
+                name=f'Product {i}', description='A sturdy tool ' * 10, price=10.0 + i,
+                stock=100, category=f'category_{i % 8}',
+                specifications=json.dumps({'power': '18V', 'weight': '1.5kg', 'sku': f'SKU-{i}'})
+            )
+            product.images = [ProductImage(image_url=f'https://example.com/{i}/{n}.jpg', is_primary=n == 0)
+                              for n in range(3)]
+            db.session.add(product)
+        db.session.flush()
+
+        now = datetime.utcnow()
+        for order_number in range(items // items_per_order):
+            order = Order(user_id=user.id, total_amount=100.0, shipping_address='1 Test Street',
+                          created_at=now - timedelta(days=order_number))
+            order.order_items = [
+                OrderItem(product_id=(order_number * items_per_order + n) % products + 1, quantity=1, price=10.0)
+                for n in range(items_per_order)
+            ]
+            db.session.add(order)
+        db.session.commit()
+
+
+def time_provider(app, provider, rounds):
+    from models.order import Order
+
+    samples = []
+    with app.test_request_context():
+        orders = Order.query.order_by(Order.created_at.desc()).all()
+        # Touch every relationship so lazy loads happen before timing
+        for order in orders:
+            for item in order.order_items:
+                item.product.images
+
+        body = b''
+        for _ in range(rounds):
+            start = time.perf_counter()
+            product_cache = {}
+            payload = {'orders': [order.to_dict(product_cache) for order in orders], 'total': len(orders)}
+            body = provider.response(payload).get_data()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'p50_ms': round(statistics.median(samples), 3),
+        'min_ms': round(min(samples), 3),
+        'bytes': len(body)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--items-per-order', type=int, default=5)
+    parser.add_argument('--products', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    from app import create_app
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'SCHEMA_AUTO_UPGRADE': True,
+        'JWT_SECRET_KEY': 'benchmark-secret-key-with-enough-bytes'
+    })
+    build_history(app, args.items, args.items_per_order, args.products)
+
+    providers = {'stdlib': StdlibJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+
+    results = {name: time_provider(app, provider, args.rounds) for name, provider in providers.items()}
+    if 'orjson' in results:
+        results['speedup'] = round(results['stdlib']['p50_ms'] / results['orjson']['p50_ms'], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
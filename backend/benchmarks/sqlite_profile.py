@@ -0,0 +1,143 @@
+"""Compare the default SQLite setup against the production profile.
+
+Seeds a file database, then measures indexed read paths and concurrent
+checkout writes. The baseline run drops the model indexes and skips the
+connection pragmas and pool settings, which matches the old configuration.
+
+    cd backend
+    python -m benchmarks.sqlite_profile --orders 200000 --writers 8
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from sqlalchemy import text
+from benchmarks.common import build_app, seed, auth_headers, percentile
+
+# Indexes added by the production profile; dropped to reproduce the baseline
+PROFILE_INDEXES = [
+    'ix_cart_items_user_id_product_id',
+    'ix_orders_user_id_created_at',
+    'ix_orders_status_created_at',
+    'ix_orders_created_at',
+    'ix_order_items_order_id',
+    'ix_product_images_product_id',
+    'ix_products_category'
+]
+
+
+def drop_profile_indexes(app):
+    from models.database import db
+
+    with app.app_context():
+        for name in PROFILE_INDEXES:
+            db.session.execute(text(f'DROP INDEX IF EXISTS {name}'))
+        db.session.commit()
+
+
+def bench_reads(app, users, iterations, rng):
+    """Time the order history and admin status queries the API runs"""
+    from models.database import db
+    from models.order import Order, OrderItem
+
+    results = {}
+    with app.app_context():
+        cases = {
+            'order_history': lambda: Order.query.filter_by(user_id=rng.randint(1, users))
+                .order_by(Order.created_at.desc()).limit(10).all(),
+            'admin_orders_by_status': lambda: Order.query.filter_by(status='pending')
+                .order_by(Order.created_at.desc()).limit(10).all(),
+            'order_items_for_order': lambda: OrderItem.query.filter_by(order_id=rng.randint(1, 1000)).all()
+        }
+        for name, query in cases.items():
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                query()
+                samples.append((time.perf_counter() - start) * 1000)
+                db.session.remove()
+            results[name] = {
+                'p50_ms': round(statistics.median(samples), 3),
+                'p99_ms': round(percentile(samples, 99), 3)
+            }
+    return results
+
+
+def bench_checkout(app, users, products, writers, duration, rng):
+    """Concurrent add-to-cart plus create-order through the API"""
+    headers_by_user = auth_headers(app, range(1, writers + 1))
+
+    counts = {'orders': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(headers, seed_value):
+        local_rng = random.Random(seed_value)
+        local_client = app.test_client()
+        while time.perf_counter() < deadline:
+            try:
+                local_client.post('/api/cart/add', headers=headers,
+                                  json={'product_id': local_rng.randint(1, products), 'quantity': 1})
+                response = local_client.post('/api/orders/', headers=headers,
+                                             json={'shipping_address': 'addr'})
+                ok = response.status_code == 201
+            except Exception:
+                ok = False
+            with lock:
+                counts['orders' if ok else 'errors'] += 1
+
+    threads = [threading.Thread(target=worker, args=(headers, rng.random()))
+               for headers in headers_by_user.values()]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'orders_per_sec': round(counts['orders'] / elapsed, 1),
+        'errors': counts['errors']
+    }
+
+
+def run_profile(profile, args):
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        app = build_app(f'sqlite:///{path}', DATABASE_PROFILE='production' if profile == 'production' else 'none')
+        seed(app, args.users, args.products, args.orders, args.seed)
+        if profile == 'baseline':
+            drop_profile_indexes(app)
+
+        reads = bench_reads(app, args.users, args.iterations, rng)
+        checkout = bench_checkout(app, args.users, args.products, args.writers, args.duration, rng)
+
+        from models.database import db
+        with app.app_context():
+            db.engine.dispose()
+
+    return {'reads': reads, 'checkout': checkout}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    results = {profile: run_profile(profile, args) for profile in ('baseline', 'production')}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
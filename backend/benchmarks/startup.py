@@ -0,0 +1,74 @@
+"""Measure worker boot time: a fresh interpreter importing and building the app.
+
+Each sample starts a new Python process, as a gunicorn worker restart
+would, and records the import phase, create_app and total wall time
+including interpreter startup. Variants cover the full app, a
+catalog-only worker (API_BLUEPRINTS=products) and a worker that checks
+migrations at startup (SCHEMA_AUTO_UPGRADE=true).
+
+    cd backend
+    python -m benchmarks.startup --runs 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+VARIANTS = {
+    'full': {},
+    'catalog_only': {'API_BLUEPRINTS': 'products'},
+    'auto_upgrade': {'SCHEMA_AUTO_UPGRADE': 'true'}
+}
+
+WORKER = (
+    'import json, sys\n'
+    'from app import create_app\n'
+    'app = create_app()\n'
+    "boot = app.extensions['boot_seconds']\n"
+    "print(json.dumps({**boot, 'razorpay_loaded': 'razorpay' in sys.modules}))\n"
+)
+
+
+def sample(env):
+    start = time.perf_counter()
+    output = subprocess.check_output([sys.executable, '-c', WORKER], env=env, text=True,
+                                     cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    wall = time.perf_counter() - start
+    result = json.loads(output.strip().splitlines()[-1])
+    result['wall'] = wall
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--variants', default=','.join(VARIANTS), help='Comma-separated subset to run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}")
+
+        # Migrate once up front, as a deploy step would
+        subprocess.check_call([sys.executable, '-c', WORKER], stdout=subprocess.DEVNULL,
+                              env=dict(base_env, SCHEMA_AUTO_UPGRADE='true'),
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        results = {}
+        for name in args.variants.split(','):
+            env = dict(base_env, **VARIANTS[name])
+            samples = [sample(env) for _ in range(args.runs)]
+            results[name] = {
+                phase: round(statistics.median(s[phase] for s in samples) * 1000, 1)
+                for phase in ('import', 'create_app', 'wall')
+            }
+            results[name]['razorpay_loaded'] = samples[0]['razorpay_loaded']
+
+    print(json.dumps({'unit': 'ms (median)', 'runs': args.runs, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import json
+import click
+from datetime import datetime, timedelta
+from flask.cli import with_appcontext
+
+
+@click.command('reconcile-payments')
+@click.option('--since', type=click.DateTime(), help='Window start (UTC), defaults to --days ago')
+@click.option('--until', type=click.DateTime(), help='Window end (UTC), defaults to now')
+@click.option('--days', default=1, show_default=True, help='Window length when --since is omitted')
+@click.option('--concurrency', default=4, show_default=True, help='Parallel gateway requests')
+@click.option('--batch-size', default=500, show_default=True, help='Orders updated per transaction')
+@click.option('--gateway-fixture', type=click.Path(exists=True, dir_okay=False),
+              help='Reconcile against a local fake gateway loaded from this JSON file')
+@click.option('--report', type=click.Path(dir_okay=False), help='Write the JSON report to this file')
+@click.option('--dry-run', is_flag=True, help='Report mismatches without updating orders')
+@with_appcontext
+def reconcile_payments_command(since, until, days, concurrency, batch_size,
+                               gateway_fixture, report, dry_run):
+    """Match gateway payments to orders and fix orders stuck in pending."""
+    from services.reconciliation import reconcile_payments
+
+    if gateway_fixture:
+        from services.fake_gateway import FakeRazorpayClient
+        client = FakeRazorpayClient.from_file(gateway_fixture)
+    else:
+        from api.payment import get_razorpay_client
+        client = get_razorpay_client()
+
+    until = until or datetime.utcnow()
+    since = since or until - timedelta(days=days)
+
+    result = reconcile_payments(
+        client, since, until,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        dry_run=dry_run
+    )
+
+    output = json.dumps(result, indent=2)
+    if report:
+        with open(report, 'w') as f:
+            f.write(output)
+    click.echo(output)
+
+
+@click.command('purge-revoked-tokens')
+@with_appcontext
+def purge_revoked_tokens_command():
+    """Delete revocation records for tokens that have already expired."""
+    from utils.revocation import purge_expired_tokens
+
+    click.echo(f'Purged {purge_expired_tokens()} expired token records')
+
+
+@click.command('seed')
+@click.option('--products', default=1000, show_default=True, help='Products to create')
+@click.option('--users', default=500, show_default=True, help='Users to create')
+@click.option('--orders', default=5000, show_default=True, help='Orders to create')
+@click.option('--images-per-product', default=5, show_default=True, help='Images per product')
+@click.option('--cart-fraction', default=0.1, show_default=True, help='Share of users with an open cart')
+@click.option('--days', default=730, show_default=True, help='Spread created_at over this many days')
+@click.option('--seed', 'seed_value', default=42, show_default=True, help='Random seed; same seed, same data')
+@click.option('--now', type=click.DateTime(), help='End of the generated history (UTC), defaults to a fixed date')
+@click.option('--batch-size', default=50000, show_default=True, help='Rows per bulk insert')
+@with_appcontext
+def seed_command(products, users, orders, images_per_product, cart_fraction, days, seed_value, now, batch_size):
+    """Fill the database with synthetic products, users, carts and orders."""
+    import time
+    from services.seed import seed_database
+
+    start = time.perf_counter()
+    result = seed_database(
+        products=products,
+        users=users,
+        orders=orders,
+        seed=seed_value,
+        batch_size=batch_size,
+        images_per_product=images_per_product,
+        cart_fraction=cart_fraction,
+        days=days,
+        now=now,
+        progress=click.echo
+    )
+    click.echo(f'Seeded {json.dumps(result)} in {time.perf_counter() - start:.1f}s')
+
+
+@click.command('refresh-recommendations')
+@click.option('--full', is_flag=True, help='Recount all orders instead of only those since the last refresh')
+@click.option('--top-k', type=int, help='Related products kept per product, defaults to RECOMMENDATIONS_TOP_K')
+@click.option('--batch-size', default=100000, show_default=True, help='Order IDs read per batch')
+@with_appcontext
+def refresh_recommendations_command(full, top_k, batch_size):
+    """Update "frequently bought together" products from new orders."""
+    import time
+    from flask import current_app
+    from services.recommendations import refresh_recommendations
+
+    start = time.perf_counter()
+    result = refresh_recommendations(
+        full=full,
+        top_k=top_k or current_app.config.get('RECOMMENDATIONS_TOP_K', 10),
+        batch_size=batch_size,
+        progress=click.echo
+    )
+    click.echo(f'Refreshed {json.dumps(result)} in {time.perf_counter() - start:.1f}s')
+
+
+@click.command('archive-orders')
+@click.option('--days', type=int, help='Archive orders older than this, defaults to ORDER_ARCHIVE_DAYS')
+@click.option('--batch-size', default=1000, show_default=True, help='Orders moved per transaction')
+@with_appcontext
+def archive_orders_command(days, batch_size):
+    """Move old delivered and cancelled orders into the archive tables."""
+    from flask import current_app
+    from services.archive import archive_orders
+
+    result = archive_orders(
+        older_than_days=days if days is not None else current_app.config.get('ORDER_ARCHIVE_DAYS', 180),
+        batch_size=batch_size,
+        progress=click.echo
+    )
+    click.echo(f"Archived {result['orders']} orders and {result['order_items']} order items")
+
+
+@click.command('sweep-carts')
+@click.option('--days', type=int, help='Delete carts untouched for this long, defaults to CART_RETENTION_DAYS')
+@click.option('--batch-size', default=500, show_default=True, help='Stale cart items examined per batch')
+@click.option('--pause', default=0.05, show_default=True, help='Seconds to wait between batches')
+@with_appcontext
+def sweep_carts_command(days, batch_size, pause):
+    """Delete abandoned carts."""
+    from flask import current_app
+    from services.carts import sweep_abandoned_carts
+
+    result = sweep_abandoned_carts(
+        retention_days=days if days is not None else current_app.config.get('CART_RETENTION_DAYS', 30),
+        batch_size=batch_size,
+        pause=pause,
+        progress=click.echo
+    )
+    click.echo(f"Deleted {result['carts']} carts ({result['cart_items']} items)")
+
+
+@click.command('build-catalog-snapshot')
+@click.option('--full', is_flag=True, help='Serialize every product instead of only changed ones')
+@with_appcontext
+def build_catalog_snapshot_command(full):
+    """Rebuild the memory-mapped catalog snapshot, e.g. after editing products outside the API."""
+    import time
+    from flask import current_app
+
+    snapshots = current_app.extensions.get('catalog_snapshot')
+    if snapshots is None:
+        raise click.ClickException('CATALOG_SNAPSHOT_PATH is not set')
+
+    start = time.perf_counter()
+    snapshots.build(full=full)
+    click.echo(f'Built {snapshots.path} in {time.perf_counter() - start:.1f}s')
+
+
+@click.command('upgrade-schema')
+@click.option('--target', type=int, help='Stop after this migration version')
+@with_appcontext
+def upgrade_schema_command(target):
+    """Apply pending schema migrations."""
+    from models.migrations import upgrade_schema
+
+    applied = upgrade_schema(target=target, progress=click.echo)
+    click.echo(f'{len(applied)} migration(s) applied' if applied else 'Schema is up to date')
+
+
+@click.command('schema-status')
+@with_appcontext
+def schema_status_command():
+    """List migrations and whether each has been applied."""
+    from models.database import db
+    from models.migrations import applied_versions, discover_migrations
+
+    with db.engine.connect() as conn:
+        applied = applied_versions(conn)
+    for migration in discover_migrations():
+        state = 'applied' if migration.version in applied else 'pending'
+        click.echo(f'{migration.version:04d}_{migration.name}  {state}')
+
+
+def register_commands(app):
+    """Register CLI commands on the app"""
+    app.cli.add_command(reconcile_payments_command)
+    app.cli.add_command(purge_revoked_tokens_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(refresh_recommendations_command)
+    app.cli.add_command(archive_orders_command)
+    app.cli.add_command(sweep_carts_command)
+    app.cli.add_command(build_catalog_snapshot_command)
+    app.cli.add_command(upgrade_schema_command)
+    app.cli.add_command(schema_status_command)
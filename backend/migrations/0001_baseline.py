@@ -0,0 +1,102 @@
+"""Baseline schema: users, catalog, carts, orders and revoked tokens.
+
+Every statement is IF NOT EXISTS, so databases created earlier by
+db.create_all() can be brought under version control by applying this.
+"""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS users (
+        id INTEGER NOT NULL,
+        email VARCHAR(120) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        address TEXT,
+        phone VARCHAR(20),
+        is_admin BOOLEAN,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (email)
+    )""",
+    """CREATE TABLE IF NOT EXISTS products (
+        id INTEGER NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        description TEXT NOT NULL,
+        price FLOAT NOT NULL,
+        stock INTEGER NOT NULL,
+        category VARCHAR(50) NOT NULL,
+        specifications TEXT NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_products_category ON products (category)",
+    """CREATE TABLE IF NOT EXISTS product_images (
+        id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        image_url VARCHAR(255) NOT NULL,
+        is_primary BOOLEAN,
+        created_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(product_id) REFERENCES products (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_product_images_product_id ON product_images (product_id)",
+    """CREATE TABLE IF NOT EXISTS cart_items (
+        id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity INTEGER,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(product_id) REFERENCES products (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_cart_items_user_id_product_id ON cart_items (user_id, product_id)",
+    """CREATE TABLE IF NOT EXISTS orders (
+        id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        total_amount FLOAT NOT NULL,
+        status VARCHAR(20),
+        payment_id VARCHAR(100),
+        shipping_address TEXT NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_orders_created_at ON orders (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_payment_id ON orders (payment_id)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_status_created_at ON orders (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_user_id_created_at ON orders (user_id, created_at)",
+    """CREATE TABLE IF NOT EXISTS order_items (
+        id INTEGER NOT NULL,
+        order_id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        price FLOAT NOT NULL,
+        created_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(order_id) REFERENCES orders (id),
+        FOREIGN KEY(product_id) REFERENCES products (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_order_items_order_id ON order_items (order_id)",
+    """CREATE TABLE IF NOT EXISTS revoked_tokens (
+        id INTEGER NOT NULL,
+        jti VARCHAR(36) NOT NULL,
+        token_type VARCHAR(10) NOT NULL,
+        user_id INTEGER,
+        expires_at DATETIME NOT NULL,
+        created_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (jti),
+        FOREIGN KEY(user_id) REFERENCES users (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)"
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
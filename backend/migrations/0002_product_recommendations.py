@@ -0,0 +1,33 @@
+"""Co-purchase counts, top-K related products and the refresh watermark.
+
+product_cooccurrence holds every pair count so refreshes can add new
+orders to it; product_related holds the precomputed top-K per product,
+keyed for a single range scan by product_id.
+"""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS product_cooccurrence (
+        product_id INTEGER NOT NULL,
+        related_product_id INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (product_id, related_product_id)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS product_related (
+        product_id INTEGER NOT NULL,
+        rank INTEGER NOT NULL,
+        related_product_id INTEGER NOT NULL,
+        score INTEGER NOT NULL,
+        PRIMARY KEY (product_id, rank)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS recommendation_state (
+        id INTEGER NOT NULL,
+        last_order_id INTEGER NOT NULL,
+        refreshed_at DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )"""
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
@@ -0,0 +1,55 @@
+"""Product reviews, plus rating aggregates kept on products.
+
+rating_total and review_count are maintained with each review write and
+rating_avg is derived from them, so catalog queries can sort and filter
+by rating through ix_products_rating_avg.
+"""
+from sqlalchemy import inspect
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS reviews (
+        id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        rating INTEGER NOT NULL,
+        title VARCHAR(100),
+        comment TEXT,
+        verified_purchase BOOLEAN,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (product_id, user_id),
+        FOREIGN KEY(product_id) REFERENCES products (id),
+        FOREIGN KEY(user_id) REFERENCES users (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_product_id_id ON reviews (product_id, id)",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_user_id ON reviews (user_id)"
+]
+
+PRODUCT_COLUMNS = {
+    'rating_total': 'INTEGER NOT NULL DEFAULT 0',
+    'review_count': 'INTEGER NOT NULL DEFAULT 0',
+    'rating_avg': 'FLOAT NOT NULL DEFAULT 0'
+}
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
+
+    existing = {column['name'] for column in inspect(conn).get_columns('products')}
+    for name, definition in PRODUCT_COLUMNS.items():
+        if name not in existing:
+            conn.exec_driver_sql(f'ALTER TABLE products ADD COLUMN {name} {definition}')
+
+    # Aggregate any reviews already present
+    conn.exec_driver_sql(
+        'UPDATE products SET '
+        'rating_total = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.product_id = products.id), '
+        'review_count = (SELECT COUNT(*) FROM reviews WHERE reviews.product_id = products.id) '
+        'WHERE id IN (SELECT DISTINCT product_id FROM reviews)'
+    )
+    conn.exec_driver_sql(
+        'UPDATE products SET rating_avg = CAST(rating_total AS FLOAT) / review_count WHERE review_count > 0'
+    )
+    conn.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_products_rating_avg ON products (rating_avg)')
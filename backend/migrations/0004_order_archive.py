@@ -0,0 +1,40 @@
+"""Archive tables for old delivered and cancelled orders.
+
+Same columns as orders and order_items plus archived_at, and the same
+IDs, so an order keeps its ID when `flask archive-orders` moves it.
+"""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS archived_orders (
+        id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        total_amount FLOAT NOT NULL,
+        status VARCHAR(20),
+        payment_id VARCHAR(100),
+        shipping_address TEXT NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        archived_at DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_archived_orders_user_id_created_at ON archived_orders (user_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_archived_orders_status_created_at ON archived_orders (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_archived_orders_created_at ON archived_orders (created_at)",
+    """CREATE TABLE IF NOT EXISTS archived_order_items (
+        id INTEGER NOT NULL,
+        order_id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        price FLOAT NOT NULL,
+        created_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(order_id) REFERENCES archived_orders (id),
+        FOREIGN KEY(product_id) REFERENCES products (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_archived_order_items_order_id ON archived_order_items (order_id)"
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
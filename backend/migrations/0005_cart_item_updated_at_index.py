@@ -0,0 +1,10 @@
+"""Index cart_items.updated_at, so `flask sweep-carts` finds abandoned carts with a range scan."""
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_cart_items_updated_at ON cart_items (updated_at)"
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
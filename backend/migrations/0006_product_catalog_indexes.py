@@ -0,0 +1,28 @@
+"""Composite indexes for sorted and price-filtered catalog listings.
+
+One index per sort (price, newest, name, rating), with and without a
+leading category, with id as the tie-break and price included so price
+ranges are checked in the index. Only the price indexes also carry stock,
+which every order updates; listing counts with in_stock read those. The
+rating index replaces ix_products_rating_avg from 0003.
+"""
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_products_category_price_id_stock ON products (category, price, id, stock)",
+    "CREATE INDEX IF NOT EXISTS ix_products_category_created_at_id_price "
+    "ON products (category, created_at, id, price)",
+    "CREATE INDEX IF NOT EXISTS ix_products_category_name_id_price "
+    "ON products (category, name, id, price)",
+    "CREATE INDEX IF NOT EXISTS ix_products_category_rating_avg_id_price "
+    "ON products (category, rating_avg, id, price)",
+    "CREATE INDEX IF NOT EXISTS ix_products_price_id_stock ON products (price, id, stock)",
+    "CREATE INDEX IF NOT EXISTS ix_products_created_at_id_price ON products (created_at, id, price)",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_id_price ON products (name, id, price)",
+    "CREATE INDEX IF NOT EXISTS ix_products_rating_avg_id_price ON products (rating_avg, id, price)",
+    "DROP INDEX IF EXISTS ix_products_rating_avg"
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
@@ -0,0 +1,43 @@
+from sqlalchemy.engine import make_url
+from models.database import SQLITE_PRODUCTION_PRAGMAS, apply_sqlite_pragmas
+
+try:
+    import aiosqlite  # noqa: F401 - only needed by the async driver
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+except ImportError:  # pragma: no cover - depends on the environment
+    aiosqlite = None
+
+
+def async_database_uri(uri):
+    """The aiosqlite URL for a file-backed SQLite URI, or None for anything else"""
+    url = make_url(uri)
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return None
+    return url.set(drivername='sqlite+aiosqlite')
+
+
+def init_async_engine(app):
+    """Create the async engine and session factory used by the ASGI read path.
+
+    The engine reads the same database as the Flask app, with its own pool
+    (ASYNC_DB_POOL_SIZE) and the same connection pragmas under the
+    production profile. Stored in app.extensions['async_session'].
+    """
+    if aiosqlite is None:
+        raise RuntimeError('The async read path needs the aiosqlite package')
+
+    url = async_database_uri(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url is None:
+        raise RuntimeError('The async read path supports file-backed SQLite databases only')
+
+    engine = create_async_engine(
+        url,
+        pool_size=app.config.get('ASYNC_DB_POOL_SIZE', 10),
+        max_overflow=app.config.get('ASYNC_DB_MAX_OVERFLOW', 10)
+    )
+    if app.config.get('DATABASE_PROFILE') == 'production':
+        apply_sqlite_pragmas(engine.sync_engine, app.config.get('SQLITE_PRAGMAS', SQLITE_PRODUCTION_PRAGMAS))
+
+    app.extensions['async_engine'] = engine
+    app.extensions['async_session'] = async_sessionmaker(engine, expire_on_commit=False)
+    return engine
@@ -3,6 +3,12 @@ from datetime import datetime
 
 class CartItem(db.Model):
     __tablename__ = 'cart_items'
+    __table_args__ = (
+        # Serves both per-user cart listing and the add_to_cart duplicate check
+        db.Index('ix_cart_items_user_id_product_id', 'user_id', 'product_id'),
+        # Range scans for the abandoned cart sweeper
+        db.Index('ix_cart_items_updated_at', 'updated_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -17,13 +23,13 @@ class CartItem(db.Model):
     def __repr__(self):
         return f'<CartItem {self.id}>'
     
-    def to_dict(self):
+    def to_dict(self, product_cache=None):
         return {
             'id': self.id,
             'user_id': self.user_id,
             'product_id': self.product_id,
-            'product': self.product.to_dict() if self.product else None,
+            'product': self.product.to_cached_dict(product_cache) if self.product else None,
             'quantity': self.quantity,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
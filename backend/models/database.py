@@ -1,3 +1,60 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 
 db = SQLAlchemy()
+
+# Applied to every new SQLite connection under the production profile
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64000,  # Negative means KiB, so 64 MB per connection
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY'
+}
+
+SQLITE_PRODUCTION_POOL = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30
+}
+
+
+def _is_file_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def engine_options(uri, profile):
+    """SQLALCHEMY_ENGINE_OPTIONS for a database URI and profile name"""
+    if profile != 'production' or not _is_file_sqlite(uri):
+        return {}
+
+    return {
+        **SQLITE_PRODUCTION_POOL,
+        'connect_args': {'check_same_thread': False}
+    }
+
+
+def init_engine(app):
+    """Apply connection-level settings for the configured database profile"""
+    if app.config.get('DATABASE_PROFILE') != 'production':
+        return
+
+    pragmas = app.config.get('SQLITE_PRAGMAS', SQLITE_PRODUCTION_PRAGMAS)
+
+    with app.app_context():
+        if db.engine.url.get_backend_name() == 'sqlite':
+            apply_sqlite_pragmas(db.engine, pragmas)
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Run the given PRAGMA statements on every new connection of a sync engine"""
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
@@ -0,0 +1,89 @@
+import importlib.util
+import os
+import re
+from datetime import datetime
+from sqlalchemy import inspect, text
+from models.database import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+_MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+class Migration:
+    """A numbered schema change in the migrations directory"""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def load(self):
+        spec = importlib.util.spec_from_file_location(f'migrations.m{self.version:04d}_{self.name}', self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Migrations found on disk, ordered by version"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort(key=lambda m: m.version)
+
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f'Duplicate migration versions in {directory}')
+    return migrations
+
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+        'version INTEGER NOT NULL PRIMARY KEY, '
+        'name VARCHAR(100) NOT NULL, '
+        'applied_at DATETIME NOT NULL)'
+    ))
+
+
+def applied_versions(conn):
+    """Versions recorded in schema_migrations; empty before the first upgrade"""
+    if not inspect(conn).has_table('schema_migrations'):
+        return set()
+    return {row[0] for row in conn.execute(text('SELECT version FROM schema_migrations'))}
+
+
+def pending_migrations():
+    with db.engine.connect() as conn:
+        applied = applied_versions(conn)
+    return [m for m in discover_migrations() if m.version not in applied]
+
+
+def upgrade_schema(target=None, progress=None):
+    """Apply pending migrations up to target (default: latest), in order.
+
+    Each migration and its schema_migrations row share a transaction, and
+    the version primary key makes a concurrent runner fail rather than
+    record a migration twice. The SQLite driver commits DDL as it goes, so
+    migrations should use IF NOT EXISTS where they can be re-run safely.
+    Returns the migrations that were applied.
+    """
+    report = progress or (lambda message: None)
+    applied = []
+    for migration in pending_migrations():
+        if target is not None and migration.version > target:
+            break
+        module = migration.load()
+        with db.engine.begin() as conn:
+            _ensure_version_table(conn)
+            module.upgrade(conn)
+            conn.execute(
+                text('INSERT INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :applied_at)'),
+                {'version': migration.version, 'name': migration.name, 'applied_at': datetime.utcnow()}
+            )
+        report(f'Applied {migration.version:04d}_{migration.name}')
+        applied.append(migration)
+    return applied
@@ -3,14 +3,19 @@ from datetime import datetime
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Order history and the admin status filter both sort by newest first
+        db.Index('ix_orders_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_orders_status_created_at', 'status', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     total_amount = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), default='pending')  # pending, paid, shipped, delivered, cancelled
-    payment_id = db.Column(db.String(100))
+    payment_id = db.Column(db.String(100), index=True)
     shipping_address = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -19,7 +24,10 @@ class Order(db.Model):
     def __repr__(self):
         return f'<Order {self.id}>'
     
-    def to_dict(self):
+    def to_dict(self, product_cache=None):
+        # Share one product dict across every item and order in a response
+        if product_cache is None:
+            product_cache = {}
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -27,16 +35,16 @@ class Order(db.Model):
             'status': self.status,
             'payment_id': self.payment_id,
             'shipping_address': self.shipping_address,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'order_items': [item.to_dict() for item in self.order_items]
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'order_items': [item.to_dict(product_cache) for item in self.order_items]
         }
 
 class OrderItem(db.Model):
     __tablename__ = 'order_items'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Float, nullable=False)  # Price at time of purchase
@@ -48,13 +56,58 @@ class OrderItem(db.Model):
     def __repr__(self):
         return f'<OrderItem {self.id}>'
     
-    def to_dict(self):
+    def to_dict(self, product_cache=None):
         return {
             'id': self.id,
             'order_id': self.order_id,
             'product_id': self.product_id,
-            'product': self.product.to_dict() if self.product else None,
+            'product': self.product.to_cached_dict(product_cache) if self.product else None,
             'quantity': self.quantity,
             'price': self.price,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
+
+class ArchivedOrder(db.Model):
+    """An order moved out of the hot tables by services/archive.py"""
+    __tablename__ = 'archived_orders'
+    __table_args__ = (
+        db.Index('ix_archived_orders_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_archived_orders_status_created_at', 'status', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    total_amount = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20))
+    payment_id = db.Column(db.String(100))
+    shipping_address = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, index=True)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+    
+    # Relationships
+    order_items = db.relationship('ArchivedOrderItem', backref='order', lazy=True)
+    
+    def __repr__(self):
+        return f'<ArchivedOrder {self.id}>'
+    
+    # Same shape as a live order, so clients need not care where it is stored
+    to_dict = Order.to_dict
+
+class ArchivedOrderItem(db.Model):
+    __tablename__ = 'archived_order_items'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('archived_orders.id'), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    price = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime)
+    
+    # Relationships
+    product = db.relationship('Product')
+    
+    def __repr__(self):
+        return f'<ArchivedOrderItem {self.id}>'
+    
+    to_dict = OrderItem.to_dict
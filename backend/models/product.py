@@ -1,20 +1,44 @@
 from models.database import db
 import json
 from datetime import datetime
+from functools import lru_cache
+
+# Specifications repeat across requests, so parse each distinct string once.
+# Callers only serialize the result and must not mutate it.
+_parse_specifications = lru_cache(maxsize=4096)(json.loads)
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        # One per catalog sort, with and without a category. id follows the
+        # sort column as the tie-break, and price rides along so price ranges
+        # are checked in the index. Only the price indexes carry stock, which
+        # every order updates, and listing counts are answered from those
+        db.Index('ix_products_category_price_id_stock', 'category', 'price', 'id', 'stock'),
+        db.Index('ix_products_category_created_at_id_price', 'category', 'created_at', 'id', 'price'),
+        db.Index('ix_products_category_name_id_price', 'category', 'name', 'id', 'price'),
+        db.Index('ix_products_category_rating_avg_id_price', 'category', 'rating_avg', 'id', 'price'),
+        db.Index('ix_products_price_id_stock', 'price', 'id', 'stock'),
+        db.Index('ix_products_created_at_id_price', 'created_at', 'id', 'price'),
+        db.Index('ix_products_name_id_price', 'name', 'id', 'price'),
+        db.Index('ix_products_rating_avg_id_price', 'rating_avg', 'id', 'price'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     price = db.Column(db.Float, nullable=False)
     stock = db.Column(db.Integer, nullable=False, default=0)
-    category = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False, index=True)
     specifications = db.Column(db.Text, nullable=False)  # JSON string for size, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Review aggregates, maintained by api/reviews.py on every review write
+    rating_total = db.Column(db.Integer, nullable=False, default=0)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_avg = db.Column(db.Float, nullable=False, default=0)
+    
     # Relationships
     images = db.relationship('ProductImage', backref='product', lazy=True, cascade="all, delete-orphan")
     
@@ -29,12 +53,22 @@ class Product(db.Model):
             'price': self.price,
             'stock': self.stock,
             'category': self.category,
-            'specifications': json.loads(self.specifications),
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'specifications': _parse_specifications(self.specifications),
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'rating': round(self.rating_avg or 0, 2),
+            'review_count': self.review_count or 0,
             'images': [image.to_dict() for image in self.images]
         }
     
+    def to_cached_dict(self, cache=None):
+        """to_dict, memoized by product ID in cache when one is given"""
+        if cache is None:
+            return self.to_dict()
+        if self.id not in cache:
+            cache[self.id] = self.to_dict()
+        return cache[self.id]
+    
     @classmethod
     def from_dict(cls, data):
         if 'specifications' in data and isinstance(data['specifications'], dict):
@@ -45,7 +79,7 @@ class ProductImage(db.Model):
     __tablename__ = 'product_images'
     
     id = db.Column(db.Integer, primary_key=True)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
     image_url = db.Column(db.String(255), nullable=False)
     is_primary = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -59,5 +93,5 @@ class ProductImage(db.Model):
             'product_id': self.product_id,
             'image_url': self.image_url,
             'is_primary': self.is_primary,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
@@ -0,0 +1,18 @@
+from models.database import db
+
+class RelatedProduct(db.Model):
+    """Precomputed "frequently bought together" neighbour, see services/recommendations.py"""
+    __tablename__ = 'product_related'
+
+    product_id = db.Column(db.Integer, primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    # No foreign key, as in migration 0002: rows are rebuilt by every full
+    # refresh and readers skip products deleted in between
+    related_product_id = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Integer, nullable=False)  # orders containing both products
+
+    # Relationships
+    related_product = db.relationship('Product', primaryjoin='foreign(RelatedProduct.related_product_id) == Product.id')
+
+    def __repr__(self):
+        return f'<RelatedProduct {self.product_id} #{self.rank}>'
@@ -0,0 +1,46 @@
+from models.database import db
+from datetime import datetime
+
+class Review(db.Model):
+    __tablename__ = 'reviews'
+    __table_args__ = (
+        db.UniqueConstraint('product_id', 'user_id'),
+        # Per-product listing pages newest first by ID
+        db.Index('ix_reviews_product_id_id', 'product_id', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    rating = db.Column(db.Integer, nullable=False)  # 1 to 5
+    title = db.Column(db.String(100))
+    comment = db.Column(db.Text)
+    verified_purchase = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    product = db.relationship('Product', backref=db.backref('reviews', lazy='dynamic', cascade="all, delete-orphan"))
+    user = db.relationship('User')
+    
+    def __repr__(self):
+        return f'<Review {self.id} for Product {self.product_id}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'product_id': self.product_id,
+            'user_id': self.user_id,
+            # Only the public part of the reviewer's profile
+            'user': {
+                'id': self.user.id,
+                'first_name': self.user.first_name,
+                'last_name': self.user.last_name
+            } if self.user else None,
+            'rating': self.rating,
+            'title': self.title,
+            'comment': self.comment,
+            'verified_purchase': self.verified_purchase,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
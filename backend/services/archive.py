@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from models.database import db
+
+# Orders in these states never change again, so they can leave the hot tables
+ARCHIVABLE_STATUSES = ('delivered', 'cancelled')
+
+ORDER_COLUMNS = 'id, user_id, total_amount, status, payment_id, shipping_address, created_at, updated_at'
+ITEM_COLUMNS = 'id, order_id, product_id, quantity, price, created_at'
+
+
+def archive_orders(older_than_days=180, batch_size=1000, progress=None):
+    """Move delivered and cancelled orders created before the cutoff into the archive tables.
+
+    Each batch copies the orders and their items, then deletes them, in its
+    own transaction, so the job can stop at any point and never leaves an
+    order in both places or in neither. Batches are found through
+    ix_orders_status_created_at. The order with the highest ID always stays,
+    because SQLite hands out max(id) + 1 as the next ID and an archived ID
+    must never be reused. Returns the number of orders and items moved.
+    """
+    report = progress or (lambda message: None)
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    statuses = ', '.join(f"'{status}'" for status in ARCHIVABLE_STATUSES)
+    moved = {'orders': 0, 'order_items': 0}
+
+    while True:
+        with db.engine.begin() as conn:
+            ids = [row[0] for row in conn.exec_driver_sql(
+                f'SELECT id FROM orders WHERE status IN ({statuses}) AND created_at < ? '
+                'AND id < (SELECT MAX(id) FROM orders) LIMIT ?',
+                (cutoff, batch_size)
+            )]
+            if not ids:
+                break
+
+            placeholders = ', '.join('?' for _ in ids)
+            params = tuple(ids)
+            archived_at = datetime.utcnow()
+            conn.exec_driver_sql(
+                f'INSERT INTO archived_orders ({ORDER_COLUMNS}, archived_at) '
+                f'SELECT {ORDER_COLUMNS}, ? FROM orders WHERE id IN ({placeholders})',
+                (archived_at,) + params
+            )
+            items = conn.exec_driver_sql(
+                f'INSERT INTO archived_order_items ({ITEM_COLUMNS}) '
+                f'SELECT {ITEM_COLUMNS} FROM order_items WHERE order_id IN ({placeholders})',
+                params
+            ).rowcount
+            conn.exec_driver_sql(f'DELETE FROM order_items WHERE order_id IN ({placeholders})', params)
+            conn.exec_driver_sql(f'DELETE FROM orders WHERE id IN ({placeholders})', params)
+
+        moved['orders'] += len(ids)
+        moved['order_items'] += items
+        report(f"Archived {moved['orders']} orders so far")
+
+        if len(ids) < batch_size:
+            break
+
+    if moved['orders'] and db.engine.dialect.name == 'sqlite':
+        with db.engine.begin() as conn:
+            # Refresh planner statistics for the now much smaller hot tables
+            conn.exec_driver_sql('PRAGMA optimize')
+    return moved
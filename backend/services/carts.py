@@ -0,0 +1,54 @@
+import time
+from datetime import datetime, timedelta
+from models.database import db
+
+
+def sweep_abandoned_carts(retention_days=30, batch_size=500, pause=0.0, progress=None):
+    """Delete carts whose items have all been left untouched for retention_days.
+
+    A cart is every cart_items row of one user, and is kept whole while any
+    of its items was added or changed within the retention period. Stale
+    items are walked in (updated_at, id) order through
+    ix_cart_items_updated_at, batch_size at a time, so each batch is one
+    index range read that starts where the last one stopped. The owners'
+    carts are deleted in one short write transaction per batch, sleeping
+    pause seconds in between so request writes are not held up. The DELETE
+    skips any cart with a recent item, so active carts that also hold old
+    items survive, as does a cart the user touches meanwhile. Returns the
+    number of carts and items deleted.
+    """
+    report = progress or (lambda message: None)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = {'carts': 0, 'cart_items': 0}
+    position = (datetime.min, 0)
+
+    while True:
+        with db.engine.connect() as conn:
+            stale = conn.exec_driver_sql(
+                'SELECT updated_at, id, user_id FROM cart_items '
+                'WHERE updated_at < ? AND (updated_at, id) > (?, ?) ORDER BY updated_at, id LIMIT ?',
+                (cutoff,) + position + (batch_size,)
+            ).fetchall()
+        if not stale:
+            break
+        position = tuple(stale[-1][:2])
+
+        user_ids = tuple({row[2] for row in stale})
+        placeholders = ', '.join('?' for _ in user_ids)
+        with db.engine.begin() as conn:
+            rows = conn.exec_driver_sql(
+                f'DELETE FROM cart_items WHERE user_id IN ({placeholders}) AND NOT EXISTS '
+                '(SELECT 1 FROM cart_items AS recent WHERE recent.user_id = cart_items.user_id '
+                'AND recent.updated_at >= ?) RETURNING user_id',
+                user_ids + (cutoff,)
+            ).fetchall()
+
+        deleted['carts'] += len({row[0] for row in rows})
+        deleted['cart_items'] += len(rows)
+        report(f"Deleted {deleted['carts']} abandoned carts so far")
+
+        if len(stale) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return deleted
@@ -0,0 +1,65 @@
+import json
+import threading
+
+
+class _Collection:
+    """In-memory stand-in for a Razorpay resource collection"""
+
+    def __init__(self, items, not_found_message):
+        self._items = items
+        self._by_id = {item['id']: item for item in items}
+        self._not_found_message = not_found_message
+
+    def all(self, data={}, **kwargs):
+        start = data.get('from', 0)
+        end = data.get('to', float('inf'))
+        count = min(int(data.get('count', 10)), 100)
+        skip = int(data.get('skip', 0))
+
+        # Razorpay returns newest first within the window
+        matching = [
+            item for item in self._items
+            if start <= item.get('created_at', 0) <= end
+        ]
+        matching.sort(key=lambda item: item.get('created_at', 0), reverse=True)
+        page = matching[skip:skip + count]
+
+        return {'entity': 'collection', 'count': len(page), 'items': page}
+
+    def fetch(self, entity_id, data={}, **kwargs):
+        if entity_id not in self._by_id:
+            raise ValueError(self._not_found_message)
+        return self._by_id[entity_id]
+
+
+class FakeRazorpayClient:
+    """Local fake of the parts of razorpay.Client used by the reconciliation job.
+
+    Holds gateway orders and payments in memory so reconciliation can run
+    against a fixture file instead of the live API.
+    """
+
+    def __init__(self, orders=None, payments=None):
+        self.order = _Collection(orders or [], 'The id provided does not exist')
+        self.payment = _Collection(payments or [], 'The id provided does not exist')
+        self.calls = 0
+        self._lock = threading.Lock()
+
+        # Count every API call so callers can check paging behaviour
+        for resource in (self.order, self.payment):
+            for name in ('all', 'fetch'):
+                setattr(resource, name, self._counted(getattr(resource, name)))
+
+    def _counted(self, func):
+        def wrapper(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a fixture of the form {"orders": [...], "payments": [...]}"""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(orders=data.get('orders'), payments=data.get('payments'))
@@ -0,0 +1,152 @@
+from datetime import datetime
+import numpy as np
+from scipy import sparse
+from models.database import db
+
+DEFAULT_TOP_K = 10
+
+# SQLite allows 32766 bound parameters per statement
+_ID_CHUNK = 10000
+
+
+def _read_baskets(conn, after_id, through_id):
+    """(order_id, product_id) rows for orders in (after_id, through_id], live or archived"""
+    rows = conn.exec_driver_sql(
+        'SELECT order_items.order_id, order_items.product_id FROM order_items '
+        'JOIN orders ON orders.id = order_items.order_id '
+        "WHERE order_items.order_id > ? AND order_items.order_id <= ? AND orders.status != 'cancelled' "
+        'UNION ALL '
+        'SELECT archived_order_items.order_id, archived_order_items.product_id FROM archived_order_items '
+        'JOIN archived_orders ON archived_orders.id = archived_order_items.order_id '
+        'WHERE archived_order_items.order_id > ? AND archived_order_items.order_id <= ? '
+        "AND archived_orders.status != 'cancelled'",
+        (after_id, through_id, after_id, through_id)
+    ).fetchall()
+    return np.array(rows, dtype=np.int64).reshape(-1, 2)
+
+
+def cooccurrence(order_ids, product_ids, size):
+    """size x size sparse matrix counting the orders that contain each pair of products.
+
+    Built as B.T @ B from the order x product incidence matrix B, indexed
+    by product ID. The diagonal is dropped.
+    """
+    _, order_index = np.unique(order_ids, return_inverse=True)
+    baskets = sparse.csr_matrix(
+        (np.ones(len(product_ids), dtype=np.int64), (order_index, product_ids)),
+        shape=(int(order_index.max()) + 1, size)
+    )
+    # A product on two lines of the same order still counts once
+    baskets.data[:] = 1
+    counts = (baskets.T @ baskets).tocsr()
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+    return counts
+
+
+def top_neighbours(product_ids, related_ids, scores, k):
+    """Rank each product's pairs by score (ties by lower ID) and keep the first k.
+
+    Returns (product_id, rank, related_product_id, score) arrays, ranks from 1.
+    """
+    order = np.lexsort((related_ids, -scores, product_ids))
+    product_ids, related_ids, scores = product_ids[order], related_ids[order], scores[order]
+
+    # Position within each product's run of rows
+    starts = np.flatnonzero(np.r_[True, product_ids[1:] != product_ids[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(product_ids)])
+    ranks = np.arange(len(product_ids)) - np.repeat(starts, run_lengths) + 1
+
+    keep = ranks <= k
+    return product_ids[keep], ranks[keep], related_ids[keep], scores[keep]
+
+
+def _write_related(conn, product_ids, ranks, related_ids, scores):
+    rows = list(zip(product_ids.tolist(), ranks.tolist(), related_ids.tolist(), scores.tolist()))
+    if rows:
+        conn.exec_driver_sql(
+            'INSERT INTO product_related (product_id, rank, related_product_id, score) VALUES (?, ?, ?, ?)', rows
+        )
+
+
+def refresh_recommendations(full=False, top_k=DEFAULT_TOP_K, batch_size=100000, progress=None):
+    """Update co-purchase counts and the top-K related products from order history.
+
+    Reads orders after the last refresh's watermark (all orders on the first
+    run or with full=True) in batches of batch_size order IDs, adds their
+    pair counts to product_cooccurrence and re-ranks only the products those
+    orders touched. Cancelled orders are skipped when read; an order
+    cancelled after it was counted stays counted until the next full run.
+    Runs in one transaction, so readers see either the old or the new
+    recommendations.
+    """
+    report = progress or (lambda message: None)
+    conn = db.session.connection()
+
+    through_id = conn.exec_driver_sql('SELECT MAX(id) FROM orders').scalar() or 0
+    last_order_id = None if full else conn.exec_driver_sql(
+        'SELECT last_order_id FROM recommendation_state WHERE id = 1'
+    ).scalar()
+    full = last_order_id is None
+    after_id = 0 if full else last_order_id
+
+    size = (conn.exec_driver_sql('SELECT MAX(id) FROM products').scalar() or 0) + 1
+    delta = sparse.csr_matrix((size, size), dtype=np.int64)
+    for start in range(after_id, through_id, batch_size):
+        end = min(start + batch_size, through_id)
+        baskets = _read_baskets(conn, start, end)
+        if len(baskets):
+            # Items can reference products deleted since, with IDs above the current maximum
+            if baskets[:, 1].max() >= size:
+                size = int(baskets[:, 1].max()) + 1
+                delta.resize((size, size))
+            delta = delta + cooccurrence(baskets[:, 0], baskets[:, 1], size)
+        report(f'Counted orders {start + 1}-{end}: {delta.nnz} product pairs so far')
+
+    delta.sort_indices()
+    pairs = delta.tocoo()
+    rows = list(zip(pairs.row.tolist(), pairs.col.tolist(), pairs.data.tolist()))
+
+    if full:
+        conn.exec_driver_sql('DELETE FROM product_cooccurrence')
+        conn.exec_driver_sql('DELETE FROM product_related')
+        if rows:
+            conn.exec_driver_sql(
+                'INSERT INTO product_cooccurrence (product_id, related_product_id, count) VALUES (?, ?, ?)', rows
+            )
+        _write_related(conn, *top_neighbours(pairs.row, pairs.col, pairs.data, top_k))
+        refreshed = len(np.unique(pairs.row))
+    else:
+        if rows:
+            conn.exec_driver_sql(
+                'INSERT INTO product_cooccurrence (product_id, related_product_id, count) VALUES (?, ?, ?) '
+                'ON CONFLICT (product_id, related_product_id) DO UPDATE SET count = count + excluded.count',
+                rows
+            )
+        # Re-rank touched products from their full counts
+        touched = np.unique(pairs.row).tolist()
+        for index in range(0, len(touched), _ID_CHUNK):
+            chunk = tuple(touched[index:index + _ID_CHUNK])
+            placeholders = ', '.join('?' for _ in chunk)
+            counts = np.array(conn.exec_driver_sql(
+                'SELECT product_id, related_product_id, count FROM product_cooccurrence '
+                f'WHERE product_id IN ({placeholders})', chunk
+            ).fetchall(), dtype=np.int64).reshape(-1, 3)
+            conn.exec_driver_sql(f'DELETE FROM product_related WHERE product_id IN ({placeholders})', chunk)
+            _write_related(conn, *top_neighbours(counts[:, 0], counts[:, 1], counts[:, 2], top_k))
+        refreshed = len(touched)
+
+    conn.exec_driver_sql(
+        'INSERT INTO recommendation_state (id, last_order_id, refreshed_at) VALUES (1, ?, ?) '
+        'ON CONFLICT (id) DO UPDATE SET last_order_id = excluded.last_order_id, refreshed_at = excluded.refreshed_at',
+        (through_id, datetime.utcnow())
+    )
+    db.session.commit()
+
+    return {
+        'mode': 'full' if full else 'incremental',
+        'orders_through': through_id,
+        'orders_scanned': through_id - after_id,
+        'pairs_updated': len(rows),
+        'products_refreshed': refreshed
+    }
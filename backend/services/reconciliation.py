@@ -0,0 +1,203 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import bindparam
+from models.database import db
+from models.order import Order
+
+# Razorpay caps collection pages at 100 entities
+PAGE_SIZE = 100
+RECEIPT_PREFIX = 'order_'
+
+
+def _to_timestamp(value):
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _slices(since, until, slice_size):
+    """Split [since, until) into consecutive windows of slice_size"""
+    start = since
+    while start < until:
+        end = min(start + slice_size, until)
+        yield start, end
+        start = end
+
+
+def _fetch_window(resource, start, end):
+    """Page through a gateway collection for a single time window"""
+    items = []
+    skip = 0
+    while True:
+        page = resource.all({
+            'from': _to_timestamp(start),
+            'to': _to_timestamp(end) - 1,
+            'count': PAGE_SIZE,
+            'skip': skip
+        })
+        batch = page.get('items', [])
+        items.extend(batch)
+        if len(batch) < PAGE_SIZE:
+            return items
+        skip += PAGE_SIZE
+
+
+def fetch_gateway_entities(resource, since, until, concurrency=4, slice_size=timedelta(days=1)):
+    """Fetch every entity created in the window, slicing it across a bounded pool"""
+    windows = list(_slices(since, until, slice_size))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for items in executor.map(lambda w: _fetch_window(resource, *w), windows):
+            yield from items
+
+
+def parse_receipt(receipt):
+    """Return the local order ID encoded in a receipt, or None"""
+    if not receipt or not receipt.startswith(RECEIPT_PREFIX):
+        return None
+    try:
+        return int(receipt[len(RECEIPT_PREFIX):])
+    except ValueError:
+        return None
+
+
+def _fetch_receipt(client, gateway_order_id):
+    """Local order ID for a single gateway order, or None when it cannot be fetched"""
+    try:
+        return parse_receipt(client.order.fetch(gateway_order_id).get('receipt'))
+    except Exception:
+        return None
+
+
+def build_gateway_index(client, since, until, concurrency=4, lookback=timedelta(days=1)):
+    """Index captured payments by local order ID and by payment ID"""
+    # Gateway order ID -> local order ID, from receipt=order_<id>. Orders are
+    # created before they are paid, so look back past the window start
+    receipts = {}
+    for gateway_order in fetch_gateway_entities(client.order, since - lookback, until, concurrency):
+        order_id = parse_receipt(gateway_order.get('receipt'))
+        if order_id is not None:
+            receipts[gateway_order['id']] = order_id
+
+    captured = []
+    for payment in fetch_gateway_entities(client.payment, since, until, concurrency):
+        if payment.get('status') == 'captured':
+            captured.append(payment)
+
+    # Payments for gateway orders older than the lookback are resolved one by one
+    unresolved = list({payment.get('order_id') for payment in captured
+                       if payment.get('order_id') and payment.get('order_id') not in receipts})
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        resolved = executor.map(lambda gateway_order_id: _fetch_receipt(client, gateway_order_id), unresolved)
+        for gateway_order_id, order_id in zip(unresolved, resolved):
+            if order_id is not None:
+                receipts[gateway_order_id] = order_id
+
+    by_order = {}
+    payment_ids = set()
+    unknown_receipts = []
+    for payment in captured:
+        payment_ids.add(payment['id'])
+        order_id = receipts.get(payment.get('order_id'))
+        if order_id is None:
+            unknown_receipts.append(payment['id'])
+            continue
+        by_order.setdefault(order_id, payment['id'])
+
+    return by_order, payment_ids, unknown_receipts
+
+
+def _is_captured(client, payment_id):
+    try:
+        return client.payment.fetch(payment_id).get('status') == 'captured'
+    except Exception:
+        return False
+
+
+def _apply_fixes(fixes, batch_size):
+    """Mark pending orders as paid in batched transactions"""
+    orders = Order.__table__
+    stmt = orders.update()\
+        .where(orders.c.id == bindparam('_id'))\
+        .where(orders.c.status == 'pending')\
+        .values(status='paid', payment_id=bindparam('_payment_id'), updated_at=bindparam('_updated_at'))
+
+    updated = 0
+    for i in range(0, len(fixes), batch_size):
+        now = datetime.utcnow()
+        batch = [
+            {'_id': order_id, '_payment_id': payment_id, '_updated_at': now}
+            for order_id, payment_id in fixes[i:i + batch_size]
+        ]
+        result = db.session.execute(stmt, batch)
+        db.session.commit()
+        updated += result.rowcount
+    return updated
+
+
+def reconcile_payments(client, since, until, concurrency=4, batch_size=500,
+                       lookback=timedelta(days=1), dry_run=False):
+    """Reconcile local orders against gateway payments captured in [since, until).
+
+    Pending orders with a captured payment are marked paid. Paid orders whose
+    payment ID has no captured gateway record are reported but left untouched.
+    """
+    by_order, payment_ids, unknown_receipts = build_gateway_index(client, since, until, concurrency, lookback)
+
+    fixes = []
+    suspect_paid = []
+    captured_on_cancelled = []
+    seen = set()
+
+    # Orders are created before they are paid, so look back past the window start
+    rows = db.session.query(Order.id, Order.status, Order.payment_id)\
+        .filter(Order.created_at >= since - lookback, Order.created_at < until)\
+        .order_by(Order.id)\
+        .yield_per(1000)
+
+    for order_id, status, payment_id in rows:
+        seen.add(order_id)
+        captured_id = by_order.get(order_id)
+        if status == 'pending' and captured_id:
+            fixes.append((order_id, captured_id))
+        elif status == 'paid' and payment_id not in payment_ids:
+            suspect_paid.append((order_id, payment_id))
+        elif status == 'cancelled' and captured_id:
+            captured_on_cancelled.append({'order_id': order_id, 'payment_id': captured_id})
+
+    # Captured payments can belong to orders created before the lookback
+    older = [order_id for order_id in by_order if order_id not in seen]
+    missing_orders = []
+    for i in range(0, len(older), batch_size):
+        chunk = older[i:i + batch_size]
+        statuses = dict(db.session.query(Order.id, Order.status).filter(Order.id.in_(chunk)))
+        for order_id in chunk:
+            if order_id not in statuses:
+                missing_orders.append(order_id)
+            elif statuses[order_id] == 'pending':
+                fixes.append((order_id, by_order[order_id]))
+
+    # The payment may have been captured outside the window, so confirm directly
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        captured = list(executor.map(
+            lambda pair: pair[1] is not None and _is_captured(client, pair[1]),
+            suspect_paid
+        ))
+    paid_without_payment = [
+        {'order_id': order_id, 'payment_id': payment_id}
+        for (order_id, payment_id), ok in zip(suspect_paid, captured) if not ok
+    ]
+
+    fixed = 0 if dry_run else _apply_fixes(fixes, batch_size)
+
+    return {
+        'window': {'since': since.isoformat(), 'until': until.isoformat()},
+        'dry_run': dry_run,
+        'captured_payments': len(payment_ids),
+        'orders_scanned': len(seen),
+        'pending_with_capture': [
+            {'order_id': order_id, 'payment_id': payment_id} for order_id, payment_id in fixes
+        ],
+        'orders_marked_paid': fixed,
+        'paid_without_payment': paid_without_payment,
+        'captured_on_cancelled': captured_on_cancelled,
+        'missing_orders': missing_orders,
+        'unknown_receipts': unknown_receipts
+    }
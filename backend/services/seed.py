@@ -0,0 +1,204 @@
+import itertools
+import json
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from models.database import db
+from models.order import Order
+from models.product import Product
+from models.user import User
+from utils.passwords import hash_password
+
+SEED_PASSWORD = 'password123'
+
+# Default end of the generated history, fixed so a seed always yields the same timestamps
+SEED_NOW = datetime(2026, 1, 1)
+
+CATEGORIES = {
+    'power_tools': (['Cordless Drill', 'Circular Saw', 'Angle Grinder', 'Impact Driver', 'Jigsaw', 'Rotary Hammer'], 60, 400),
+    'hand_tools': (['Adjustable Wrench', 'Claw Hammer', 'Screwdriver Set', 'Utility Knife', 'Pliers Set', 'Hex Key Set'], 5, 80),
+    'measuring_tools': (['Laser Measure', 'Spirit Level', 'Tape Measure', 'Digital Caliper', 'Stud Finder'], 8, 150),
+    'fasteners': (['Wood Screws', 'Wall Anchors', 'Hex Bolts', 'Drywall Screws', 'Concrete Nails'], 2, 40),
+    'safety': (['Safety Glasses', 'Work Gloves', 'Ear Defenders', 'Dust Mask', 'Hard Hat'], 3, 60),
+    'plumbing': (['Pipe Wrench', 'Plunger', 'Pipe Cutter', 'Basin Wrench', 'Thread Seal Tape'], 4, 90),
+    'electrical': (['Voltage Tester', 'Wire Stripper', 'Extension Cord', 'Cable Ties', 'Junction Box'], 3, 120),
+    'garden': (['Pruning Shears', 'Garden Hose', 'Leaf Blower', 'Hedge Trimmer', 'Spade'], 8, 250)
+}
+BRANDS = ['PowerTech', 'ToolMaster', 'MeasurePro', 'BuildRight', 'IronGrip', 'ProFix', 'Craftline', 'Apex']
+FIRST_NAMES = ['James', 'Mary', 'Arjun', 'Priya', 'Wei', 'Fatima', 'Carlos', 'Aisha', 'John', 'Ananya',
+               'Luca', 'Sofia', 'Kenji', 'Olga', 'David', 'Meera', 'Tom', 'Zara', 'Ravi', 'Emma']
+LAST_NAMES = ['Smith', 'Patel', 'Kumar', 'Garcia', 'Chen', 'Khan', 'Müller', 'Rossi', 'Sato', 'Singh',
+              'Brown', 'Ivanova', 'Silva', 'Sharma', 'Jones', 'Nair', 'Lee', 'Reddy', 'Martin', 'Das']
+CITIES = ['Mumbai', 'Bengaluru', 'Delhi', 'Pune', 'Chennai', 'Hyderabad', 'Kolkata', 'Jaipur']
+
+
+def zipf_weights(n, s=0.8):
+    """Cumulative weights where rank k is chosen with probability proportional to 1/k^s"""
+    return list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert(conn, table, columns, rows):
+    if rows:
+        placeholders = ', '.join('?' for _ in columns)
+        conn.exec_driver_sql(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+
+def _flush(conn, table, columns, rows, batch_size):
+    """Insert and clear rows once the batch is full"""
+    if len(rows) >= batch_size:
+        _insert(conn, table, columns, rows)
+        rows.clear()
+
+
+def seed_database(products=1000, users=500, orders=5000, seed=42, batch_size=50000,
+                  images_per_product=5, cart_fraction=0.1, days=730, now=None, progress=None):
+    """Generate a realistic, deterministic dataset with bulk inserts.
+
+    Product popularity and customer activity both follow Zipf-like
+    distributions, so a small share of products and users account for most
+    order items, as in real order history. IDs continue after the current
+    maximum and timestamps are spread over the days before now, SEED_NOW by
+    default, so the same seed and now on the same starting database yield
+    the same rows. All users share the password SEED_PASSWORD.
+    """
+    rng = random.Random(seed)
+    report = progress or (lambda message: None)
+    now = now or SEED_NOW
+    category_names = sorted(CATEGORIES)
+
+    product_start = _next_id(Product)
+    user_start = _next_id(User)
+    order_start = _next_id(Order)
+    password_hash = hash_password(SEED_PASSWORD)
+
+    conn = db.engine.connect()
+    is_sqlite = conn.dialect.name == 'sqlite'
+    if is_sqlite:
+        # Durability of a throwaway seed run is not worth an fsync per batch
+        synchronous = conn.exec_driver_sql('PRAGMA synchronous').scalar()
+        conn.exec_driver_sql('PRAGMA synchronous=OFF')
+
+    try:
+        # Products
+        prices = []
+        product_columns = ('id', 'name', 'description', 'price', 'stock', 'category', 'specifications',
+                           'created_at', 'updated_at')
+        image_columns = ('product_id', 'image_url', 'is_primary', 'created_at')
+        product_rows, image_rows = [], []
+        for offset in range(products):
+            product_id = product_start + offset
+            category = rng.choice(category_names)
+            names, low, high = CATEGORIES[category]
+            brand = rng.choice(BRANDS)
+            name = f'{brand} {rng.choice(names)} {rng.choice(["", "Pro ", "Max ", "Compact ", "XL "])}{product_id}'
+            price = round(min(high, max(low, rng.lognormvariate(0, 0.6) * (low + high) / 3)), 2)
+            prices.append(price)
+            created = now - timedelta(days=rng.uniform(0, days))
+            specifications = json.dumps({
+                'brand': brand,
+                'weight': f'{rng.uniform(0.1, 8):.1f}kg',
+                'warranty': f'{rng.choice([1, 2, 3, 5])} years',
+                'sku': f'{category[:3].upper()}-{product_id:07d}'
+            })
+            product_rows.append((product_id, name.strip(), f'{name.strip()} by {brand} for {category.replace("_", " ")}.',
+                                 price, rng.randint(0, 500), category, specifications, created, created))
+            for n in range(images_per_product):
+                image_rows.append((product_id, f'https://cdn.example.com/products/{product_id}/{n + 1}.jpg', n == 0, created))
+            _flush(conn, 'products', product_columns, product_rows, batch_size)
+            _flush(conn, 'product_images', image_columns, image_rows, batch_size)
+        _insert(conn, 'products', product_columns, product_rows)
+        _insert(conn, 'product_images', image_columns, image_rows)
+        report(f'{products} products, {products * images_per_product} images')
+
+        # Users
+        user_columns = ('id', 'email', 'password_hash', 'first_name', 'last_name', 'address', 'phone',
+                        'is_admin', 'created_at', 'updated_at')
+        user_rows = []
+        for offset in range(users):
+            user_id = user_start + offset
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            created = now - timedelta(days=rng.uniform(0, days))
+            user_rows.append((user_id, f'{first.lower()}.{last.lower()}.{user_id}@example.com', password_hash,
+                              first, last, f'{rng.randint(1, 999)} Market Road, {rng.choice(CITIES)}',
+                              f'+91{rng.randint(6000000000, 9999999999)}', False, created, created))
+            _flush(conn, 'users', user_columns, user_rows, batch_size)
+        _insert(conn, 'users', user_columns, user_rows)
+        report(f'{users} users (password: {SEED_PASSWORD})')
+
+        # Popularity ranks are shuffled so popular products are spread across IDs
+        product_ids = list(range(product_start, product_start + products))
+        rng.shuffle(product_ids)
+        product_weights = zipf_weights(products)
+        user_ids = list(range(user_start, user_start + users))
+        rng.shuffle(user_ids)
+        user_weights = zipf_weights(users, s=0.6)
+
+        # Orders, oldest first so IDs increase with created_at
+        order_columns = ('id', 'user_id', 'total_amount', 'status', 'payment_id', 'shipping_address',
+                         'created_at', 'updated_at')
+        item_columns = ('order_id', 'product_id', 'quantity', 'price', 'created_at')
+        order_rows, item_rows = [], []
+        buyers = rng.choices(user_ids, cum_weights=user_weights, k=orders)
+        ages = sorted((rng.uniform(0, days) for _ in range(orders)), reverse=True)
+        for offset in range(orders):
+            order_id = order_start + offset
+            age = ages[offset]
+            created = now - timedelta(days=age)
+            if age > 14:
+                status = rng.choices(['delivered', 'cancelled'], weights=[92, 8])[0]
+            elif age > 3:
+                status = rng.choices(['shipped', 'delivered', 'cancelled', 'paid'], weights=[45, 40, 5, 10])[0]
+            else:
+                status = rng.choices(['pending', 'paid', 'shipped', 'cancelled'], weights=[30, 50, 15, 5])[0]
+
+            total = 0.0
+            for product_id in set(rng.choices(product_ids, cum_weights=product_weights, k=rng.choices(
+                    [1, 2, 3, 4, 5], weights=[45, 25, 15, 10, 5])[0])):
+                quantity = rng.choices([1, 2, 3, 5], weights=[75, 15, 7, 3])[0]
+                price = prices[product_id - product_start]
+                total += price * quantity
+                item_rows.append((order_id, product_id, quantity, price, created))
+
+            payment_id = f'pay_seed{order_id:010d}' if status not in ('pending', 'cancelled') else None
+            order_rows.append((order_id, buyers[offset], round(total, 2), status, payment_id,
+                               f'{rng.randint(1, 999)} Market Road, {rng.choice(CITIES)}', created, created))
+            _flush(conn, 'orders', order_columns, order_rows, batch_size)
+            _flush(conn, 'order_items', item_columns, item_rows, batch_size)
+            if (offset + 1) % 100000 == 0 and offset + 1 < orders:
+                report(f'{offset + 1} orders')
+        _insert(conn, 'orders', order_columns, order_rows)
+        _insert(conn, 'order_items', item_columns, item_rows)
+        report(f'{orders} orders')
+
+        # Open carts for a slice of users
+        cart_columns = ('user_id', 'product_id', 'quantity', 'created_at', 'updated_at')
+        cart_rows = []
+        for user_id in rng.sample(user_ids, int(users * cart_fraction)):
+            updated = now - timedelta(days=rng.expovariate(1 / 20))
+            for product_id in set(rng.choices(product_ids, cum_weights=product_weights, k=rng.randint(1, 4))):
+                cart_rows.append((user_id, product_id, rng.randint(1, 3), updated, updated))
+        _insert(conn, 'cart_items', cart_columns, cart_rows)
+        report(f'{len(cart_rows)} cart items')
+
+        conn.commit()
+        if is_sqlite:
+            conn.exec_driver_sql('ANALYZE')
+            conn.commit()
+    finally:
+        if is_sqlite:
+            # Hand the connection back with the setting it came with, even after a failed run
+            conn.rollback()
+            conn.exec_driver_sql(f'PRAGMA synchronous={synchronous}')
+        conn.close()
+
+    return {
+        'products': products,
+        'images': products * images_per_product,
+        'users': users,
+        'orders': orders,
+        'cart_items': len(cart_rows)
+    }
@@ -0,0 +1,80 @@
+import threading
+import time
+from functools import wraps
+from flask import jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, create_access_token, create_refresh_token
+from models.database import db
+from models.user import User
+
+# Seconds an admin's role is trusted before it is re-read from the database
+DEFAULT_ADMIN_STATUS_TTL = 30
+
+
+class AdminStatusCache:
+    """Short-lived in-memory cache of which users still hold the admin role.
+
+    The role claim in the JWT is signed, but it lives as long as the token.
+    Re-checking it here means a demoted or deleted admin loses access within
+    one TTL without every admin request hitting the users table.
+    """
+
+    def __init__(self, max_size=1024):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._max_size = max_size
+
+    def is_admin(self, user_id, ttl):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry and entry[1] > now:
+            return entry[0]
+
+        is_admin = bool(db.session.query(User.is_admin).filter_by(id=user_id).scalar())
+
+        with self._lock:
+            if len(self._entries) >= self._max_size:
+                self._entries.clear()
+            self._entries[user_id] = (is_admin, now + ttl)
+        return is_admin
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+admin_status_cache = AdminStatusCache()
+
+
+def user_claims(user):
+    """Additional JWT claims issued for a user"""
+    return {'is_admin': bool(user.is_admin)}
+
+
+def issue_tokens(user):
+    """Create a short-lived access token and a refresh token for a user"""
+    return {
+        'access_token': create_access_token(identity=user.id, additional_claims=user_claims(user)),
+        'refresh_token': create_refresh_token(identity=user.id)
+    }
+
+
+def admin_required(locations=None):
+    """Require a valid JWT carrying the admin role claim, read from locations (default: JWT_TOKEN_LOCATION)"""
+    def wrapper(fn):
+        @wraps(fn)
+        @jwt_required(locations=locations)
+        def decorator(*args, **kwargs):
+            if not get_jwt().get('is_admin'):
+                return jsonify({'message': 'Admin privileges required'}), 403
+
+            ttl = current_app.config.get('ADMIN_STATUS_TTL', DEFAULT_ADMIN_STATUS_TTL)
+            if not admin_status_cache.is_admin(get_jwt_identity(), ttl):
+                return jsonify({'message': 'Admin privileges required'}), 403
+
+            return fn(*args, **kwargs)
+        return decorator
+    return wrapper
@@ -0,0 +1,105 @@
+"""Sorting and filtering for product listings, shared by the sync and async views.
+
+Every sort has a composite index, with and without a leading category,
+that returns rows in order and carries price, so a listing page is one
+index walk. Its count is answered from the price indexes, which also carry
+stock, without reading the table.
+"""
+import math
+from models.product import Product
+
+# sort parameter: (column, descending by default)
+SORTS = {
+    'price': (Product.price, False),
+    'newest': (Product.created_at, True),
+    'name': (Product.name, False),
+    'rating': (Product.rating_avg, True)
+}
+
+# Above this many matches, reading a price range through its index and
+# sorting it costs more than walking the sort's index and checking the
+# price stored there
+PRICE_RANGE_SORT_LIMIT = 1000
+
+# Accepted spellings of the in_stock flag
+FLAG_VALUES = {'1': True, 'true': True, '0': False, 'false': False}
+
+
+def _price_arg(args, name):
+    value = args.get(name) or None
+    if value is None:
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        price = math.nan
+    # Also rules out nan and inf, which float() accepts
+    if not math.isfinite(price):
+        raise ValueError(f'{name} must be a number')
+    return price
+
+
+def _flag_arg(args, name):
+    value = (args.get(name) or '0').lower()
+    if value not in FLAG_VALUES:
+        raise ValueError(f'{name} must be 1, true, 0 or false')
+    return FLAG_VALUES[value]
+
+
+def parse_listing_args(args):
+    """Listing options from request args; raises ValueError with a message for the client"""
+    sort = args.get('sort') or None
+    if sort is not None and sort not in SORTS:
+        raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+
+    order = args.get('order') or None
+    if order not in (None, 'asc', 'desc'):
+        raise ValueError('order must be asc or desc')
+
+    return {
+        'category': args.get('category') or None,
+        'sort': sort,
+        'descending': order == 'desc' if order else sort is not None and SORTS[sort][1],
+        'min_price': _price_arg(args, 'min_price'),
+        'max_price': _price_arg(args, 'max_price'),
+        'in_stock': _flag_arg(args, 'in_stock')
+    }
+
+
+def is_default_listing(options):
+    """Whether the listing is unsorted and filtered by category at most, as the catalog snapshot serves it"""
+    return (options['sort'] is None and not options['descending'] and options['min_price'] is None
+            and options['max_price'] is None and not options['in_stock'])
+
+
+def filter_listing(query, options, total=None):
+    """Apply the listing filters to a Query or select().
+
+    Given the total from a count of the same filters, the page query for a
+    large result keeps the price range out of index selection, so SQLite
+    walks the sort's index instead of sorting every match.
+    """
+    price = Product.price
+    if total is not None and total > PRICE_RANGE_SORT_LIMIT and options['sort'] != 'price':
+        price = Product.price + 0
+
+    if options['category']:
+        query = query.filter(Product.category == options['category'])
+    if options['min_price'] is not None:
+        query = query.filter(price >= options['min_price'])
+    if options['max_price'] is not None:
+        query = query.filter(price <= options['max_price'])
+    if options['in_stock']:
+        query = query.filter(Product.stock > 0)
+    return query
+
+
+def order_listing(query, options):
+    """Order a listing by its sort with ID as the tie-break, or by ID alone"""
+    if options['sort'] is None:
+        columns = (Product.id,)
+    else:
+        columns = (SORTS[options['sort']][0], Product.id)
+    if options['descending']:
+        columns = tuple(column.desc() for column in columns)
+    return query.order_by(*columns)
@@ -0,0 +1,399 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+from bisect import bisect_left
+from flask import current_app
+from sqlalchemy.orm import selectinload
+from models.database import db
+from models.product import Product
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'HWCAT\x00\x00\x02'
+
+# magic, built_at (ns since the epoch), product count, category count, then
+# the offset of each section and the length of the metadata JSON. Sections
+# use native byte order: a snapshot is read on the machine that wrote it.
+HEADER = struct.Struct('=8sQIIQQQQQQQ')
+
+# Products loaded and serialized per query when building
+BUILD_CHUNK = 1000
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _stamp(updated_at):
+    """updated_at as integer microseconds, to tell whether a stored body is current"""
+    return (updated_at - _EPOCH) // timedelta(microseconds=1) if updated_at is not None else -1
+
+
+def _align(f):
+    """Pad the file to an 8-byte boundary so array sections can be cast in place"""
+    f.write(b'\0' * (-f.tell() % 8))
+    return f.tell()
+
+
+def build_snapshot(path, previous=None):
+    """Write every product, pre-serialized as JSON, to a snapshot file at path.
+
+    Layout: header, then the product bodies joined with commas in ID order,
+    then their byte offsets (one extra entry past the end), the product IDs,
+    their updated_at stamps, each category's member positions and a small
+    JSON directory of categories. Bodies whose product still has the same
+    updated_at are copied from the previous snapshot; only new and changed
+    products are loaded and serialized. Written to a temporary file and
+    renamed over path, so readers only ever map a complete snapshot. The
+    header records when reading started, so writes committed after that
+    are known to be missing. Returns the number of products serialized.
+    """
+    built_at = time.time_ns()
+    encode = current_app.json.dumps
+    offsets = array('Q')
+    ids = array('I')
+    stamps = array('q')
+    members = {}
+    serialized = 0
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+
+    rows = db.session.query(Product.id, Product.updated_at, Product.category).order_by(Product.id).all()
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b'\0' * HEADER.size)
+            bodies_offset = _align(f)
+            for index in range(0, len(rows), BUILD_CHUNK):
+                chunk = rows[index:index + BUILD_CHUNK]
+                chunk_stamps = {product_id: _stamp(updated_at) for product_id, updated_at, _ in chunk}
+                bodies = {}
+                if previous is not None:
+                    for product_id, stamp in chunk_stamps.items():
+                        position = previous.position(product_id)
+                        if position is not None and previous.stamps[position] == stamp:
+                            bodies[product_id] = previous.body(position)
+                stale = [product_id for product_id in chunk_stamps if product_id not in bodies]
+                if stale:
+                    for product in Product.query.filter(Product.id.in_(stale)).options(selectinload(Product.images)):
+                        bodies[product.id] = encode(product.to_dict()).encode('utf-8')
+                        # The row may have changed since the ID list was read
+                        chunk_stamps[product.id] = _stamp(product.updated_at)
+                    serialized += len(stale)
+
+                for product_id, _, category in chunk:
+                    body = bodies.get(product_id)
+                    # Deleted since the ID list was read
+                    if body is None:
+                        continue
+                    if ids:
+                        f.write(b',')
+                    offsets.append(f.tell() - bodies_offset)
+                    f.write(body)
+                    members.setdefault(category, array('I')).append(len(ids))
+                    ids.append(product_id)
+                    stamps.append(chunk_stamps[product_id])
+                db.session.expunge_all()
+            # Behaves as a trailing comma, so body i ends at offsets[i + 1] - 1
+            offsets.append(f.tell() - bodies_offset + 1)
+            db.session.rollback()
+
+            offsets_offset = _align(f)
+            offsets.tofile(f)
+            ids_offset = _align(f)
+            ids.tofile(f)
+            stamps_offset = _align(f)
+            stamps.tofile(f)
+            members_offset = _align(f)
+            directory = []
+            start = 0
+            # Sorted, as the categories endpoint returns them from ix_products_category
+            for category in sorted(members):
+                members[category].tofile(f)
+                directory.append([category, start, len(members[category])])
+                start += len(members[category])
+
+            meta = json.dumps({'categories': directory}).encode('utf-8')
+            meta_offset = f.tell()
+            f.write(meta)
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, built_at, len(ids), len(directory), bodies_offset, offsets_offset,
+                                ids_offset, stamps_offset, members_offset, meta_offset, len(meta)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return serialized
+
+
+def read_built_at(path):
+    """When the snapshot at path started reading the database (ns), or None if there is none"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER.size or header[:8] != MAGIC:
+        return None
+    return HEADER.unpack(header)[1]
+
+
+class CatalogSnapshot:
+    """A snapshot file mapped read-only into memory.
+
+    The mapping is shared with every other process that maps the same
+    file, so the catalog sits in the page cache once however many workers
+    serve it. Lookups binary search the ID array in place and responses
+    are assembled from slices of the pre-serialized bodies.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        (magic, self.built_at, count, _, bodies_offset, offsets_offset, ids_offset,
+         stamps_offset, members_offset, meta_offset, meta_length) = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a catalog snapshot')
+
+        self.count = count
+        self.bodies = view[bodies_offset:offsets_offset]
+        self.offsets = view[offsets_offset:offsets_offset + 8 * (count + 1)].cast('Q')
+        self.ids = view[ids_offset:ids_offset + 4 * count].cast('I')
+        self.stamps = view[stamps_offset:stamps_offset + 8 * count].cast('q')
+
+        meta = json.loads(bytes(view[meta_offset:meta_offset + meta_length]))
+        self.members = {}
+        for category, start, length in meta['categories']:
+            begin = members_offset + 4 * start
+            self.members[category] = view[begin:begin + 4 * length].cast('I')
+        self.categories = current_app.json.dumps(list(self.members)).encode('utf-8') + b'\n'
+
+    def position(self, product_id):
+        """Index of a product in ID order, or None when it is not in the snapshot"""
+        position = bisect_left(self.ids, product_id)
+        if position == self.count or self.ids[position] != product_id:
+            return None
+        return position
+
+    def body(self, position):
+        """The serialized product at a position, as a view into the mapping"""
+        return self.bodies[self.offsets[position]:self.offsets[position + 1] - 1]
+
+    def product(self, product_id):
+        """Response body for one product, or None when it is not in the snapshot"""
+        position = self.position(product_id)
+        if position is None:
+            return None
+        return b''.join((self.body(position), b'\n'))
+
+    def page(self, page, per_page, category=None):
+        """Response body for a page of the product list, like paginate(error_out=False)"""
+        offset_page = page if page >= 1 else 1
+        limit = per_page if per_page >= 1 else 20
+        start = (offset_page - 1) * limit
+
+        if category:
+            positions = self.members.get(category, ())
+            total = len(positions)
+            products = b','.join(self.body(position) for position in positions[start:start + limit])
+        else:
+            total = self.count
+            end = min(start + limit, total)
+            # Consecutive products are one contiguous run of bytes
+            products = self.bodies[self.offsets[start]:self.offsets[end] - 1] if start < end else b''
+
+        pages = -(-total // limit) if total else 0
+        return b''.join((
+            b'{"products":[', products,
+            f'],"total":{total},"pages":{pages},"current_page":{page}}}\n'.encode()
+        ))
+
+
+class CatalogSnapshots:
+    """Keeps a worker's view of the snapshot current and rebuilds it after writes.
+
+    Every write to the catalog touches a marker file next to the snapshot.
+    A snapshot is served only while no write is newer than the start of
+    its build, or while that start is less than max_lag seconds ago, so
+    reads fall back to the database instead of serving stale data for
+    long. The file and marker are checked at most every check_interval
+    seconds.
+
+    Rebuilds run on a background thread, at most one per min_interval
+    seconds per process, under an exclusive lock file so workers do not
+    build the same snapshot at once. A worker that finds the lock taken
+    leaves the rebuild to its holder, which checks the marker again after
+    releasing it.
+    """
+
+    def __init__(self, app, path, check_interval=1.0, min_interval=2.0, max_lag=5.0):
+        self.app = app
+        self.path = path
+        self.marker_path = f'{path}.changed'
+        self.lock_path = f'{path}.lock'
+        self.check_interval = check_interval
+        self.min_interval = min_interval
+        self.max_lag_ns = int(max_lag * 1e9)
+        self._snapshot = None
+        self._identity = None
+        self._fresh = False
+        self._next_check = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._pid = None
+
+    def _changed_at(self):
+        try:
+            return os.stat(self.marker_path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def current(self):
+        """The mapped snapshot if it is fresh enough to serve, else None"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._refresh()
+                    self._next_check = now + self.check_interval
+        return self._snapshot if self._fresh else None
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._snapshot = self._identity = None
+            self._fresh = False
+            self.rebuild()
+            return
+
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity != self._identity:
+            try:
+                # The old mapping is released once requests using it finish
+                self._snapshot = CatalogSnapshot(self.path)
+            except (ValueError, OSError):
+                logger.exception('Could not map catalog snapshot %s', self.path)
+                self._snapshot = None
+            self._identity = identity
+
+        if self._snapshot is None:
+            self._fresh = False
+            return
+        built_at = self._snapshot.built_at
+        self._fresh = self._changed_at() < built_at or time.time_ns() - built_at < self.max_lag_ns
+
+    def changed(self):
+        """Record a committed catalog write and schedule a rebuild"""
+        now = time.time_ns()
+        with open(self.marker_path, 'a'):
+            pass
+        os.utime(self.marker_path, ns=(now, now))
+        self.rebuild()
+
+    def rebuild(self):
+        """Wake this process's builder thread, starting it on first use (and after a fork)"""
+        with self._thread_lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._wake = threading.Event()
+                self._thread = threading.Thread(target=self._run, name='catalog-snapshot', daemon=True)
+                self._thread.start()
+            self._wake.set()
+
+    def _stale(self):
+        built_at = read_built_at(self.path)
+        return built_at is None or self._changed_at() >= built_at
+
+    def _run(self):
+        last_build = 0
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Coalesce a burst of writes into one rebuild
+            time.sleep(max(0, last_build + self.min_interval - time.monotonic()))
+            while self._stale():
+                try:
+                    if not self.build(blocking=False):
+                        break
+                except Exception:
+                    logger.exception('Catalog snapshot rebuild failed')
+                    break
+                finally:
+                    last_build = time.monotonic()
+
+    def _previous(self):
+        """The snapshot on disk to reuse bodies from, which may be newer than this worker's"""
+        try:
+            return CatalogSnapshot(self.path)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def build(self, blocking=True, full=False):
+        """Build the snapshot now under the lock file; False if another process holds it.
+
+        Reuses unchanged bodies from the current file unless full is set.
+        """
+        with open(self.lock_path, 'a') as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                except BlockingIOError:
+                    return False
+            try:
+                with self.app.app_context():
+                    started = time.perf_counter()
+                    serialized = build_snapshot(self.path, previous=None if full else self._previous())
+                    logger.info('Built catalog snapshot in %.2f s, %d products serialized',
+                                time.perf_counter() - started, serialized)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        # Let the next current() call pick up the new file
+        self._next_check = 0
+        return True
+
+
+def current_snapshot():
+    """The app's catalog snapshot when enabled and fresh enough to serve, else None"""
+    snapshots = current_app.extensions.get('catalog_snapshot')
+    return snapshots.current() if snapshots is not None else None
+
+
+def snapshot_response(body):
+    return current_app.response_class(body, mimetype=current_app.json.mimetype)
+
+
+def catalog_changed():
+    """Call after committing a change to products, stock or ratings"""
+    snapshots = current_app.extensions.get('catalog_snapshot')
+    if snapshots is not None:
+        snapshots.changed()
+
+
+def init_catalog_snapshot(app):
+    """Serve catalog reads from a memory-mapped snapshot when CATALOG_SNAPSHOT_PATH is set"""
+    path = app.config.get('CATALOG_SNAPSHOT_PATH')
+    if not path:
+        return
+    app.extensions['catalog_snapshot'] = CatalogSnapshots(
+        app,
+        os.path.join(app.instance_path, path),
+        check_interval=app.config.get('CATALOG_SNAPSHOT_CHECK_INTERVAL', 1.0),
+        min_interval=app.config.get('CATALOG_SNAPSHOT_MIN_INTERVAL', 2.0),
+        max_lag=app.config.get('CATALOG_SNAPSHOT_MAX_LAG', 5.0)
+    )
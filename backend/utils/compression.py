@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+DEFAULT_MIMETYPES = ['application/json', 'text/html', 'text/css', 'text/plain', 'application/javascript']
+
+
+def compress(body, encoding, gzip_level=6, brotli_quality=5):
+    """Compress body with a supported content coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    # mtime=0 keeps output identical for identical input
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def supported_encodings():
+    """Content codings we can produce, in order of preference"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encodings, available=None):
+    """Pick the preferred encoding the client accepts, or None"""
+    for encoding in available or supported_encodings():
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+class Compressor:
+    """Compresses eligible responses in an after_request hook.
+
+    Responses smaller than COMPRESSION_MIN_SIZE or outside the mimetype
+    allowlist go out unchanged. GET responses from the blueprints listed in
+    COMPRESSION_CACHE_BLUEPRINTS get a content-derived ETag, answer
+    If-None-Match with a 304, and keep their compressed bodies in an LRU
+    keyed by ETag and encoding, so a hot catalog page is compressed once.
+    """
+
+    def __init__(self, app=None):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        self.min_size = config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.mimetypes = set(config.get('COMPRESSION_MIMETYPES', DEFAULT_MIMETYPES))
+        self.gzip_level = config.get('COMPRESSION_GZIP_LEVEL', 6)
+        self.brotli_quality = config.get('COMPRESSION_BROTLI_QUALITY', 5)
+        self.cache_blueprints = set(config.get('COMPRESSION_CACHE_BLUEPRINTS', ['products']))
+        self.cache_size = config.get('COMPRESSION_CACHE_SIZE', 256)
+
+        if config.get('COMPRESSION_ENABLED', True):
+            app.after_request(self.after_request)
+        app.extensions['compressor'] = self
+
+    def _eligible(self, response):
+        return (
+            response.status_code == 200
+            and not response.direct_passthrough
+            and not response.is_streamed
+            and 'Content-Encoding' not in response.headers
+            and response.mimetype in self.mimetypes
+        )
+
+    def _compressed(self, etag, encoding, body):
+        key = (etag, encoding)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+        with self._lock:
+            self._cache[key] = compressed
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compressed
+
+    def after_request(self, response):
+        if not self._eligible(response):
+            return response
+
+        body = response.get_data()
+        cacheable = request.method == 'GET' and request.blueprint in self.cache_blueprints
+
+        etag = None
+        if cacheable:
+            # Weak, because the same ETag covers every content coding of the body
+            etag = hashlib.sha1(body).hexdigest()
+            response.set_etag(etag, weak=True)
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        if len(body) < self.min_size:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if etag:
+            compressed = self._compressed(etag, encoding, body)
+        else:
+            compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
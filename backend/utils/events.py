@@ -0,0 +1,192 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from flask import current_app
+
+# Sent after a reconnect whose Last-Event-ID is no longer in the history:
+# the client missed events and should re-fetch its lists
+RESET_EVENT = 'reset'
+
+
+class Subscription:
+    """One stream's view of the broker: replayed events first, then live ones.
+
+    Live events arrive through a bounded queue. When a slow reader lets it
+    fill, the broker drops the subscription instead of blocking publishers;
+    once the reader drains what is queued, next() catches up from the
+    broker's history as a reconnect with Last-Event-ID would. The queue is
+    empty whenever a replay is added, so the two never overlap.
+    """
+
+    def __init__(self, broker, queue_size, last_seq):
+        self.broker = broker
+        self.queue = queue.Queue(queue_size)
+        self.backlog = deque()
+        self.last_seq = last_seq
+        self.lagged = False
+        self.closed = False
+
+    def offer(self, seq, message):
+        """Queue a live event without blocking; False when the reader has fallen behind"""
+        try:
+            self.queue.put_nowait((seq, message))
+            return True
+        except queue.Full:
+            self.lagged = True
+            return False
+
+    def next(self, timeout):
+        """The next encoded event, or None if nothing arrived within timeout"""
+        while True:
+            if self.backlog:
+                seq, message = self.backlog.popleft()
+            else:
+                try:
+                    seq, message = self.queue.get(block=not self.lagged, timeout=timeout)
+                except queue.Empty:
+                    if not self.lagged:
+                        return None
+                    self.broker.resume(self)
+                    continue
+            self.last_seq = seq
+            return message
+
+
+class EventBroker:
+    """In-process publish/subscribe for server-sent events.
+
+    Events get IDs of the form "<epoch>-<seq>", where the epoch identifies
+    this broker, so a Last-Event-ID from before a restart is recognised as
+    stale. The last `history` events are kept for resuming streams.
+    Publishing never blocks on subscribers. Only streams served by this
+    process see events published by it.
+    """
+
+    def __init__(self, history=1000, queue_size=256, max_streams=8):
+        self.epoch = format(time.time_ns(), 'x')
+        self.queue_size = queue_size
+        self.max_streams = max_streams
+        self._history = deque(maxlen=history)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._subscribers = set()
+        self._streams = 0
+        self._lock = threading.Lock()
+
+    def _encode(self, seq, event_type, payload):
+        return f'id: {self.epoch}-{seq}\nevent: {event_type}\ndata: {payload}\n\n'
+
+    def publish(self, event_type, data):
+        """Send an event to every subscriber and keep it for replay; returns its sequence number"""
+        payload = current_app.json.dumps(data)
+        with self._lock:
+            seq = self._last_seq = next(self._seq)
+            message = self._encode(seq, event_type, payload)
+            self._history.append((seq, message))
+            lagging = [subscriber for subscriber in self._subscribers if not subscriber.offer(seq, message)]
+            self._subscribers.difference_update(lagging)
+        return seq
+
+    def _since(self, seq):
+        """Events after seq from the history, or a reset event when some have been evicted"""
+        if seq >= self._last_seq:
+            return []
+        oldest = self._history[0][0] if self._history else self._last_seq + 1
+        if seq + 1 < oldest:
+            return [(self._last_seq, self._encode(self._last_seq, RESET_EVENT, '{}'))]
+        return list(itertools.islice(self._history, seq + 1 - oldest, None))
+
+    def _parse(self, last_event_id):
+        """Sequence number from a Last-Event-ID of this epoch, else None"""
+        epoch, _, seq = (last_event_id or '').partition('-')
+        return int(seq) if epoch == self.epoch and seq.isdigit() else None
+
+    def subscribe(self, last_event_id=None):
+        """Start a subscription, replaying events after last_event_id when given.
+
+        Returns None when max_streams subscriptions are already open.
+        """
+        with self._lock:
+            if self._streams >= self.max_streams:
+                return None
+            self._streams += 1
+
+            subscription = Subscription(self, self.queue_size, self._last_seq)
+            if last_event_id:
+                seq = self._parse(last_event_id)
+                # An ID from another epoch means events were lost in a restart
+                subscription.backlog.extend(self._since(seq if seq is not None else -1))
+            self._subscribers.add(subscription)
+        return subscription
+
+    def resume(self, subscription):
+        """Re-attach a subscription that was dropped for lagging, replaying what it missed"""
+        with self._lock:
+            subscription.lagged = False
+            subscription.backlog.extend(self._since(subscription.last_seq))
+            self._subscribers.add(subscription)
+
+    def unsubscribe(self, subscription):
+        """Release a subscription; safe to call more than once"""
+        with self._lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            self._subscribers.discard(subscription)
+            self._streams -= 1
+
+    def stream(self, subscription, heartbeat=15, retry_ms=3000):
+        """Generate the text/event-stream body for a subscription.
+
+        A comment line goes out after heartbeat seconds without events, which
+        keeps proxies from closing the connection and lets the server notice
+        a client that has gone away. The caller unsubscribes when the
+        response closes, since a generator that never started has no
+        finally to run.
+        """
+        yield f'retry: {retry_ms}\n\n'
+        while True:
+            message = subscription.next(heartbeat)
+            yield message if message is not None else ': keepalive\n\n'
+
+
+def publish_event(event_type, data):
+    """Publish through the app's broker, if events are enabled"""
+    broker = current_app.extensions.get('events')
+    if broker is not None:
+        broker.publish(event_type, data)
+
+
+def publish_stock_changes(stock_before, products):
+    """Publish events for products whose stock crossed LOW_STOCK_THRESHOLD.
+
+    stock_before maps product ID to the stock before the change.
+    """
+    threshold = current_app.config.get('LOW_STOCK_THRESHOLD', 10)
+    for product in products:
+        before = stock_before.get(product.id)
+        if before is None:
+            continue
+        if before >= threshold > product.stock:
+            event_type = 'product.stock_low'
+        elif product.stock >= threshold > before:
+            event_type = 'product.stock_restored'
+        else:
+            continue
+        publish_event(event_type, {
+            'product_id': product.id,
+            'name': product.name,
+            'stock': product.stock,
+            'threshold': threshold
+        })
+
+
+def init_events(app):
+    """Create the event broker used by the admin event stream"""
+    app.extensions['events'] = EventBroker(
+        history=app.config.get('EVENTS_HISTORY', 1000),
+        queue_size=app.config.get('EVENTS_QUEUE_SIZE', 256),
+        max_streams=app.config.get('EVENTS_MAX_STREAMS', 8)
+    )
@@ -0,0 +1,66 @@
+import decimal
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(obj):
+    """Fallback for types neither encoder handles natively"""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Stdlib json provider that writes datetimes as ISO 8601 like the models expect"""
+
+    default = staticmethod(_default)
+    sort_keys = False
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """JSON provider backed by orjson.
+
+    orjson encodes datetimes to ISO 8601 natively, so models can hand over
+    datetime objects and skip a per-field isoformat() call in Python.
+    Responses are built straight from the encoded bytes.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Callers asking for json.dumps options get the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.options).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        options = self.options
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        body = orjson.dumps(obj, default=_default, option=options)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def create_json_provider(app):
+    """Build the JSON provider selected by JSON_PROVIDER (auto, orjson or stdlib)"""
+    choice = app.config.get('JSON_PROVIDER', 'auto')
+    if choice == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER is orjson but orjson is not installed')
+    if choice in ('auto', 'orjson') and orjson is not None:
+        return OrjsonProvider(app)
+    return StdlibJSONProvider(app)
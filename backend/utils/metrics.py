@@ -0,0 +1,205 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from flask import current_app, request
+from sqlalchemy import event
+from models.database import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Hooks run once per SQL statement, so they read a context variable rather than flask.g
+_request_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('start', 'sql_count', 'sql_time', 'serialize')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialize = 0.0
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """Per-endpoint request metrics for this process.
+
+    Each request is labelled with its blueprint name (or "app" for routes
+    registered directly on the app). SQL statements are counted and timed
+    through engine events, serialization is timed around the JSON provider,
+    and the totals are exposed at /metrics in the Prometheus text format and
+    per response in a Server-Timing header.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._status = {}
+        self._gauges = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+
+        self.server_timing = app.config.get('METRICS_SERVER_TIMING', True)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+        with app.app_context():
+            self.instrument_engine(db.engine)
+
+        # Time the encode step of every JSON response
+        provider = app.json
+        original_response = provider.response
+
+        def timed_response(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_response(*args, **kwargs)
+            finally:
+                stats = _request_stats.get()
+                if stats is not None:
+                    stats.serialize += time.perf_counter() - start
+
+        provider.response = timed_response
+        app.extensions['metrics'] = self
+
+    def instrument_engine(self, engine):
+        """Count and time SQL statements run on this (sync) engine"""
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def register_gauge(self, name, help_text, collect):
+        """Add a gauge to /metrics; collect() runs at scrape time and returns its value"""
+        self._gauges.append((name, help_text, collect))
+
+    def _before_request(self):
+        _request_stats.set(RequestStats())
+
+    def _teardown_request(self, exc):
+        _request_stats.set(None)
+
+    def _series_for(self, endpoint):
+        series = self._series.get(endpoint)
+        if series is None:
+            series = {
+                'latency': Histogram(LATENCY_BUCKETS),
+                'queries': Histogram(QUERY_COUNT_BUCKETS),
+                'size': Histogram(SIZE_BUCKETS),
+                'sql_seconds': 0.0,
+                'serialize_seconds': 0.0
+            }
+            self._series[endpoint] = series
+        return series
+
+    def _after_request(self, response):
+        stats = _request_stats.get()
+        if stats is None or request.endpoint == 'metrics':
+            return response
+
+        elapsed = time.perf_counter() - stats.start
+        endpoint = request.blueprint or 'app'
+        # calculate_content_length() would buffer a streamed body, e.g. an event stream
+        size = 0 if response.is_streamed else response.calculate_content_length() or 0
+
+        with self._lock:
+            series = self._series_for(endpoint)
+            series['latency'].observe(elapsed)
+            series['queries'].observe(stats.sql_count)
+            series['size'].observe(size)
+            series['sql_seconds'] += stats.sql_time
+            series['serialize_seconds'] += stats.serialize
+            key = (endpoint, response.status_code)
+            self._status[key] = self._status.get(key, 0) + 1
+
+        if self.server_timing:
+            response.headers['Server-Timing'] = (
+                f'app;dur={elapsed * 1000:.2f}, '
+                f'db;dur={stats.sql_time * 1000:.2f};desc="{stats.sql_count} queries", '
+                f'serialize;dur={stats.serialize * 1000:.2f}'
+            )
+        return response
+
+    def render(self, boot_seconds=None):
+        """Render all series in the Prometheus text exposition format"""
+        lines = []
+
+        if boot_seconds:
+            lines.append('# HELP app_boot_seconds Time to import dependencies and build the app in this worker')
+            lines.append('# TYPE app_boot_seconds gauge')
+            for phase, seconds in boot_seconds.items():
+                lines.append(f'app_boot_seconds{{phase="{phase}"}} {seconds}')
+
+        for name, help_text, collect in self._gauges:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {collect()}')
+
+        def histogram(name, help_text, key):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for endpoint, series in sorted(self._series.items()):
+                hist = series[key]
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="+Inf"}} {hist.count}')
+                lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {hist.sum}')
+                lines.append(f'{name}_count{{endpoint="{endpoint}"}} {hist.count}')
+
+        def counter(name, help_text, key):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for endpoint, series in sorted(self._series.items()):
+                lines.append(f'{name}{{endpoint="{endpoint}"}} {series[key]}')
+
+        with self._lock:
+            lines.append('# HELP http_requests_total Requests by endpoint and status')
+            lines.append('# TYPE http_requests_total counter')
+            for (endpoint, status), count in sorted(self._status.items()):
+                lines.append(f'http_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            histogram('http_request_duration_seconds', 'Request latency', 'latency')
+            histogram('db_queries_per_request', 'SQL statements executed per request', 'queries')
+            histogram('http_response_size_bytes', 'Response body size', 'size')
+            counter('db_query_seconds_total', 'Time spent executing SQL', 'sql_seconds')
+            counter('serialization_seconds_total', 'Time spent encoding JSON responses', 'serialize_seconds')
+
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return self.render(current_app.extensions.get('boot_seconds')), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['metrics_query_start'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_time += time.perf_counter() - conn.info.get('metrics_query_start', stats.start)
@@ -0,0 +1,87 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_HASH_METHOD = 'pbkdf2:sha256:260000'
+DEFAULT_HASH_WORKERS = 4
+DEFAULT_HASH_QUEUE = 32
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing pool has no room for another job"""
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded worker pool.
+
+    PBKDF2 releases the GIL while it runs, so a small pool caps how many
+    cores a login burst can consume, and the queue bound makes excess
+    requests fail fast instead of piling up behind the hashing work.
+    """
+
+    def __init__(self, workers=DEFAULT_HASH_WORKERS, queue_size=DEFAULT_HASH_QUEUE):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy('Password hashing pool is saturated')
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password, method):
+        return self._run(generate_password_hash, password, method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def _config(key, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def get_hasher():
+    """Return the process-wide hasher, creating it on first use"""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher(
+                    workers=_config('PASSWORD_HASH_WORKERS', DEFAULT_HASH_WORKERS),
+                    queue_size=_config('PASSWORD_HASH_QUEUE', DEFAULT_HASH_QUEUE)
+                )
+    return _hasher
+
+
+def hash_method():
+    """The configured werkzeug hash method, including its parameters"""
+    return _config('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+
+
+def hash_password(password):
+    return get_hasher().hash(password, hash_method())
+
+
+def verify_password(password_hash, password):
+    return get_hasher().verify(password_hash, password)
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method):
+    """The method field werkzeug writes for method, e.g. the iteration count it fills in for pbkdf2:sha256"""
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def needs_rehash(password_hash):
+    """Whether a stored hash was made with different parameters than configured"""
+    return password_hash.split('$', 1)[0] != _method_prefix(hash_method())
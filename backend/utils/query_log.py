@@ -0,0 +1,164 @@
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g, request
+from sqlalchemy import event
+from models.database import db
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+_current_log = ContextVar('query_log', default=None)
+
+
+class NPlusOneError(AssertionError):
+    """Raised in strict mode when a statement shape repeats past the threshold"""
+
+
+def normalize_statement(statement):
+    """Reduce a SQL statement to its shape, so repeats differing only in values group together"""
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _STRING_LITERAL.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    return _PLACEHOLDER_LIST.sub('(?)', shape)
+
+
+class QueryLog:
+    """Statements executed during one request or `capture_queries` block"""
+
+    def __init__(self):
+        self.statements = []
+        self.shapes = Counter()
+
+    def record(self, statement, duration):
+        self.statements.append((statement, duration))
+        if statement.lstrip()[:6].upper() == 'SELECT':
+            self.shapes[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold):
+        """SELECT shapes executed more than threshold times"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def assert_no_repeats(self, threshold):
+        repeated = self.repeated(threshold)
+        if repeated:
+            details = '; '.join(f'{count}x {shape}' for shape, count in repeated)
+            raise NPlusOneError(f'Repeated query shapes (possible N+1): {details}')
+
+
+@contextmanager
+def capture_queries():
+    """Collect statements executed inside the block, for use in tests
+
+        with capture_queries() as log:
+            client.get('/api/orders/')
+        log.assert_no_repeats(threshold=3)
+    """
+    log = QueryLog()
+    token = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(token)
+
+
+class QueryInspector:
+    """Slow-query log and N+1 detector.
+
+    A sampled fraction of requests (QUERY_LOG_SAMPLE_RATE) records every
+    statement. At the end of the request, SELECT shapes repeated more than
+    QUERY_LOG_REPEAT_THRESHOLD times are logged as likely N+1 patterns, or
+    raised as NPlusOneError when QUERY_LOG_RAISE is set (for test suites).
+    Statements slower than QUERY_LOG_SLOW_MS are logged with their SQLite
+    EXPLAIN QUERY PLAN whether or not the request was sampled.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('QUERY_LOG_ENABLED', True):
+            return
+
+        self.logger = app.logger
+        self.sample_rate = app.config.get('QUERY_LOG_SAMPLE_RATE', 0.01)
+        self.repeat_threshold = app.config.get('QUERY_LOG_REPEAT_THRESHOLD', 10)
+        self.slow_seconds = app.config.get('QUERY_LOG_SLOW_MS', 100) / 1000
+        self.strict = app.config.get('QUERY_LOG_RAISE', False)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+        with app.app_context():
+            self.instrument_engine(db.engine)
+
+        app.extensions['query_inspector'] = self
+
+    def instrument_engine(self, engine):
+        """Record and time statements run on this (sync) engine"""
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_request(self):
+        # A capture_queries block around the request already owns the log
+        if _current_log.get() is not None:
+            return
+        if self.strict or random.random() < self.sample_rate:
+            _current_log.set(QueryLog())
+            g.query_log_owned = True
+
+    def _teardown_request(self, exc):
+        if g.pop('query_log_owned', False):
+            _current_log.set(None)
+
+    def _after_request(self, response):
+        if not g.get('query_log_owned'):
+            return response
+
+        # Only inspect once, since an error raised here re-runs after_request
+        g.query_log_owned = False
+        log = _current_log.get()
+        _current_log.set(None)
+
+        if self.strict:
+            log.assert_no_repeats(self.repeat_threshold)
+        for shape, count in log.repeated(self.repeat_threshold):
+            self.logger.warning('Possible N+1 on %s %s: %d x %s', request.method, request.path, count, shape)
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_log_start'] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info.get('query_log_start', time.perf_counter())
+
+        log = _current_log.get()
+        if log is not None:
+            log.record(statement, duration)
+
+        # A bulk executemany scales with its row count, so the threshold says nothing about it
+        if duration >= self.slow_seconds and not executemany:
+            plan = self._explain(conn, statement, parameters)
+            self.logger.warning('Slow query (%.1f ms): %s%s', duration * 1000, statement,
+                                f'\nQuery plan:\n{plan}' if plan else '')
+
+    def _explain(self, conn, statement, parameters):
+        if conn.dialect.name != 'sqlite' or statement.lstrip()[:6].upper() != 'SELECT':
+            return None
+        try:
+            # A raw DBAPI cursor does not fire engine events, so this is not logged again
+            raw = conn.connection.dbapi_connection.cursor()
+            try:
+                raw.execute(f'EXPLAIN QUERY PLAN {statement}', parameters)
+                return '\n'.join(f'  {row[-1]}' for row in raw.fetchall())
+            finally:
+                raw.close()
+        except Exception as e:
+            return f'  (unavailable: {e})'
@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """In-memory token bucket per key with a bounded number of tracked keys.
+
+    Buckets refill at `rate` tokens per second up to `burst`. The least
+    recently used keys are evicted once `max_keys` is reached, so memory
+    stays fixed even when an attacker rotates through addresses or emails.
+    """
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, tokens=1):
+        """Take tokens for key; return seconds to wait, or 0 if allowed"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                available = self.burst
+            else:
+                available, updated = bucket
+                available = min(self.burst, available + (now - updated) * self.rate)
+
+            if available >= tokens:
+                available -= tokens
+                wait = 0
+            else:
+                wait = (tokens - available) / self.rate
+
+            self._buckets[key] = (available, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+
+_registry_lock = threading.Lock()
+
+
+def get_limiter(app, name, rate, burst, max_keys=10000):
+    """Return the named limiter for an app, creating it on first use"""
+    with _registry_lock:
+        limiters = app.extensions.setdefault('rate_limiters', {})
+        if name not in limiters:
+            limiters[name] = TokenBucketLimiter(rate, burst, max_keys)
+        return limiters[name]
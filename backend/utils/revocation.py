@@ -0,0 +1,214 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from models.database import db
+from models.token import RevokedToken
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    """In-memory view of revoked JWT IDs backed by the revoked_tokens table.
+
+    A Bloom filter answers "definitely not revoked" for almost every request
+    without touching the database. Only filter hits are confirmed with an
+    indexed lookup. Each process picks up revocations made by other workers
+    by polling for new rows every `sync_interval` seconds, and rebuilds the
+    filter from unexpired rows every `rebuild_interval` seconds so expired
+    entries stop taking up space.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.01, sync_interval=5, rebuild_interval=3600):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._confirmed = OrderedDict()
+        self._watermark = 0
+        self._count = 0
+        self._next_sync = 0
+        self._next_rebuild = 0
+        self._loaded = False
+        # Set while one thread refreshes outside the lock; local revocations
+        # made meanwhile are replayed into a rebuilt filter
+        self._refreshing = False
+        self._revoked_meanwhile = []
+
+    def _load_unexpired(self):
+        """A filter of every unexpired JTI, with the highest row ID and the count read"""
+        rows = db.session.query(RevokedToken.id, RevokedToken.jti)\
+            .filter(RevokedToken.expires_at > datetime.utcnow())\
+            .yield_per(10000)
+
+        jtis = []
+        watermark = 0
+        for row_id, jti in rows:
+            jtis.append(jti)
+            watermark = max(watermark, row_id)
+
+        bloom = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        return bloom, watermark, len(jtis)
+
+    def _swap(self, now, bloom, watermark, count):
+        # Caller holds self._lock
+        for jti in self._revoked_meanwhile:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._watermark = max(self._watermark, watermark)
+        self._count = count + len(self._revoked_meanwhile)
+        self._confirmed.clear()
+        self._next_rebuild = now + self.rebuild_interval
+
+    def _sync(self):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+
+        with self._lock:
+            if now < self._next_sync or self._refreshing:
+                return
+            if not self._loaded:
+                # Nothing to answer from yet, so requests wait for the first load
+                self._swap(now, *self._load_unexpired())
+                self._loaded = True
+                self._next_sync = now + self.sync_interval
+                return
+            # Other threads keep answering from the current filter meanwhile
+            self._refreshing = True
+            self._revoked_meanwhile = []
+            rebuild = now >= self._next_rebuild
+            watermark = self._watermark
+
+        try:
+            if not rebuild:
+                rows = db.session.query(RevokedToken.id, RevokedToken.jti)\
+                    .filter(RevokedToken.id > watermark)\
+                    .order_by(RevokedToken.id)\
+                    .all()
+                with self._lock:
+                    for row_id, jti in rows:
+                        self._bloom.add(jti)
+                        self._watermark = max(self._watermark, row_id)
+                        self._count += 1
+                    rebuild = self._count > self._bloom.capacity
+            if rebuild:
+                loaded = self._load_unexpired()
+                with self._lock:
+                    self._swap(now, *loaded)
+            self._next_sync = now + self.sync_interval
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._revoked_meanwhile = []
+
+    def _lookup(self, jti):
+        return db.session.query(RevokedToken.id).filter_by(jti=jti).first() is not None
+
+    def is_revoked(self, jti, strict=False):
+        """Whether jti has been revoked.
+
+        With strict=True the table is always consulted, which single-use
+        checks such as refresh token rotation need across workers.
+        """
+        if strict:
+            return self._lookup(jti)
+
+        self._sync()
+        if jti not in self._bloom:
+            return False
+
+        # Confirm filter hits, caching the answer since the same token repeats
+        with self._lock:
+            if jti in self._confirmed:
+                self._confirmed.move_to_end(jti)
+                return self._confirmed[jti]
+
+        revoked = self._lookup(jti)
+        with self._lock:
+            self._confirmed[jti] = revoked
+            if len(self._confirmed) > 1024:
+                self._confirmed.popitem(last=False)
+        return revoked
+
+    def revoke(self, payload):
+        """Record a decoded token as revoked; return False if it already was"""
+        db.session.add(RevokedToken(
+            jti=payload['jti'],
+            token_type=payload.get('type', 'access'),
+            user_id=payload.get('sub'),
+            expires_at=datetime.utcfromtimestamp(payload['exp'])
+        ))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+
+        with self._lock:
+            self._bloom.add(payload['jti'])
+            self._confirmed.pop(payload['jti'], None)
+            if self._refreshing:
+                self._revoked_meanwhile.append(payload['jti'])
+        return True
+
+
+def get_revocation_list():
+    """Return the revocation list for the current app"""
+    return current_app.extensions['revocation_list']
+
+
+def purge_expired_tokens(batch_size=1000):
+    """Delete revoked token rows whose tokens have expired anyway"""
+    deleted = 0
+    while True:
+        ids = [row_id for row_id, in db.session.query(RevokedToken.id)
+               .filter(RevokedToken.expires_at <= datetime.utcnow())
+               .limit(batch_size)]
+        if not ids:
+            return deleted
+        RevokedToken.query.filter(RevokedToken.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        deleted += len(ids)
+
+
+def init_revocation(app, jwt):
+    """Attach a revocation list to the app and register it with the JWT manager"""
+    app.extensions['revocation_list'] = RevocationList(
+        capacity=app.config.get('REVOCATION_BLOOM_CAPACITY', 100000),
+        sync_interval=app.config.get('REVOCATION_SYNC_INTERVAL', 5)
+    )
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return get_revocation_list().is_revoked(jwt_payload['jti'])
@@ -1,6 +1,7 @@
 import React, { createContext, useState, useEffect } from 'react';
 import axios from 'axios';
 import jwtDecode from 'jwt-decode';
+import { storeTokens, clearTokens, refreshTokens } from '../services/api';
 
 export const AuthContext = createContext();
 
@@ -13,28 +14,27 @@ export const AuthProvider = ({ children }) => {
     // Check if user is already logged in (token in localStorage)
     const checkLoggedIn = async () => {
       try {
-        const token = localStorage.getItem('token');
+        let token = localStorage.getItem('token');
         if (token) {
           // Check if token is expired
           const decodedToken = jwtDecode(token);
           const currentTime = Date.now() / 1000;
           
           if (decodedToken.exp < currentTime) {
-            // Token expired
-            localStorage.removeItem('token');
-            setCurrentUser(null);
-          } else {
-            // Set auth header
-            axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
-            
-            // Get user profile
-            const response = await axios.get('/api/auth/profile');
-            setCurrentUser(response.data);
+            // Access token expired, try to get a new one
+            token = await refreshTokens();
           }
+          
+          // Set auth header
+          axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
+          
+          // Get user profile
+          const response = await axios.get('/api/auth/profile');
+          setCurrentUser(response.data);
         }
       } catch (err) {
         console.error('Auth error:', err);
-        localStorage.removeItem('token');
+        clearTokens();
         setCurrentUser(null);
       } finally {
         setLoading(false);
@@ -50,9 +50,8 @@ export const AuthProvider = ({ children }) => {
       setError(null);
       const response = await axios.post('/api/auth/register', userData);
       
-      const { access_token, user } = response.data;
-      localStorage.setItem('token', access_token);
-      axios.defaults.headers.common['Authorization'] = `Bearer ${access_token}`;
+      const { user } = response.data;
+      storeTokens(response.data);
       
       setCurrentUser(user);
       return user;
@@ -68,9 +67,8 @@ export const AuthProvider = ({ children }) => {
       setError(null);
       const response = await axios.post('/api/auth/login', { email, password });
       
-      const { access_token, user } = response.data;
-      localStorage.setItem('token', access_token);
-      axios.defaults.headers.common['Authorization'] = `Bearer ${access_token}`;
+      const { user } = response.data;
+      storeTokens(response.data);
       
       setCurrentUser(user);
       return user;
@@ -82,8 +80,11 @@ export const AuthProvider = ({ children }) => {
 
   // Logout user
   const logout = () => {
-    localStorage.removeItem('token');
-    delete axios.defaults.headers.common['Authorization'];
+    // Revoke tokens server-side; logging out locally doesn't depend on it
+    const refreshToken = localStorage.getItem('refreshToken');
+    axios.post('/api/auth/logout', { refresh_token: refreshToken }).catch(() => {});
+    
+    clearTokens();
     setCurrentUser(null);
   };
 
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link as RouterLink } from 'react-router-dom';
-import axios from 'axios';
+import { batchApi } from '../services/api';
 import {
   Container,
   Typography,
@@ -31,12 +31,15 @@ const Home = () => {
         setLoading(true);
         setError(null);
         
-        // Fetch featured products (first page, limited to 8)
-        const productsResponse = await axios.get('/api/products?page=1&per_page=8');
+        // Featured products (first page, limited to 8) and categories in one round trip
+        const [productsResponse, categoriesResponse] = await batchApi.get([
+          '/api/products/?page=1&per_page=8',
+          '/api/products/categories'
+        ]);
+        if (productsResponse.status !== 200 || categoriesResponse.status !== 200) {
+          throw new Error('Failed to load home data');
+        }
         setFeaturedProducts(productsResponse.data.products);
-        
-        // Fetch categories
-        const categoriesResponse = await axios.get('/api/products/categories');
         setCategories(categoriesResponse.data);
       } catch (err) {
         console.error('Error fetching home data:', err);
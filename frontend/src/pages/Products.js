@@ -19,12 +19,24 @@ import {
   Breadcrumbs,
   Link,
   Chip,
-  Paper
+  Paper,
+  FormControlLabel,
+  Checkbox
 } from '@mui/material';
 import { Link as RouterLink } from 'react-router-dom';
 import { Home, NavigateNext } from '@mui/icons-material';
 import ProductCard from '../components/ProductCard';
 
+// Sort menu values as API query parameters; the API sorts and pages server-side
+const SORT_PARAMS = {
+  newest: 'sort=newest',
+  price_low: 'sort=price',
+  price_high: 'sort=price&order=desc',
+  name_asc: 'sort=name',
+  name_desc: 'sort=name&order=desc',
+  rating: 'sort=rating'
+};
+
 const Products = () => {
   const { category } = useParams();
   const location = useLocation();
@@ -42,7 +54,10 @@ const Products = () => {
   const [selectedCategory, setSelectedCategory] = useState(category || 'all');
   const [sortBy, setSortBy] = useState('newest');
   const [priceRange, setPriceRange] = useState([0, 1000]);
+  // The range last released on the slider, sent to the API; null until then
+  const [priceFilter, setPriceFilter] = useState(null);
   const [maxPrice, setMaxPrice] = useState(1000);
+  const [inStockOnly, setInStockOnly] = useState(false);
   const [search, setSearch] = useState(searchQuery || '');
   
   useEffect(() => {
@@ -83,6 +98,16 @@ const Products = () => {
           url += `&category=${selectedCategory}`;
         }
         
+        url += `&${SORT_PARAMS[sortBy] || SORT_PARAMS.newest}`;
+        
+        if (priceFilter) {
+          url += `&min_price=${priceFilter[0]}&max_price=${priceFilter[1]}`;
+        }
+        
+        if (inStockOnly) {
+          url += '&in_stock=1';
+        }
+        
         // Add additional query parameters based on filters
         // Note: These would need to be implemented on the backend
         if (search) {
@@ -94,8 +119,8 @@ const Products = () => {
         setTotalPages(response.data.pages);
         setTotalProducts(response.data.total);
         
-        // Determine max price for filter
-        if (response.data.products.length > 0) {
+        // Determine max price for filter, until the user has picked a range
+        if (!priceFilter && response.data.products.length > 0) {
           const highestPrice = Math.max(...response.data.products.map(p => p.price));
           setMaxPrice(Math.ceil(highestPrice / 100) * 100); // Round up to nearest 100
           setPriceRange([0, highestPrice]);
@@ -109,7 +134,7 @@ const Products = () => {
     };
     
     fetchProducts();
-  }, [page, selectedCategory, search]);
+  }, [page, selectedCategory, search, sortBy, priceFilter, inStockOnly]);
   
   const handlePageChange = (event, value) => {
     setPage(value);
@@ -123,12 +148,28 @@ const Products = () => {
   
   const handleSortChange = (event) => {
     setSortBy(event.target.value);
-    // In a real application, this would trigger a re-fetch with sorting
+    setPage(1);
   };
   
   const handlePriceRangeChange = (event, newValue) => {
     setPriceRange(newValue);
-    // In a real application, this would trigger a re-fetch with price filter
+  };
+  
+  // Fetch once the slider is released, not on every step while dragging
+  const handlePriceRangeCommitted = (event, newValue) => {
+    setPriceFilter(newValue);
+    setPage(1);
+  };
+  
+  const clearPriceFilter = () => {
+    setPriceRange([0, maxPrice]);
+    setPriceFilter(null);
+    setPage(1);
+  };
+  
+  const handleInStockChange = (event) => {
+    setInStockOnly(event.target.checked);
+    setPage(1);
   };
   
   const handleSearchChange = (event) => {
@@ -141,32 +182,6 @@ const Products = () => {
     // The useEffect hook will handle the actual search
   };
   
-  // Function to sort products based on selected sort option
-  const getSortedProducts = () => {
-    switch (sortBy) {
-      case 'price_low':
-        return [...products].sort((a, b) => a.price - b.price);
-      case 'price_high':
-        return [...products].sort((a, b) => b.price - a.price);
-      case 'name_asc':
-        return [...products].sort((a, b) => a.name.localeCompare(b.name));
-      case 'name_desc':
-        return [...products].sort((a, b) => b.name.localeCompare(a.name));
-      case 'newest':
-      default:
-        return [...products].sort(
-          (a, b) => new Date(b.created_at) - new Date(a.created_at)
-        );
-    }
-  };
-  
-  // Filter products by price range
-  const getFilteredProducts = () => {
-    return getSortedProducts().filter(
-      product => product.price >= priceRange[0] && product.price <= priceRange[1]
-    );
-  };
-  
   // Page title based on current category
   const getPageTitle = () => {
     if (search) {
@@ -186,8 +201,6 @@ const Products = () => {
     );
   }
   
-  const filteredProducts = getFilteredProducts();
-
   return (
     <Container sx={{ py: 4 }}>
       {/* Breadcrumbs */}
@@ -240,7 +253,7 @@ const Products = () => {
           <Grid item xs={12} md={6}>
             <Box sx={{ textAlign: { xs: 'left', md: 'right' } }}>
               <Typography variant="body2" color="text.secondary">
-                Showing {filteredProducts.length} of {totalProducts} products
+                Showing {products.length} of {totalProducts} products
               </Typography>
             </Box>
           </Grid>
@@ -285,6 +298,7 @@ const Products = () => {
               <Slider
                 value={priceRange}
                 onChange={handlePriceRangeChange}
+                onChangeCommitted={handlePriceRangeCommitted}
                 valueLabelDisplay="auto"
                 min={0}
                 max={maxPrice}
@@ -296,6 +310,14 @@ const Products = () => {
               </Box>
             </Box>
             
+            {/* Availability Filter */}
+            <Box sx={{ mb: 3 }}>
+              <FormControlLabel
+                control={<Checkbox checked={inStockOnly} onChange={handleInStockChange} size="small" />}
+                label="In stock only"
+              />
+            </Box>
+            
             {/* Sort By Filter */}
             <Box sx={{ mb: 3 }}>
               <FormControl fullWidth size="small">
@@ -312,12 +334,13 @@ const Products = () => {
                   <MenuItem value="price_high">Price: High to Low</MenuItem>
                   <MenuItem value="name_asc">Name: A to Z</MenuItem>
                   <MenuItem value="name_desc">Name: Z to A</MenuItem>
+                  <MenuItem value="rating">Top Rated</MenuItem>
                 </Select>
               </FormControl>
             </Box>
             
             {/* Active Filters */}
-            {(selectedCategory !== 'all' || search || priceRange[0] > 0 || priceRange[1] < maxPrice) && (
+            {(selectedCategory !== 'all' || search || priceFilter || inStockOnly) && (
               <Box sx={{ mb: 2 }}>
                 <Typography variant="subtitle2" gutterBottom>
                   Active Filters:
@@ -337,10 +360,17 @@ const Products = () => {
                       size="small" 
                     />
                   )}
-                  {(priceRange[0] > 0 || priceRange[1] < maxPrice) && (
+                  {priceFilter && (
+                    <Chip 
+                      label={`Price: $${priceFilter[0]} - $${priceFilter[1]}`} 
+                      onDelete={clearPriceFilter} 
+                      size="small" 
+                    />
+                  )}
+                  {inStockOnly && (
                     <Chip 
-                      label={`Price: $${priceRange[0]} - $${priceRange[1]}`} 
-                      onDelete={() => setPriceRange([0, maxPrice])} 
+                      label="In stock only" 
+                      onDelete={() => setInStockOnly(false)} 
                       size="small" 
                     />
                   )}
@@ -356,7 +386,7 @@ const Products = () => {
             <Alert severity="error" sx={{ mb: 3 }}>
               {error}
             </Alert>
-          ) : filteredProducts.length === 0 ? (
+          ) : products.length === 0 ? (
             <Box sx={{ py: 4, textAlign: 'center' }}>
               <Typography variant="h6" gutterBottom>
                 No products found
@@ -368,7 +398,7 @@ const Products = () => {
           ) : (
             <>
               <Grid container spacing={3}>
-                {filteredProducts.map((product) => (
+                {products.map((product) => (
                   <Grid item xs={12} sm={6} md={4} key={product.id}>
                     <ProductCard product={product} />
                   </Grid>
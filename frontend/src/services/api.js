@@ -22,16 +22,69 @@ api.interceptors.request.use(
   }
 );
 
+// Store a new token pair and use it for subsequent requests
+export const storeTokens = ({ access_token, refresh_token }) => {
+  localStorage.setItem('token', access_token);
+  if (refresh_token) {
+    localStorage.setItem('refreshToken', refresh_token);
+  }
+  axios.defaults.headers.common['Authorization'] = `Bearer ${access_token}`;
+};
+
+export const clearTokens = () => {
+  localStorage.removeItem('token');
+  localStorage.removeItem('refreshToken');
+  delete axios.defaults.headers.common['Authorization'];
+};
+
+// Refresh tokens are single-use, so concurrent 401s share one refresh call
+let refreshPromise = null;
+
+export const refreshTokens = () => {
+  const refreshToken = localStorage.getItem('refreshToken');
+  if (!refreshToken) {
+    return Promise.reject(new Error('No refresh token'));
+  }
+
+  if (!refreshPromise) {
+    refreshPromise = axios.post('/api/auth/refresh', null, {
+      headers: { Authorization: `Bearer ${refreshToken}` }
+    })
+      .then((response) => {
+        storeTokens(response.data);
+        return response.data.access_token;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
 // Response interceptor for handling common errors
 api.interceptors.response.use(
   (response) => {
     return response;
   },
-  (error) => {
+  async (error) => {
+    const originalRequest = error.config;
+
     // Handle 401 Unauthorized errors
     if (error.response && error.response.status === 401) {
-      // Clear token and redirect to login
-      localStorage.removeItem('token');
+      // Retry once with a fresh access token
+      if (!originalRequest._retry && localStorage.getItem('refreshToken')) {
+        originalRequest._retry = true;
+        try {
+          const accessToken = await refreshTokens();
+          originalRequest.headers['Authorization'] = `Bearer ${accessToken}`;
+          return api(originalRequest);
+        } catch (refreshError) {
+          // Fall through to logging out
+        }
+      }
+
+      // Clear tokens and redirect to login
+      clearTokens();
       window.location.href = '/login';
     }
     return Promise.reject(error);
@@ -52,6 +105,7 @@ export const productsApi = {
 export const authApi = {
   login: (credentials) => api.post('/auth/login', credentials),
   register: (userData) => api.post('/auth/register', userData),
+  logout: (refreshToken) => api.post('/auth/logout', { refresh_token: refreshToken }),
   getProfile: () => api.get('/auth/profile'),
   updateProfile: (userData) => api.put('/auth/profile', userData)
 };
@@ -86,4 +140,11 @@ export const paymentApi = {
   getPaymentStatus: (paymentId) => api.get(`/payment/status/${paymentId}`)
 };
 
+// Batch API: several GET requests in one round trip.
+// Paths are full, e.g. '/api/products/categories'; resolves to [{ status, data }] in the same order
+export const batchApi = {
+  get: (paths) => api.post('/batch/', { requests: paths })
+    .then((response) => response.data.responses.map(({ status, body }) => ({ status, data: body })))
+};
+
 export default api;
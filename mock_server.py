@@ -1,195 +1,943 @@
+import argparse
+import bisect
+import itertools
 import json
+import gzip
+import math
+import mimetypes
+import random
+import threading
+import time
+from datetime import datetime, timedelta
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 import os
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 app = Flask(__name__, static_folder='frontend/build')
 CORS(app)
 
-# Mock data
-products = [
-    {
-        "id": 1,
-        "name": "Professional Cordless Drill",
-        "description": "High-performance cordless drill with lithium-ion battery and multiple torque settings",
-        "price": 129.99,
-        "category": "power_tools",
-        "brand": "PowerTech",
-        "image_url": "https://via.placeholder.com/500x500?text=Cordless+Drill",
-        "stock_quantity": 25,
-        "rating": 4.5,
-        "review_count": 128,
-        "specifications": {
-            "power": "18V",
-            "battery": "Lithium-ion",
-            "weight": "1.5kg",
-            "includes": "Charger, case, 2 batteries"
-        }
-    },
-    {
-        "id": 2,
-        "name": "Digital Laser Measure",
-        "description": "Precise digital laser measure with backlit LCD display and multiple measurement modes",
-        "price": 79.99,
-        "category": "measuring_tools",
-        "brand": "MeasurePro",
-        "image_url": "https://via.placeholder.com/500x500?text=Laser+Measure",
-        "stock_quantity": 15,
-        "rating": 4.8,
-        "review_count": 94,
-        "specifications": {
-            "range": "0.05-40m",
-            "accuracy": "±1.5mm",
-            "battery": "2 x AAA",
-            "features": "Area, volume, Pythagoras calculations"
-        }
-    },
-    {
-        "id": 3,
-        "name": "Heavy-Duty Circular Saw",
-        "description": "Powerful circular saw with laser guide and dust extraction port",
-        "price": 149.99,
-        "category": "power_tools",
-        "brand": "PowerTech",
-        "image_url": "https://via.placeholder.com/500x500?text=Circular+Saw",
-        "stock_quantity": 10,
-        "rating": 4.3,
-        "review_count": 76,
-        "specifications": {
-            "power": "1200W",
-            "blade_size": "185mm",
-            "cutting_depth": "63mm at 90°",
-            "features": "Laser guide, dust blower"
-        }
-    },
-    {
-        "id": 4,
-        "name": "Adjustable Wrench Set",
-        "description": "Set of 3 chrome-plated adjustable wrenches with comfortable grip handles",
-        "price": 35.99,
-        "category": "hand_tools",
-        "brand": "ToolMaster",
-        "image_url": "https://via.placeholder.com/500x500?text=Wrench+Set",
-        "stock_quantity": 30,
-        "rating": 4.6,
-        "review_count": 112,
-        "specifications": {
-            "material": "Chrome vanadium steel",
-            "sizes": "6\", 8\", 10\"",
-            "finish": "Chrome plated",
-            "handle": "Non-slip grip"
-        }
-    }
-]
-
-users = [
-    {
-        "id": 1,
-        "email": "user@example.com",
-        "first_name": "John",
-        "last_name": "Doe",
-        "role": "user"
-    }
-]
-
-orders = [
-    {
-        "id": 1,
-        "user_id": 1,
-        "items": [
-            {"product_id": 1, "quantity": 2, "price": 129.99},
-            {"product_id": 4, "quantity": 1, "price": 35.99}
-        ],
-        "total_amount": 295.97,
-        "status": "delivered",
-        "payment_id": "pay_123456789",
-        "created_at": "2025-05-15T14:30:00Z"
+# Build assets worth compressing ahead of time
+PRECOMPRESS_EXTENSIONS = ('.html', '.js', '.css', '.json', '.map', '.svg', '.txt', '.ico')
+PRECOMPRESS_MIN_SIZE = 1024
+
+# Preferred first; brotli only when the module is installed
+STATIC_ENCODINGS = [('gzip', '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+if brotli is not None:
+    STATIC_ENCODINGS.insert(0, ('br', '.br', lambda data: brotli.compress(data, quality=11)))
+
+def precompress_static(folder):
+    """Write .br/.gz siblings for build assets that lack an up-to-date one"""
+    if not folder or not os.path.isdir(folder):
+        return
+
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+
+            path = os.path.join(root, name)
+            if os.path.getsize(path) < PRECOMPRESS_MIN_SIZE:
+                continue
+
+            data = None
+            for _, suffix, compress in STATIC_ENCODINGS:
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                with open(target, 'wb') as f:
+                    f.write(compress(data))
+
+def send_static(path):
+    """Send a build asset, using a precompressed variant the client accepts"""
+    for encoding, suffix, _ in STATIC_ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.exists(os.path.join(app.static_folder, path + suffix)):
+            response = send_from_directory(
+                app.static_folder,
+                path + suffix,
+                mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            )
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            return response
+
+    response = send_from_directory(app.static_folder, path)
+    response.vary.add('Accept-Encoding')
+    return response
+
+precompress_static(app.static_folder)
+
+# Mock data settings; __main__ flags override the environment
+app.config.from_mapping(
+    MOCK_FIXTURE=os.environ.get('MOCK_FIXTURE'),
+    MOCK_PRODUCTS=int(os.environ.get('MOCK_PRODUCTS', 10000)),
+    MOCK_USERS=int(os.environ.get('MOCK_USERS', 1000)),
+    MOCK_ORDERS=int(os.environ.get('MOCK_ORDERS', 20000)),
+    MOCK_SEED=int(os.environ.get('MOCK_SEED', 42)),
+    MOCK_LATENCY=os.environ.get('MOCK_LATENCY', 'none'),
+    MOCK_ROUTE_LATENCY=os.environ.get('MOCK_ROUTE_LATENCY', ''),
+    MOCK_ERROR_RATE=float(os.environ.get('MOCK_ERROR_RATE', 0)),
+    MOCK_ERROR_STATUSES=os.environ.get('MOCK_ERROR_STATUSES', '500,503')
+)
+
+CATEGORIES = {
+    'power_tools': ['Cordless Drill', 'Circular Saw', 'Angle Grinder', 'Impact Driver', 'Jigsaw'],
+    'hand_tools': ['Adjustable Wrench', 'Claw Hammer', 'Screwdriver Set', 'Utility Knife', 'Pliers Set'],
+    'measuring_tools': ['Laser Measure', 'Spirit Level', 'Tape Measure', 'Digital Caliper'],
+    'fasteners': ['Wood Screws', 'Wall Anchors', 'Hex Bolts', 'Drywall Screws'],
+    'safety': ['Safety Glasses', 'Work Gloves', 'Ear Defenders', 'Dust Mask'],
+    'garden': ['Pruning Shears', 'Garden Hose', 'Leaf Blower', 'Hedge Trimmer']
+}
+BRANDS = ['PowerTech', 'ToolMaster', 'MeasurePro', 'BuildRight', 'IronGrip', 'ProFix']
+ORDER_STATUSES = ['pending', 'paid', 'shipped', 'delivered', 'cancelled']
+
+def now_iso():
+    return datetime.utcnow().isoformat()
+
+class MockStore:
+    """In-memory dataset in the real API's shapes, indexed for O(1) lookups.
+
+    Records are kept by ID in dicts. Listing order is kept in ID-sorted
+    lists (per category, per user and per status) so a page is a slice
+    rather than a scan. Order and cart items store product IDs and embed
+    the product only when serialized.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.products = {}
+        self.product_ids = []
+        self.products_by_category = {}
+        self.users = {}
+        self.users_by_email = {}
+        self.orders = {}
+        self.order_ids = []
+        self.orders_by_user = {}
+        self.orders_by_status = {}
+        self.carts = {}
+        self.cart_items = {}
+        self.next_ids = {'product': 1, 'image': 1, 'order': 1, 'order_item': 1, 'cart_item': 1, 'user': 1}
+
+    def _take_id(self, kind, value=None):
+        if value is None:
+            value = self.next_ids[kind]
+        self.next_ids[kind] = max(self.next_ids[kind], value + 1)
+        return value
+
+    # Indexing
+
+    def add_product(self, product):
+        product['id'] = self._take_id('product', product.get('id'))
+        for image in product.get('images', []):
+            image['id'] = self._take_id('image', image.get('id'))
+            image['product_id'] = product['id']
+        self.products[product['id']] = product
+        bisect.insort(self.product_ids, product['id'])
+        bisect.insort(self.products_by_category.setdefault(product['category'], []), product['id'])
+        return product
+
+    def remove_product(self, product_id):
+        product = self.products.pop(product_id)
+        _discard(self.product_ids, product_id)
+        _discard(self.products_by_category[product['category']], product_id)
+        if not self.products_by_category[product['category']]:
+            del self.products_by_category[product['category']]
+
+    def add_user(self, user):
+        user['id'] = self._take_id('user', user.get('id'))
+        self.users[user['id']] = user
+        self.users_by_email[user['email'].lower()] = user
+        return user
+
+    def add_order(self, order):
+        order['id'] = self._take_id('order', order.get('id'))
+        for item in order['order_items']:
+            item.pop('product', None)
+            item['id'] = self._take_id('order_item', item.get('id'))
+            item['order_id'] = order['id']
+        self.orders[order['id']] = order
+        bisect.insort(self.order_ids, order['id'])
+        bisect.insort(self.orders_by_user.setdefault(order['user_id'], []), order['id'])
+        bisect.insort(self.orders_by_status.setdefault(order['status'], []), order['id'])
+        return order
+
+    def set_order_status(self, order, status):
+        _discard(self.orders_by_status[order['status']], order['id'])
+        order['status'] = status
+        order['updated_at'] = now_iso()
+        bisect.insort(self.orders_by_status.setdefault(status, []), order['id'])
+
+    def add_cart_item(self, item):
+        item.pop('product', None)
+        item['id'] = self._take_id('cart_item', item.get('id'))
+        self.carts.setdefault(item['user_id'], {})[item['product_id']] = item
+        self.cart_items[item['id']] = item
+        return item
+
+    def remove_cart_item(self, item):
+        del self.cart_items[item['id']]
+        del self.carts[item['user_id']][item['product_id']]
+
+    # Serialization in the real API's shapes
+
+    def order_dict(self, order):
+        return {**order, 'order_items': [
+            {**item, 'product': self.products.get(item['product_id'])} for item in order['order_items']
+        ]}
+
+    def cart_item_dict(self, item):
+        return {**item, 'product': self.products.get(item['product_id'])}
+
+    # Loading
+
+    def load_fixture(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        for product in data.get('products', []):
+            self.add_product(product)
+        for user in data.get('users', []):
+            self.add_user(user)
+        for order in sorted(data.get('orders', []), key=lambda o: o['id']):
+            self.add_order(order)
+        for item in data.get('cart_items', []):
+            self.add_cart_item(item)
+
+    def dump_fixture(self, path):
+        with open(path, 'w') as f:
+            json.dump({
+                'products': [self.products[i] for i in self.product_ids],
+                'users': list(self.users.values()),
+                'orders': [self.orders[i] for i in self.order_ids],
+                'cart_items': list(self.cart_items.values())
+            }, f)
+
+    def generate(self, products, users, orders, seed):
+        """Deterministic dataset with Zipf-like product popularity"""
+        rng = random.Random(seed)
+        now = datetime.utcnow()
+
+        for n in range(1, products + 1):
+            category = rng.choice(sorted(CATEGORIES))
+            brand = rng.choice(BRANDS)
+            name = f'{brand} {rng.choice(CATEGORIES[category])} {n}'
+            created = (now - timedelta(days=rng.uniform(0, 730))).isoformat()
+            self.add_product({
+                'id': n,
+                'name': name,
+                'description': f'{name} by {brand} for {category.replace("_", " ")}.',
+                'price': round(rng.lognormvariate(3.5, 0.8), 2),
+                'stock': rng.randint(0, 500),
+                'category': category,
+                'specifications': {'brand': brand, 'weight': f'{rng.uniform(0.1, 8):.1f}kg',
+                                   'warranty': f'{rng.choice([1, 2, 3, 5])} years'},
+                'created_at': created,
+                'updated_at': created,
+                'rating': round(rng.uniform(1, 5), 2),
+                'review_count': rng.randint(1, 300),
+                'images': [{'image_url': f'https://via.placeholder.com/500x500?text=Product+{n}+{i + 1}',
+                            'is_primary': i == 0, 'created_at': created} for i in range(5)]
+            })
+
+        for n in range(1, users + 1):
+            created = (now - timedelta(days=rng.uniform(0, 730))).isoformat()
+            self.add_user({
+                'id': n,
+                'email': 'admin@example.com' if n == 1 else 'user@example.com' if n == 2 else f'user{n}@example.com',
+                'first_name': 'Admin' if n == 1 else f'User{n}',
+                'last_name': 'Mock',
+                'address': f'{n} Market Road',
+                'phone': '',
+                'is_admin': n == 1,
+                'created_at': created,
+                'updated_at': created
+            })
+
+        if not products or not users:
+            return
+
+        weights = list(itertools.accumulate(1.0 / rank ** 0.8 for rank in range(1, products + 1)))
+        ages = sorted((rng.uniform(0, 730) for _ in range(orders)), reverse=True)
+        for n, age in enumerate(ages, start=1):
+            created = (now - timedelta(days=age)).isoformat()
+            items = []
+            for product_id in set(rng.choices(range(1, products + 1), cum_weights=weights, k=rng.randint(1, 4))):
+                items.append({'product_id': product_id, 'quantity': rng.randint(1, 3),
+                              'price': self.products[product_id]['price'], 'created_at': created})
+            status = rng.choice(ORDER_STATUSES) if age < 14 else rng.choice(['delivered', 'delivered', 'cancelled'])
+            self.add_order({
+                'id': n,
+                'user_id': rng.randint(1, users),
+                'total_amount': round(sum(i['price'] * i['quantity'] for i in items), 2),
+                'status': status,
+                'payment_id': f'pay_mock{n:010d}' if status not in ('pending', 'cancelled') else None,
+                'shipping_address': f'{rng.randint(1, 999)} Market Road',
+                'created_at': created,
+                'updated_at': created,
+                'order_items': items
+            })
+
+def _discard(ids, value):
+    """Remove value from a sorted ID list"""
+    index = bisect.bisect_left(ids, value)
+    if index < len(ids) and ids[index] == value:
+        del ids[index]
+
+def paginate(ids, page, per_page, newest_first=False):
+    """Page of an ID-sorted list plus total and page count, like the real API"""
+    page = page if page >= 1 else 1
+    per_page = per_page if per_page >= 1 else 20
+    total = len(ids)
+    start = (page - 1) * per_page
+    if newest_first:
+        selected = ids[max(0, total - start - per_page):max(0, total - start)][::-1]
+    else:
+        selected = ids[start:start + per_page]
+    return selected, total, math.ceil(total / per_page) if total else 0
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Build the dataset from MOCK_FIXTURE, or generate one, on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            store = MockStore()
+            if app.config['MOCK_FIXTURE']:
+                store.load_fixture(app.config['MOCK_FIXTURE'])
+            else:
+                store.generate(app.config['MOCK_PRODUCTS'], app.config['MOCK_USERS'],
+                               app.config['MOCK_ORDERS'], app.config['MOCK_SEED'])
+            _store = store
+    return _store
+
+# Latency and fault injection
+
+def parse_latency(spec):
+    """Turn a latency spec into a function of an RNG returning seconds.
+
+    none | fixed:MS | uniform:LO:HI | normal:MEAN:STDDEV | exponential:MEAN
+    | lognormal:MEDIAN:SIGMA, all in milliseconds except SIGMA.
+    """
+    name, _, params = (spec or 'none').partition(':')
+    values = [float(v) for v in params.split(':') if v]
+    samplers = {
+        'none': lambda rng: 0.0,
+        'fixed': lambda rng: values[0],
+        'uniform': lambda rng: rng.uniform(values[0], values[1]),
+        'normal': lambda rng: rng.gauss(values[0], values[1]),
+        'exponential': lambda rng: rng.expovariate(1 / values[0]),
+        'lognormal': lambda rng: values[0] * math.exp(rng.gauss(0, values[1]))
     }
-]
+    if name not in samplers:
+        raise ValueError(f'Unknown latency distribution: {spec}')
+    sampler = samplers[name]
+    return lambda rng: max(0.0, sampler(rng)) / 1000
+
+def parse_route_latency(spec):
+    """'POST /api/orders=uniform:200:800;/api/payment=fixed:1500' -> [(method, prefix, sampler)]"""
+    routes = []
+    for entry in filter(None, (part.strip() for part in spec.split(';'))):
+        route, _, latency = entry.partition('=')
+        method, _, prefix = route.strip().rpartition(' ')
+        routes.append((method.upper() or None, prefix, parse_latency(latency)))
+    # Longest prefix wins
+    return sorted(routes, key=lambda route: len(route[1]), reverse=True)
+
+_fault_rng = random.Random(app.config['MOCK_SEED'])
+_fault_lock = threading.Lock()
+_latency_cache = {}
+
+def _latency_for(method, path):
+    config = (app.config['MOCK_LATENCY'], app.config['MOCK_ROUTE_LATENCY'])
+    if _latency_cache.get('config') != config:
+        _latency_cache.update(config=config, default=parse_latency(config[0]), routes=parse_route_latency(config[1]))
+    for route_method, prefix, sampler in _latency_cache['routes']:
+        if path.startswith(prefix) and route_method in (None, method):
+            return sampler
+    return _latency_cache['default']
+
+@app.before_request
+def inject_faults():
+    """Delay and fail API requests per MOCK_* settings or X-Mock-* request headers"""
+    # Batched sub-requests share the fate of their batch
+    if not request.path.startswith('/api/') or request.environ.get('mock.batched'):
+        return None
+
+    override = request.headers.get('X-Mock-Latency')
+    sampler = parse_latency(override) if override else _latency_for(request.method, request.path)
+    forced_status = request.headers.get('X-Mock-Status', type=int)
+    with _fault_lock:
+        delay = sampler(_fault_rng)
+        failed = forced_status is None and _fault_rng.random() < app.config['MOCK_ERROR_RATE']
+        if failed:
+            forced_status = int(_fault_rng.choice(app.config['MOCK_ERROR_STATUSES'].split(',')))
+
+    if delay:
+        time.sleep(delay)
+    if forced_status:
+        response = jsonify({'message': 'Injected failure'})
+        if forced_status in (429, 503):
+            response.headers['Retry-After'] = '1'
+        return response, forced_status
+    return None
 
-cart_items = [
-    {"product_id": 2, "quantity": 1, "product": products[1]}
-]
+# Auth helpers: tokens are "mock-access-<user id>" and "mock-refresh-<user id>"
 
-# API Routes
-@app.route('/api/products', methods=['GET'])
+def issue_tokens(user):
+    return {'access_token': f"mock-access-{user['id']}", 'refresh_token': f"mock-refresh-{user['id']}"}
+
+def current_user(kind='access'):
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None, (jsonify({'msg': 'Missing Authorization Header'}), 401)
+    prefix = f'mock-{kind}-'
+    token = header[len('Bearer '):]
+    user_id = token[len(prefix):] if token.startswith(prefix) else ''
+    user = get_store().users.get(int(user_id)) if user_id.isdigit() else None
+    if user is None:
+        return None, (jsonify({'msg': 'Invalid token'}), 401)
+    return user, None
+
+def admin_user():
+    user, error = current_user()
+    if error:
+        return None, error
+    if not user['is_admin']:
+        return None, (jsonify({'message': 'Admin privileges required'}), 403)
+    return user, None
+
+def not_found():
+    return jsonify({'message': 'Not found'}), 404
+
+# Products
+
+# sort parameter: (product field, descending by default), as in the real API
+PRODUCT_SORTS = {
+    'price': ('price', False),
+    'newest': ('created_at', True),
+    'name': ('name', False),
+    'rating': ('rating', True)
+}
+
+# Accepted spellings of the in_stock flag, as in the real API
+FLAG_VALUES = {'1': True, 'true': True, '0': False, 'false': False}
+
+def price_arg(name):
+    value = request.args.get(name) or None
+    if value is None:
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        price = math.nan
+    if not math.isfinite(price):
+        raise ValueError(f'{name} must be a number')
+    return price
+
+def flag_arg(name):
+    value = (request.args.get(name) or '0').lower()
+    if value not in FLAG_VALUES:
+        raise ValueError(f'{name} must be 1, true, 0 or false')
+    return FLAG_VALUES[value]
+
+@app.route('/api/products/', methods=['GET'], strict_slashes=False)
 def get_products():
+    store = get_store()
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
     category = request.args.get('category')
-    if category:
-        filtered_products = [p for p in products if p['category'] == category]
-        return jsonify({"products": filtered_products, "total": len(filtered_products)})
-    return jsonify({"products": products, "total": len(products)})
+    sort = request.args.get('sort') or None
+    order = request.args.get('order') or None
+    if sort is not None and sort not in PRODUCT_SORTS:
+        return jsonify({'message': f"sort must be one of {', '.join(PRODUCT_SORTS)}"}), 400
+    if order not in (None, 'asc', 'desc'):
+        return jsonify({'message': 'order must be asc or desc'}), 400
+    try:
+        min_price = price_arg('min_price')
+        max_price = price_arg('max_price')
+        in_stock = flag_arg('in_stock')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    ids = store.products_by_category.get(category, []) if category else store.product_ids
+    if min_price is not None or max_price is not None or in_stock:
+        ids = [i for i in ids if (min_price is None or store.products[i]['price'] >= min_price)
+               and (max_price is None or store.products[i]['price'] <= max_price)
+               and (not in_stock or store.products[i]['stock'] > 0)]
+    descending = order == 'desc'
+    if sort is not None:
+        field, default_descending = PRODUCT_SORTS[sort]
+        descending = descending if order else default_descending
+        # Ties by ID, like the real API; paginate reverses for descending
+        ids = sorted(ids, key=lambda i: (store.products[i][field], i))
+    selected, total, pages = paginate(ids, page, per_page, newest_first=descending)
+    return jsonify({
+        'products': [store.products[i] for i in selected],
+        'total': total,
+        'pages': pages,
+        'current_page': page
+    }), 200
 
 @app.route('/api/products/<int:product_id>', methods=['GET'])
 def get_product(product_id):
-    product = next((p for p in products if p['id'] == product_id), None)
-    if product:
-        return jsonify(product)
-    return jsonify({"error": "Product not found"}), 404
+    product = get_store().products.get(product_id)
+    if product is None:
+        return not_found()
+    return jsonify(product), 200
+
+@app.route('/api/products/categories', methods=['GET'])
+def get_categories():
+    return jsonify(sorted(get_store().products_by_category)), 200
+
+@app.route('/api/products/', methods=['POST'], strict_slashes=False)
+def create_product():
+    _, error = admin_user()
+    if error:
+        return error
+    data = request.get_json() or {}
+    for field in ['name', 'description', 'price', 'stock', 'category', 'specifications']:
+        if field not in data:
+            return jsonify({'message': f'Field {field} is required'}), 400
+
+    store = get_store()
+    created = now_iso()
+    with store.lock:
+        product = store.add_product({
+            'name': data['name'],
+            'description': data['description'],
+            'price': data['price'],
+            'stock': data['stock'],
+            'category': data['category'],
+            'specifications': data['specifications'] if isinstance(data['specifications'], dict)
+            else json.loads(data['specifications']),
+            'created_at': created,
+            'updated_at': created,
+            'rating': 0,
+            'review_count': 0,
+            'images': [{'image_url': img['image_url'], 'is_primary': img.get('is_primary', False),
+                        'created_at': created} for img in data.get('images', [])]
+        })
+    return jsonify(product), 201
+
+@app.route('/api/products/<int:product_id>', methods=['PUT'])
+def update_product(product_id):
+    _, error = admin_user()
+    if error:
+        return error
+    store = get_store()
+    data = request.get_json() or {}
+    with store.lock:
+        product = store.products.get(product_id)
+        if product is None:
+            return not_found()
+        store.remove_product(product_id)
+        for field in ['name', 'description', 'price', 'stock', 'category', 'specifications']:
+            if field in data:
+                product[field] = data[field]
+        if isinstance(product['specifications'], str):
+            product['specifications'] = json.loads(product['specifications'])
+        if isinstance(data.get('images'), list):
+            product['images'] = [{'image_url': img['image_url'], 'is_primary': img.get('is_primary', False),
+                                  'created_at': now_iso()} for img in data['images']]
+        product['updated_at'] = now_iso()
+        store.add_product(product)
+    return jsonify(product), 200
+
+@app.route('/api/products/<int:product_id>', methods=['DELETE'])
+def delete_product(product_id):
+    _, error = admin_user()
+    if error:
+        return error
+    store = get_store()
+    with store.lock:
+        if product_id not in store.products:
+            return not_found()
+        store.remove_product(product_id)
+    return jsonify({'message': 'Product deleted successfully'}), 200
+
+# Auth
 
 @app.route('/api/auth/login', methods=['POST'])
 def login():
-    return jsonify({
-        "access_token": "mock_token",
-        "user": users[0]
-    })
+    data = request.get_json(silent=True) or {}
+    if not data.get('email') or not data.get('password'):
+        return jsonify({'message': 'Email and password are required'}), 400
+    # Any password is accepted for a known email
+    user = get_store().users_by_email.get(data['email'].lower())
+    if user is None:
+        return jsonify({'message': 'Invalid email or password'}), 401
+    return jsonify({'message': 'Login successful', **issue_tokens(user), 'user': user}), 200
 
 @app.route('/api/auth/register', methods=['POST'])
 def register():
-    return jsonify({
-        "access_token": "mock_token",
-        "user": users[0]
-    })
+    data = request.get_json(silent=True) or {}
+    for field in ['email', 'password', 'first_name', 'last_name']:
+        if field not in data:
+            return jsonify({'message': f'Field {field} is required'}), 400
+    store = get_store()
+    with store.lock:
+        if data['email'].lower() in store.users_by_email:
+            return jsonify({'message': 'Email already registered'}), 400
+        created = now_iso()
+        user = store.add_user({
+            'email': data['email'],
+            'first_name': data['first_name'],
+            'last_name': data['last_name'],
+            'address': data.get('address', ''),
+            'phone': data.get('phone', ''),
+            'is_admin': False,
+            'created_at': created,
+            'updated_at': created
+        })
+    return jsonify({'message': 'User registered successfully', **issue_tokens(user), 'user': user}), 201
 
-@app.route('/api/cart', methods=['GET'])
+@app.route('/api/auth/refresh', methods=['POST'])
+def refresh():
+    user, error = current_user('refresh')
+    if error:
+        return error
+    return jsonify(issue_tokens(user)), 200
+
+@app.route('/api/auth/logout', methods=['POST'])
+def logout():
+    _, error = current_user()
+    if error:
+        return error
+    return jsonify({'message': 'Logged out successfully'}), 200
+
+@app.route('/api/auth/profile', methods=['GET'])
+def get_profile():
+    user, error = current_user()
+    if error:
+        return error
+    return jsonify(user), 200
+
+@app.route('/api/auth/profile', methods=['PUT'])
+def update_profile():
+    user, error = current_user()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    for field in ['first_name', 'last_name', 'address', 'phone']:
+        if field in data:
+            user[field] = data[field]
+    user['updated_at'] = now_iso()
+    return jsonify({'message': 'Profile updated successfully', 'user': user}), 200
+
+# Cart
+
+@app.route('/api/cart/', methods=['GET'], strict_slashes=False)
 def get_cart():
+    user, error = current_user()
+    if error:
+        return error
+    store = get_store()
+    items = [store.cart_item_dict(item) for item in store.carts.get(user['id'], {}).values()]
     return jsonify({
-        "items": cart_items,
-        "total_items": len(cart_items),
-        "subtotal": sum(item["quantity"] * item["product"]["price"] for item in cart_items)
-    })
+        'cart_items': items,
+        'total_items': len(items),
+        'total_amount': sum(item['product']['price'] * item['quantity'] for item in items if item['product'])
+    }), 200
 
 @app.route('/api/cart/add', methods=['POST'])
 def add_to_cart():
-    return jsonify({"message": "Item added to cart"})
+    user, error = current_user()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    if not data.get('product_id') or not data.get('quantity'):
+        return jsonify({'message': 'Product ID and quantity are required'}), 400
 
-@app.route('/api/orders', methods=['GET'])
-def get_orders():
+    store = get_store()
+    quantity = int(data['quantity'])
+    with store.lock:
+        product = store.products.get(data['product_id'])
+        if product is None:
+            return jsonify({'message': 'Product not found'}), 404
+        if product['stock'] < quantity:
+            return jsonify({'message': 'Insufficient stock available'}), 400
+
+        item = store.carts.get(user['id'], {}).get(product['id'])
+        if item:
+            item['quantity'] += quantity
+            item['updated_at'] = now_iso()
+        else:
+            created = now_iso()
+            item = store.add_cart_item({'user_id': user['id'], 'product_id': product['id'], 'quantity': quantity,
+                                        'created_at': created, 'updated_at': created})
+    return jsonify({'message': 'Item added to cart successfully', 'cart_item': store.cart_item_dict(item)}), 200
+
+@app.route('/api/cart/update/<int:cart_item_id>', methods=['PUT'])
+def update_cart_item(cart_item_id):
+    user, error = current_user()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    if 'quantity' not in data:
+        return jsonify({'message': 'Quantity is required'}), 400
+
+    store = get_store()
+    item = store.cart_items.get(cart_item_id)
+    if item is None or item['user_id'] != user['id']:
+        return jsonify({'message': 'Cart item not found'}), 404
+    if store.products[item['product_id']]['stock'] < int(data['quantity']):
+        return jsonify({'message': 'Insufficient stock available'}), 400
+    item['quantity'] = int(data['quantity'])
+    item['updated_at'] = now_iso()
+    return jsonify({'message': 'Cart item updated successfully', 'cart_item': store.cart_item_dict(item)}), 200
+
+@app.route('/api/cart/remove/<int:cart_item_id>', methods=['DELETE'])
+def remove_from_cart(cart_item_id):
+    user, error = current_user()
+    if error:
+        return error
+    store = get_store()
+    with store.lock:
+        item = store.cart_items.get(cart_item_id)
+        if item is None or item['user_id'] != user['id']:
+            return jsonify({'message': 'Cart item not found'}), 404
+        store.remove_cart_item(item)
+    return jsonify({'message': 'Item removed from cart successfully'}), 200
+
+@app.route('/api/cart/clear', methods=['DELETE'])
+def clear_cart():
+    user, error = current_user()
+    if error:
+        return error
+    store = get_store()
+    with store.lock:
+        for item in list(store.carts.get(user['id'], {}).values()):
+            store.remove_cart_item(item)
+    return jsonify({'message': 'Cart cleared successfully'}), 200
+
+# Orders
+
+def order_page(ids):
+    store = get_store()
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    selected, total, pages = paginate(ids, page, per_page, newest_first=True)
     return jsonify({
-        "orders": orders,
-        "total": len(orders)
-    })
+        'orders': [store.order_dict(store.orders[i]) for i in selected],
+        'total': total,
+        'pages': pages,
+        'current_page': page
+    }), 200
+
+def own_order(user, order_id):
+    order = get_store().orders.get(order_id)
+    return order if order is not None and order['user_id'] == user['id'] else None
+
+@app.route('/api/orders/', methods=['GET'], strict_slashes=False)
+def get_orders():
+    user, error = current_user()
+    if error:
+        return error
+    return order_page(get_store().orders_by_user.get(user['id'], []))
 
 @app.route('/api/orders/<int:order_id>', methods=['GET'])
 def get_order(order_id):
-    order = next((o for o in orders if o['id'] == order_id), None)
-    if order:
-        return jsonify(order)
-    return jsonify({"error": "Order not found"}), 404
+    user, error = current_user()
+    if error:
+        return error
+    order = own_order(user, order_id)
+    if order is None:
+        return not_found()
+    return jsonify(get_store().order_dict(order)), 200
+
+@app.route('/api/orders/', methods=['POST'], strict_slashes=False)
+def create_order():
+    user, error = current_user()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    if not data.get('shipping_address'):
+        return jsonify({'message': 'Shipping address is required'}), 400
+
+    store = get_store()
+    with store.lock:
+        cart = list(store.carts.get(user['id'], {}).values())
+        if not cart:
+            return jsonify({'message': 'Cart is empty'}), 400
+        for item in cart:
+            product = store.products[item['product_id']]
+            if product['stock'] < item['quantity']:
+                return jsonify({'message': f"Insufficient stock for {product['name']}"}), 400
+
+        created = now_iso()
+        items = []
+        for item in cart:
+            product = store.products[item['product_id']]
+            product['stock'] -= item['quantity']
+            items.append({'product_id': product['id'], 'quantity': item['quantity'],
+                          'price': product['price'], 'created_at': created})
+            store.remove_cart_item(item)
+        order = store.add_order({
+            'user_id': user['id'],
+            'total_amount': sum(i['price'] * i['quantity'] for i in items),
+            'status': 'pending',
+            'payment_id': None,
+            'shipping_address': data['shipping_address'],
+            'created_at': created,
+            'updated_at': created,
+            'order_items': items
+        })
+    return jsonify({'message': 'Order created successfully', 'order': store.order_dict(order)}), 201
+
+@app.route('/api/orders/<int:order_id>/cancel', methods=['PUT'])
+def cancel_order(order_id):
+    user, error = current_user()
+    if error:
+        return error
+    store = get_store()
+    with store.lock:
+        order = own_order(user, order_id)
+        if order is None:
+            return not_found()
+        if order['status'] != 'pending':
+            return jsonify({'message': f"Cannot cancel order with status {order['status']}"}), 400
+        store.set_order_status(order, 'cancelled')
+        for item in order['order_items']:
+            if item['product_id'] in store.products:
+                store.products[item['product_id']]['stock'] += item['quantity']
+    return jsonify({'message': 'Order cancelled successfully', 'order': store.order_dict(order)}), 200
 
 @app.route('/api/orders/admin', methods=['GET'])
-def get_admin_orders():
-    return jsonify({
-        "orders": orders,
-        "total": len(orders)
-    })
+def admin_get_orders():
+    _, error = admin_user()
+    if error:
+        return error
+    store = get_store()
+    status = request.args.get('status')
+    return order_page(store.orders_by_status.get(status, []) if status else store.order_ids)
+
+@app.route('/api/orders/admin/<int:order_id>/status', methods=['PUT'])
+def admin_update_order_status(order_id):
+    _, error = admin_user()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    if not data.get('status'):
+        return jsonify({'message': 'Status is required'}), 400
+    store = get_store()
+    with store.lock:
+        order = store.orders.get(order_id)
+        if order is None:
+            return not_found()
+        store.set_order_status(order, data['status'])
+    return jsonify({'message': 'Order status updated successfully', 'order': store.order_dict(order)}), 200
 
-@app.route('/api/payment/create', methods=['POST'])
-def create_payment():
+# Payment
+
+@app.route('/api/payment/create-order/<int:order_id>', methods=['POST'])
+def create_payment_order(order_id):
+    user, error = current_user()
+    if error:
+        return error
+    order = own_order(user, order_id)
+    if order is None:
+        return not_found()
+    if order['status'] != 'pending':
+        return jsonify({'message': f"Cannot process payment for order with status {order['status']}"}), 400
     return jsonify({
-        "amount": 29599,
-        "currency": "INR",
-        "order_id": "order_mock123456",
-        "key_id": "rzp_test_mock"
-    })
+        'message': 'Payment order created successfully',
+        'order_id': f'order_mock{order_id:010d}',
+        'amount': int(order['total_amount'] * 100) / 100,
+        'currency': 'INR'
+    }), 200
+
+@app.route('/api/payment/verify', methods=['POST'])
+def verify_payment():
+    user, error = current_user()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    for field in ['razorpay_order_id', 'razorpay_payment_id', 'razorpay_signature', 'order_id']:
+        if field not in data:
+            return jsonify({'message': f'Field {field} is required'}), 400
+    store = get_store()
+    with store.lock:
+        order = own_order(user, data['order_id'])
+        if order is None:
+            return not_found()
+        store.set_order_status(order, 'paid')
+        order['payment_id'] = data['razorpay_payment_id']
+    return jsonify({'message': 'Payment verified successfully', 'order': store.order_dict(order)}), 200
+
+@app.route('/api/payment/status/<string:payment_id>', methods=['GET'])
+def payment_status(payment_id):
+    _, error = current_user()
+    if error:
+        return error
+    payment = {'id': payment_id, 'entity': 'payment', 'status': 'captured', 'currency': 'INR'}
+    return jsonify({'status': payment['status'], 'payment': payment}), 200
+
+# Batch
+
+@app.route('/api/batch/', methods=['POST'], strict_slashes=False)
+def batch():
+    data = request.get_json(silent=True) or {}
+    paths = data.get('requests')
+    if not isinstance(paths, list) or not paths or not all(isinstance(path, str) for path in paths):
+        return jsonify({'message': 'requests must be a non-empty list of paths'}), 400
+    if len(paths) > 10:
+        return jsonify({'message': 'At most 10 requests per batch'}), 400
+
+    headers = {'Authorization': request.headers['Authorization']} if 'Authorization' in request.headers else {}
+    client = app.test_client()
+    responses = []
+    for path in paths:
+        if not path.startswith('/api/') or path.startswith(('/api/batch', '/api/events')):
+            responses.append({'path': path, 'status': 400, 'body': {'message': 'This endpoint cannot be batched'}})
+            continue
+        response = client.get(path, headers=headers, environ_base={'mock.batched': True}, follow_redirects=True)
+        responses.append({'path': path, 'status': response.status_code, 'body': response.get_json(silent=True)})
+    return jsonify({'responses': responses}), 200
 
 # Serve React App
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
     if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    return send_from_directory(app.static_folder, 'index.html')
+        return send_static(path)
+    return send_static('index.html')
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    parser = argparse.ArgumentParser(description='Mock API server for frontend development and load testing')
+    parser.add_argument('--fixture', help='Load the dataset from this JSON file instead of generating one')
+    parser.add_argument('--products', type=int, help='Products to generate')
+    parser.add_argument('--users', type=int, help='Users to generate')
+    parser.add_argument('--orders', type=int, help='Orders to generate')
+    parser.add_argument('--seed', type=int, help='Seed for data generation and fault injection')
+    parser.add_argument('--dump', help='Write the dataset to this JSON fixture file and exit')
+    parser.add_argument('--latency', help='Latency for every API request, e.g. lognormal:80:0.5')
+    parser.add_argument('--route-latency', help="Per-route latency, e.g. 'POST /api/orders=uniform:200:800'")
+    parser.add_argument('--error-rate', type=float, help='Fraction of API requests that fail')
+    parser.add_argument('--error-statuses', help='Comma-separated statuses for injected failures')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    for key, value in vars(args).items():
+        name = f"MOCK_{key.upper()}"
+        if value is not None and name in app.config:
+            app.config[name] = value
+    if args.seed is not None:
+        _fault_rng.seed(args.seed)
+
+    started = time.perf_counter()
+    store = get_store()
+    print(f'Loaded {len(store.products)} products, {len(store.users)} users and '
+          f'{len(store.orders)} orders in {time.perf_counter() - started:.1f}s')
+
+    if args.dump:
+        store.dump_fixture(args.dump)
+    else:
+        app.run(debug=True, port=args.port, threaded=True, use_reloader=False)